@@ -1,25 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from database.database import get_db
 from models import User as UserModel
-from pydantic import BaseModel
+from services.principal_cache import Principal
+from services.ttl_cache import TTLCache
+from services.hashing import HashingPoolFull, check_password, hash_password, hashing_pool
+from services.rate_limit import LOGIN_PER_ACCOUNT, LOGIN_PER_IP, REGISTER_PER_IP, client_ip, rate_limiter
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+import logging
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-router = APIRouter()
+router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+
+logger = logging.getLogger("vocab.auth")
 
 # Security
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Cache principal theo "sub" của token; TTL không vượt quá thời hạn token
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = min(
+    int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300")),
+    ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 class Token(BaseModel):
@@ -36,14 +52,24 @@ class UserCreate(BaseModel):
 class UserSchema(BaseModel):
     email: str
     is_active: bool
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt tốn hàng chục ms CPU: chạy trong hashing_pool để không chặn event loop
+async def _run_hashing(fn, *args):
+    try:
+        return await hashing_pool.run(fn, *args)
+    except HashingPoolFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+async def verify_password(plain_password, hashed_password):
+    return await _run_hashing(check_password, plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await _run_hashing(hash_password, password)
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -55,7 +81,11 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def _get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(UserModel).where(UserModel.email == email).limit(1))
+    return result.scalar_one_or_none()
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -69,32 +99,94 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
-    user = db.query(UserModel).filter(UserModel.email == token_data.email).first()
-    if user is None:
+    principal = principal_cache.get(token_data.email)
+    if principal is None:
+        generation = principal_cache.generation()
+        user = await _get_user_by_email(db, token_data.email)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.set(token_data.email, principal, generation=generation)
+    # Tài khoản bị khoá: cache đã được invalidate nên bản ghi mới có is_active=False
+    if not principal.is_active:
         raise credentials_exception
-    return user
+    return principal
+
+def _changed_emails(user):
+    # Email hiện tại và email cũ (nếu vừa đổi email)
+    history = inspect(user).attrs.email.history
+    return {e for e in [user.email, *history.deleted] if e}
+
+@event.listens_for(UserModel, "after_update")
+@event.listens_for(UserModel, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    # Chỉ bắt được thay đổi qua ORM; các câu UPDATE/DELETE bulk trên users
+    # phải tự gọi principal_cache.invalidate()
+    emails = _changed_emails(target)
+    for email in emails:
+        principal_cache.invalidate(email)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("principal_invalidations", set()).update(emails)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals_on_commit(session):
+    # Invalidate lần nữa sau commit: request khác có thể đã đọc bản ghi cũ
+    # trong khoảng giữa flush và commit
+    for email in session.info.pop("principal_invalidations", ()):
+        principal_cache.invalidate(email)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session):
+    session.info.pop("principal_invalidations", None)
+
+# Chặn theo IP / tài khoản trước khi đụng tới database hay bcrypt. Dependency của route
+# được FastAPI giải quyết trước các tham số của endpoint (get_db, body).
+def _too_many_requests(retry_after):
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, please retry later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+async def limit_register(request: Request):
+    retry_after = await rate_limiter.hit(REGISTER_PER_IP, client_ip(request))
+    if retry_after:
+        logger.info("register throttled", extra={"rule": REGISTER_PER_IP.name})
+        raise _too_many_requests(retry_after)
+
+async def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    retry_after = await rate_limiter.hit(LOGIN_PER_IP, client_ip(request))
+    rule = LOGIN_PER_IP
+    if not retry_after:
+        retry_after = await rate_limiter.hit(LOGIN_PER_ACCOUNT, form_data.username.strip().lower())
+        rule = LOGIN_PER_ACCOUNT
+    if retry_after:
+        logger.info("login throttled", extra={"rule": rule.name})
+        raise _too_many_requests(retry_after)
 
-@router.post("/register", response_model=UserSchema)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+@router.post("/register", response_model=UserSchema, dependencies=[Depends(limit_register)])
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await _get_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(user.password)
-    print(f"[DEBUG] Register: email={user.email}, password={user.password}, hashed={hashed_password}")
+    # Trả connection về pool trong lúc chờ hash (hàng chục ms)
+    await db.close()
+    hashed_password = await get_password_hash(user.password)
     db_user = UserModel(email=user.email, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    logger.info("user registered", extra={"user_id": db_user.id})
     return db_user
 
-@router.post("/token", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    print(f"[DEBUG] Login: username={form_data.username}, password={form_data.password}")
-    user = db.query(UserModel).filter(UserModel.email == form_data.username).first()
-    if user:
-        print(f"[DEBUG] Found user: email={user.email}, hashed_password={user.hashed_password}")
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        print(f"[DEBUG] Login failed: user={user}, password={form_data.password}")
+@router.post("/token", response_model=Token, dependencies=[Depends(limit_login)])
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await _get_user_by_email(db, form_data.username)
+    # Trả connection về pool trong lúc chờ verify (hàng chục ms)
+    await db.close()
+    if not user or not await verify_password(form_data.password, user.hashed_password):
+        logger.info("login failed", extra={"user_id": user.id if user else None, "unknown_user": user is None})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -104,6 +196,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
+    logger.debug("login succeeded", extra={"user_id": user.id})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserSchema)
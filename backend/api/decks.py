@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database.database import get_db
+from models import Deck as DeckModel
+from models import User as UserModel
+from api.auth import get_current_user
+from api.vocab import get_read_db
+from services import decks
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/api/decks", tags=["Decks"])
+
+class DeckSchema(BaseModel):
+    id: int
+    slug: str
+    name: str
+    description: Optional[str] = None
+    word_count: int
+    subscribed: bool
+
+@router.get("", response_model=List[DeckSchema])
+async def list_decks(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    return await decks.list_decks(db, current_user.id)
+
+@router.post("/{deck_id}/subscribe")
+async def subscribe(
+    deck_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Từ của bộ từ xuất hiện trong danh sách / categories / quiz của user, không chép dòng nào
+    if await db.get(DeckModel, deck_id) is None:
+        raise HTTPException(status_code=404, detail="Deck not found")
+    if not await decks.subscribe(db, current_user.id, deck_id):
+        raise HTTPException(status_code=400, detail="Already subscribed")
+    await db.commit()
+    return {"message": "Subscribed"}
+
+@router.delete("/{deck_id}/subscribe")
+async def unsubscribe(
+    deck_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Bản sao riêng (từ đã sửa) vẫn giữ lại
+    if not await decks.unsubscribe(db, current_user.id, deck_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    await db.commit()
+    return {"message": "Unsubscribed"}
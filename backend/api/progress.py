@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import datetime
+from models import User as UserModel
+from api.auth import get_current_user
+from api.vocab import get_read_db
+from services.progress import STATS_MAX_DAYS, get_stats
+from pydantic import BaseModel
+
+router = APIRouter(prefix="/api/progress", tags=["Progress"])
+
+class DailyStatsSchema(BaseModel):
+    day: datetime.date
+    words_added: int
+    reviews: int
+    reviews_correct: int
+    favorites_added: int
+
+class CategoryStatsSchema(BaseModel):
+    category: str
+    word_count: int
+    favorite_count: int
+    mastered_count: int
+    mastery: float  # mastered_count / word_count
+
+class StatsSchema(BaseModel):
+    date: datetime.date  # ngày UTC hiện tại
+    total_words: int
+    favorite_count: int
+    mastered_count: int
+    current_streak: int
+    daily: List[DailyStatsSchema]  # days ngày gần nhất, cũ trước, ngày không học có số 0
+    categories: List[CategoryStatsSchema]
+
+@router.get("/stats", response_model=StatsSchema)
+async def get_learning_stats(
+    days: int = 30,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Chỉ đọc rollup (user_categories, user_daily_stats): không phụ thuộc số từ của user
+    if days < 1 or days > STATS_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {STATS_MAX_DAYS}")
+    return await get_stats(db, current_user.id, days)
@@ -1,15 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import String, and_, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional, Union
 from database.database import get_db
+from database.routing import cookie_pinned_until, mark_written, session_router
 from models import Vocabulary as VocabularyModel
 from models import Favorite as FavoriteModel
 from models import User as UserModel
 from api.auth import get_current_user
-from pydantic import BaseModel
+from services.bulk_import import MAX_IMPORT_ROWS, ImportTooLarge, import_vocabularies, iter_csv_rows, iter_jsonl_rows
+from services.export import MEDIA_TYPES, stream_vocabularies
+from services.category_counts import get_category_count, get_category_counts
+from services.search import MAX_SEARCH_LIMIT, search_vocabularies
+from services.review import get_due_cards, record_review
+from services.quiz import build_quiz
+from services.sync import read_changes
+from services.batch import run_batch
+from services.visibility import select_visible, visible_to
+from services.data_version import etag_matches, get_data_version, make_etag
+from services.dictionary import MAX_AUTOCOMPLETE, get_dictionary
+from services.serialization import VOCABULARY_COLUMNS, json_response, vocabulary_dicts
+from services import vocab_writes
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+import base64
+import json
+import logging
 
-router = APIRouter()
+router = APIRouter(prefix="/api/vocab", tags=["Vocabulary"])
+
+logger = logging.getLogger("vocab.api")
 
 class VocabularyBase(BaseModel):
     word: str
@@ -22,141 +43,529 @@ class VocabularyCreate(VocabularyBase):
 
 class VocabularySchema(VocabularyBase):
     id: int
-    owner_id: int
+    owner_id: Optional[int] = None  # None: từ của bộ từ dùng chung (deck_id)
     created_at: datetime
+    deck_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class VocabularyPage(BaseModel):
+    items: List[VocabularySchema]
+    next_cursor: Optional[str] = None
+
+class VocabularySearchPage(BaseModel):
+    items: List[VocabularySchema]
+    next_offset: Optional[int] = None
+
+class ReviewCardSchema(BaseModel):
+    vocabulary: VocabularySchema
+    ease: float
+    interval: int
+    repetitions: int
+    due_at: datetime
+    last_reviewed_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ReviewGrade(BaseModel):
+    grade: int = Field(..., ge=0, le=5)
+
+class QuizQuestionSchema(BaseModel):
+    id: int
+    word: str
+    example: Optional[str] = None
+    category: Optional[str] = None
+    choices: List[str]
+    answer: int
+
+class QuizSchema(BaseModel):
+    questions: List[QuizQuestionSchema]
 
-    class Config:
-        orm_mode = True
+class BatchOperation(BaseModel):
+    op: Literal["create", "delete", "favorite", "unfavorite"]
+    id: Optional[int] = None  # delete/favorite/unfavorite: id từ vựng
+    data: Optional[VocabularyCreate] = None  # create
+
+class BatchRequest(BaseModel):
+    ops: List[BatchOperation]
+
+class BatchResult(BaseModel):
+    status: int
+    message: Optional[str] = None
+    detail: Optional[str] = None
+    vocabulary: Optional[VocabularySchema] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+
+class SyncChangeSchema(BaseModel):
+    op: str  # "upsert" | "delete"
+    type: str  # "vocabulary" | "favorite"
+    seq: int
+    id: Optional[int] = None  # favorite: vocabulary_id; delete: id của đối tượng bị xoá
+    data: Optional[VocabularySchema] = None  # upsert vocabulary
+
+class SyncPage(BaseModel):
+    changes: List[SyncChangeSchema]
+    reset: bool
+    seq: int
+    next_cursor: Optional[str] = None
+
+class DictionaryEntrySchema(BaseModel):
+    word: str
+    meaning: str
+    example: Optional[str] = None
+
+class LookupSchema(BaseModel):
+    word: str
+    entries: List[DictionaryEntrySchema]
 
-@router.get("/vocabularies", response_model=List[VocabularySchema])
-def get_vocabularies(
+class SuggestionSchema(BaseModel):
+    word: str
+    meaning: str
+
+class AutocompleteSchema(BaseModel):
+    suggestions: List[SuggestionSchema]
+
+class SessionSchema(BaseModel):
+    vocabularies: VocabularyPage
+    categories: List[str]
+    favorite_ids: List[int]
+
+MAX_PAGE_SIZE = 1000
+MAX_REVIEW_BATCH = 100
+MAX_QUIZ_QUESTIONS = 50
+MAX_BATCH_OPS = 500
+
+# Cursor là (created_at, id) của phần tử cuối trang, mã hoá base64 để client coi như opaque
+def encode_cursor(vocabulary):
+    raw = json.dumps([vocabulary.created_at.isoformat(), vocabulary.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, vocab_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(vocab_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def after_cursor(query, cursor, dialect_name):
+    created_at, vocab_id = decode_cursor(cursor)
+    bound = created_at
+    if dialect_name == "sqlite" and created_at.microsecond == 0:
+        # SQLite lưu datetime dạng chuỗi; dòng ghi bằng server_default (CURRENT_TIMESTAMP)
+        # có dạng 'YYYY-MM-DD HH:MM:SS', không có '.000000' như tham số bind mặc định.
+        # So sánh đúng định dạng đó để '==' khớp và tie-break theo id không bỏ sót dòng.
+        bound = literal(created_at.strftime("%Y-%m-%d %H:%M:%S"), String)
+    return query.where(or_(
+        VocabularyModel.created_at > bound,
+        and_(VocabularyModel.created_at == bound, VocabularyModel.id > vocab_id),
+    ))
+
+async def get_read_db(request: Request, current_user: UserModel = Depends(get_current_user)):
+    # Route chỉ đọc: session replica, trừ khi user vừa ghi (database/routing.py)
+    async with session_router.reader(current_user.id, cookie_pinned_until(request))() as db:
+        yield db
+
+async def not_modified(request, response, db, user_id):
+    # Đọc data_version trước dữ liệu: nếu có ghi xen giữa thì ETag cũ hơn dữ liệu
+    # trả về, lần sau chỉ mất một lần 200 thừa chứ không bao giờ 304 sai. Có If-None-Match
+    # thì bỏ qua cache trong process (worker khác có thể đã ghi, services/data_version.py);
+    # user đang ghim primary (vừa ghi, kể cả ở worker khác qua cookie) cũng vậy: db lúc này
+    # là primary nên ETag khớp với dữ liệu vừa ghi
+    if_none_match = request.headers.get("if-none-match")
+    cached = not if_none_match and not session_router.is_pinned(user_id, cookie_pinned_until(request))
+    etag = make_etag(user_id, await get_data_version(db, user_id, cached=cached))
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.headers["Vary"] = "Authorization"
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+@router.get("/vocabularies", response_model=Union[VocabularyPage, List[VocabularySchema]])
+async def get_vocabularies(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
-    db: Session = Depends(get_db),
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    query = db.query(VocabularyModel).filter(VocabularyModel.owner_id == current_user.id)
+    cached = await not_modified(request, response, db, current_user.id)
+    if cached is not None:
+        return cached
+    # Select cột + encode orjson (services/serialization.py); response_model chỉ còn cho OpenAPI.
+    # Từ riêng ∪ từ của các bộ từ đã đăng ký, sắp theo (created_at, id) (services/decks.py)
+    query = select(*VOCABULARY_COLUMNS)
     
     if category:
-        query = query.filter(VocabularyModel.category == category)
+        query = query.where(VocabularyModel.category == category)
     
-    vocabularies = query.offset(skip).limit(limit).all()
-    return vocabularies
+    if after is None:
+        # Chế độ offset cũ, giữ để tương thích với client hiện tại
+        result = await db.execute(select_visible(current_user.id, query, limit=limit, offset=skip))
+        return json_response(vocabulary_dicts(result.all()), response)
+
+    # Keyset pagination: ?after= (rỗng) lấy trang đầu, sau đó truyền next_cursor
+    return json_response(await keyset_page(db, current_user.id, query, after, limit), response)
+
+async def keyset_page(db, user_id, query, after, limit):
+    # query: select(*VOCABULARY_COLUMNS) với filter riêng, chưa lọc theo user
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if after:
+        query = after_cursor(query, after, db.bind.dialect.name)
+    result = await db.execute(select_visible(user_id, query, limit=limit + 1))
+    rows = result.all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return {"items": vocabulary_dicts(rows[:limit]), "next_cursor": next_cursor}
 
 @router.post("/vocabularies", response_model=VocabularySchema)
-def create_vocabulary(
+async def create_vocabulary(
     vocabulary: VocabularyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    db_vocabulary = VocabularyModel(
-        **vocabulary.dict(),
-        owner_id=current_user.id
-    )
-    db.add(db_vocabulary)
-    db.commit()
-    db.refresh(db_vocabulary)
+    db_vocabulary = await vocab_writes.create_vocabulary(db, current_user.id, vocabulary.model_dump())
+    await db.commit()
+    await db.refresh(db_vocabulary)
     return db_vocabulary
 
+@router.post("/batch", response_model=BatchResponse)
+async def batch_operations(
+    batch: BatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Nhiều thao tác create/delete/favorite/unfavorite trong một transaction
+    # (services/batch.py); kết quả theo đúng thứ tự op gửi lên
+    if len(batch.ops) > MAX_BATCH_OPS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_OPS} operations per batch")
+    results = await run_batch(db, current_user.id, batch.ops)
+    await db.commit()
+    return json_response({"results": results})
+
+@router.post("/vocabularies/bulk")
+async def bulk_create_vocabularies(
+    request: Request,
+    format: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Body được đọc dạng stream (JSON lines hoặc CSV có header), validate từng dòng
+    # và insert theo batch trong một transaction
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+    if format == "csv":
+        rows = iter_csv_rows(request.stream())
+    elif format in ("jsonl", "ndjson"):
+        rows = iter_jsonl_rows(request.stream())
+    else:
+        raise HTTPException(status_code=400, detail="format must be jsonl or csv")
+    try:
+        result = await import_vocabularies(
+            db, rows, owner_id=current_user.id, schema=VocabularyCreate, max_rows=MAX_IMPORT_ROWS
+        )
+    except ImportTooLarge as e:
+        await db.rollback()
+        raise HTTPException(status_code=413, detail=str(e))
+    await db.commit()
+    return result
+
 @router.get("/categories")
-def get_categories(
-    db: Session = Depends(get_db),
+async def get_categories(
+    request: Request,
+    response: Response,
+    with_counts: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    categories = db.query(VocabularyModel.category)\
-        .filter(VocabularyModel.owner_id == current_user.id)\
-        .distinct()\
-        .all()
-    return [category[0] for category in categories]
+    cached = await not_modified(request, response, db, current_user.id)
+    if cached is not None:
+        return cached
+    # Đọc từ rollup user_categories: O(số category), không quét vocabularies
+    counts = await get_category_counts(db, current_user.id)
+    if with_counts:
+        return [{"category": category, "word_count": count} for category, count in counts]
+    return [category for category, _ in counts]
+
+@router.get("/session", response_model=SessionSchema)
+async def get_session(
+    request: Request,
+    response: Response,
+    category: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Dữ liệu khởi tạo cho màn danh sách / flashcard trong một request:
+    # trang từ đầu tiên, danh sách category (rollup) và id các từ yêu thích.
+    # Dùng chung một session; user lấy từ principal cache nên thường chỉ 3 câu truy vấn.
+    cached = await not_modified(request, response, db, current_user.id)
+    if cached is not None:
+        return cached
+    query = select(*VOCABULARY_COLUMNS)
+    if category:
+        query = query.where(VocabularyModel.category == category)
+    page = await keyset_page(db, current_user.id, query, after, limit)
+    counts = await get_category_counts(db, current_user.id)
+    favorite_ids = (await db.execute(
+        select(FavoriteModel.vocabulary_id)
+        .where(FavoriteModel.user_id == current_user.id)
+        .order_by(FavoriteModel.vocabulary_id)
+    )).scalars().all()
+    return json_response({
+        "vocabularies": page,
+        "categories": [name for name, _ in counts],
+        "favorite_ids": favorite_ids,
+    }, response)
 
 @router.get("/favorites", response_model=List[VocabularySchema])
-def get_favorites(
-    db: Session = Depends(get_db),
+async def get_favorites(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    favorites = db.query(VocabularyModel)\
-        .join(FavoriteModel)\
-        .filter(FavoriteModel.user_id == current_user.id)\
-        .all()
-    print(f"[DEBUG] GET /favorites for user_id={current_user.id}: {[v.id for v in favorites]}")
-    return favorites
+    cached = await not_modified(request, response, db, current_user.id)
+    if cached is not None:
+        return cached
+    result = await db.execute(
+        select(*VOCABULARY_COLUMNS)
+        .join(FavoriteModel)
+        .where(FavoriteModel.user_id == current_user.id)
+    )
+    favorites = result.all()
+    logger.debug("favorites listed", extra={"user_id": current_user.id, "count": len(favorites)})
+    return json_response(vocabulary_dicts(favorites), response)
 
 @router.post("/favorites/{vocabulary_id}")
-def add_favorite(
+async def add_favorite(
     vocabulary_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    vocabulary = db.query(VocabularyModel)\
-        .filter(VocabularyModel.id == vocabulary_id)\
-        .filter(VocabularyModel.owner_id == current_user.id)\
-        .first()
-    print(f"[DEBUG] current_user.id={current_user.id}, vocabulary_id={vocabulary_id}, vocabulary.owner_id={getattr(vocabulary, 'owner_id', None)}")
+    vocabulary = (await db.execute(
+        select(VocabularyModel.id)
+        .where(VocabularyModel.id == vocabulary_id)
+        .where(visible_to(current_user.id))
+        .limit(1)
+    )).scalar_one_or_none()
     if not vocabulary:
         raise HTTPException(status_code=404, detail="Vocabulary not found")
-    existing_favorite = db.query(FavoriteModel)\
-        .filter(FavoriteModel.user_id == current_user.id)\
-        .filter(FavoriteModel.vocabulary_id == vocabulary_id)\
-        .first()
+    existing_favorite = (await db.execute(
+        select(FavoriteModel)
+        .where(FavoriteModel.user_id == current_user.id)
+        .where(FavoriteModel.vocabulary_id == vocabulary_id)
+        .limit(1)
+    )).scalar_one_or_none()
     if existing_favorite:
         raise HTTPException(status_code=400, detail="Already in favorites")
-    favorite = FavoriteModel(user_id=current_user.id, vocabulary_id=vocabulary_id)
-    db.add(favorite)
-    db.commit()
+    await vocab_writes.add_favorite(db, current_user.id, vocabulary_id)
+    await db.commit()
+    logger.debug("favorite added", extra={"user_id": current_user.id, "vocabulary_id": vocabulary_id})
     return {"message": "Added to favorites"}
 
 @router.delete("/favorites/{vocabulary_id}")
-def remove_favorite(
+async def remove_favorite(
     vocabulary_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    favorite = db.query(FavoriteModel)\
-        .filter(FavoriteModel.user_id == current_user.id)\
-        .filter(FavoriteModel.vocabulary_id == vocabulary_id)\
-        .first()
+    favorite = (await db.execute(
+        select(FavoriteModel)
+        .where(FavoriteModel.user_id == current_user.id)
+        .where(FavoriteModel.vocabulary_id == vocabulary_id)
+        .limit(1)
+    )).scalar_one_or_none()
     
     if not favorite:
         raise HTTPException(status_code=404, detail="Favorite not found")
     
-    db.delete(favorite)
-    db.commit()
+    await vocab_writes.remove_favorite(db, favorite)
+    await db.commit()
     return {"message": "Removed from favorites"}
 
+@router.get("/export")
+async def export_vocabularies(
+    request: Request,
+    format: str = "ndjson",
+    current_user: UserModel = Depends(get_current_user)
+):
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    return StreamingResponse(
+        stream_vocabularies(
+            current_user.id, format, session_router.reader(current_user.id, cookie_pinned_until(request))
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="vocabularies.{format}"'},
+    )
+
+@router.get("/search", response_model=VocabularySearchPage)
+async def search(
+    q: str,
+    prefix: bool = True,
+    limit: int = 20,
+    offset: int = 0,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Tìm trên word/meaning/example qua chỉ mục full-text, không phân biệt dấu tiếng Việt
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="offset must not be negative")
+    items, next_offset = await search_vocabularies(db, current_user.id, q, prefix, limit, offset)
+    return {"items": items, "next_offset": next_offset}
+
+@router.get("/review/due", response_model=List[ReviewCardSchema])
+async def get_due_reviews(
+    limit: int = 20,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # N thẻ đến hạn sớm nhất (SM-2), đọc theo chỉ mục (user_id, due_at)
+    if limit < 1 or limit > MAX_REVIEW_BATCH:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_REVIEW_BATCH}")
+    return await get_due_cards(db, current_user.id, limit)
+
+@router.post("/review/{vocabulary_id}", response_model=ReviewCardSchema)
+async def review_vocabulary(
+    vocabulary_id: int,
+    review: ReviewGrade,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    state = await record_review(db, current_user.id, vocabulary_id, review.grade)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Vocabulary not found")
+    mark_written(db, current_user.id)
+    await db.commit()
+    await db.refresh(state, ["vocabulary"])
+    return state
+
+@router.get("/sync", response_model=SyncPage)
+async def sync_changes(
+    since: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 500,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Thay đổi (thêm/sửa/xoá từ vựng và yêu thích) sau seq `since`, theo thứ tự seq
+    # (services/sync.py). Không có since: ảnh chụp đầy đủ.
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    if since is not None and since < 0:
+        raise HTTPException(status_code=400, detail="since must not be negative")
+    try:
+        page = await read_changes(db, current_user.id, since, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return json_response(page)
+
+@router.get("/quiz", response_model=QuizSchema)
+async def get_quiz(
+    category: Optional[str] = None,
+    n: int = 10,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # n câu trắc nghiệm ngẫu nhiên, nhiễu cùng category; rút từ pool id trong bộ nhớ
+    # (services/quiz.py) và lấy nội dung bằng một query IN (...)
+    if n < 1 or n > MAX_QUIZ_QUESTIONS:
+        raise HTTPException(status_code=400, detail=f"n must be between 1 and {MAX_QUIZ_QUESTIONS}")
+    questions = await build_quiz(db, current_user.id, category or None, n)
+    if questions is None:
+        raise HTTPException(status_code=400, detail="At least 2 vocabularies are needed for a quiz")
+    return {"questions": questions}
+
+def open_dictionary():
+    dictionary = get_dictionary()
+    if dictionary is None:
+        raise HTTPException(status_code=503, detail="Dictionary not available")
+    return dictionary
+
+@router.get("/lookup", response_model=LookupSchema)
+async def lookup_word(
+    word: str,
+    response: Response,
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Tra từ điển Anh–Việt offline (services/dictionary.py) để điền sẵn nghĩa / ví dụ khi thêm từ
+    entries = open_dictionary().lookup(word)
+    if not entries:
+        raise HTTPException(status_code=404, detail="Word not found")
+    response.headers["Cache-Control"] = "private, max-age=3600"
+    return json_response({"word": entries[0]["word"], "entries": entries}, response)
+
+@router.get("/lookup/autocomplete", response_model=AutocompleteSchema)
+async def autocomplete_word(
+    prefix: str,
+    response: Response,
+    limit: int = 10,
+    current_user: UserModel = Depends(get_current_user)
+):
+    if limit < 1 or limit > MAX_AUTOCOMPLETE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_AUTOCOMPLETE}")
+    suggestions = open_dictionary().complete(prefix, limit)
+    response.headers["Cache-Control"] = "private, max-age=3600"
+    return json_response({"suggestions": suggestions}, response)
+
 @router.get("/{vocab_id}", response_model=VocabularySchema)
-def get_vocabulary(vocab_id: int, db: Session = Depends(get_db)):
-    db_vocab = db.query(VocabularyModel).filter(VocabularyModel.id == vocab_id).first()
+async def get_vocabulary(vocab_id: int, db: AsyncSession = Depends(get_db)):
+    db_vocab = await db.get(VocabularyModel, vocab_id)
     if db_vocab is None:
         raise HTTPException(status_code=404, detail="Vocabulary not found")
     return db_vocab
 
+@router.put("/{vocab_id}", response_model=VocabularySchema)
+async def update_vocabulary(
+    vocab_id: int,
+    data: VocabularyCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Sửa từ của bộ từ dùng chung tạo bản sao riêng (id mới) thay cho từ gốc với user này
+    vocabulary = (await db.execute(
+        select(VocabularyModel).where(
+            VocabularyModel.id == vocab_id,
+            visible_to(current_user.id)
+        ).limit(1)
+    )).scalar_one_or_none()
+    if not vocabulary:
+        raise HTTPException(status_code=404, detail="Vocabulary not found")
+    vocabulary = await vocab_writes.update_vocabulary(db, current_user.id, vocabulary, data.model_dump())
+    await db.commit()
+    await db.refresh(vocabulary)
+    return vocabulary
+
 @router.delete("/{vocab_id}")
-def delete_vocabulary(
+async def delete_vocabulary(
     vocab_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    vocabulary = db.query(VocabularyModel).filter(
-        VocabularyModel.id == vocab_id,
-        VocabularyModel.owner_id == current_user.id
-    ).first()
+    vocabulary = (await db.execute(
+        select(VocabularyModel).where(
+            VocabularyModel.id == vocab_id,
+            VocabularyModel.owner_id == current_user.id
+        ).limit(1)
+    )).scalar_one_or_none()
     if not vocabulary:
         raise HTTPException(status_code=404, detail="Vocabulary not found")
-    category = vocabulary.category
-    db.delete(vocabulary)
-    db.commit()
+    await vocab_writes.delete_vocabulary(db, vocabulary)
     # Kiểm tra nếu không còn từ nào trong danh mục này của user thì trả về danh sách categories mới
-    remaining = db.query(VocabularyModel).filter(
-        VocabularyModel.owner_id == current_user.id,
-        VocabularyModel.category == category
-    ).count()
+    remaining = await get_category_count(db, current_user.id, vocabulary.category)
     categories = None
     if remaining == 0:
         # Trả về danh sách categories mới đã loại bỏ danh mục rỗng
-        categories = db.query(VocabularyModel.category)\
-            .filter(VocabularyModel.owner_id == current_user.id)\
-            .distinct()\
-            .all()
-        categories = [c[0] for c in categories]
+        categories = [category for category, _ in await get_category_counts(db, current_user.id)]
+    await db.commit()
     return {"message": "Deleted", "categories": categories} 
\ No newline at end of file
@@ -0,0 +1,92 @@
+# Sắp xếp bộ từ: N thao tác (thêm yêu thích, bỏ yêu thích, xoá, thêm từ) gửi từng request
+# so với một POST /api/vocab/batch. Đo thời gian và số câu SQL, in-process.
+#
+#   cd backend && python -m benchmarks.bench_batch --ops 100
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import use_sqlite
+
+
+def make_ops(n, first_id):
+    # Một phần tư mỗi loại, trên các id khác nhau
+    quarter = n // 4
+    ids = iter(range(first_id, first_id + 3 * quarter))
+    ops = [{"op": "favorite", "id": next(ids)} for _ in range(quarter)]
+    ops += [{"op": "unfavorite", "id": next(ids)} for _ in range(quarter)]
+    ops += [{"op": "delete", "id": next(ids)} for _ in range(quarter)]
+    ops += [{"op": "create", "data": {"word": f"new{i}", "meaning": "m", "example": "e", "category": "TOEIC"}}
+            for i in range(n - 3 * quarter)]
+    return ops
+
+
+async def individually(client, headers, ops):
+    for op in ops:
+        if op["op"] == "create":
+            response = await client.post("/api/vocab/vocabularies", headers=headers, json=op["data"])
+        elif op["op"] == "favorite":
+            response = await client.post(f"/api/vocab/favorites/{op['id']}", headers=headers)
+        elif op["op"] == "unfavorite":
+            response = await client.delete(f"/api/vocab/favorites/{op['id']}", headers=headers)
+        else:
+            response = await client.delete(f"/api/vocab/{op['id']}", headers=headers)
+        assert response.status_code == 200, response.text
+
+
+async def batched(client, headers, ops):
+    response = await client.post("/api/vocab/batch", headers=headers, json={"ops": ops})
+    assert response.status_code == 200, response.text
+    assert all(r["status"] == 200 for r in response.json()["results"])
+
+
+async def main(args):
+    db_path = use_sqlite()
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    import httpx
+    from sqlalchemy import event
+    from database.database import async_engine, engine
+    from database.migrations import run_migrations
+    from main import app
+
+    run_migrations(engine, log=lambda _: None)
+    statements = []
+    event.listen(async_engine.sync_engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        user = {"email": "bench@example.com", "password": "benchpassword"}
+        await client.post("/api/auth/register", json=user)
+        token = (await client.post(
+            "/api/auth/token", data={"username": user["email"], "password": user["password"]}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        # Hai bộ từ giống nhau để mỗi cách chạy trên dữ liệu riêng; nửa đầu mỗi bộ đã được yêu thích
+        words_per_run = 3 * (args.ops // 4)
+        body = "\n".join(json.dumps({"word": f"w{i}", "meaning": "m", "example": "e", "category": "TOEIC"})
+                         for i in range(2 * words_per_run))
+        await client.post("/api/vocab/vocabularies/bulk", headers=headers, content=body)
+        report = {"ops": args.ops}
+        for name, fn, first_id in (("individual", individually, 1), ("batch", batched, words_per_run + 1)):
+            ops = make_ops(args.ops, first_id)
+            unfavorite_ids = [op["id"] for op in ops if op["op"] == "unfavorite"]
+            await client.post("/api/vocab/batch", headers=headers,
+                              json={"ops": [{"op": "favorite", "id": i} for i in unfavorite_ids]})
+            statements.clear()
+            start = time.perf_counter()
+            await fn(client, headers, ops)
+            report[name] = {
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "sql_statements": len(statements),
+            }
+    print(json.dumps(report, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,56 @@
+# Thời gian import N từ qua POST /api/vocab/vocabularies/bulk (body stream JSON lines).
+#
+#   cd backend && python -m benchmarks.bench_bulk_import --rows 100000
+import argparse
+import asyncio
+import json
+import os
+
+from benchmarks.common import Timer, use_sqlite
+
+
+async def jsonl_body(rows):
+    lines = []
+    for i in range(rows):
+        lines.append(json.dumps({
+            "word": f"word{i}", "meaning": f"nghĩa {i}", "example": f"Example sentence {i}.",
+            "category": ("TOEIC", "IELTS", "Communication")[i % 3],
+        }, ensure_ascii=False))
+        if len(lines) == 1000:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield "\n".join(lines).encode()
+
+
+async def main(args):
+    db_path = use_sqlite()
+    import httpx
+    from main import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        user = {"email": "bulk@example.com", "password": "benchpassword"}
+        await client.post("/api/auth/register", json=user)
+        token = (await client.post(
+            "/api/auth/token", data={"username": user["email"], "password": user["password"]}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"}
+        with Timer() as timer:
+            response = await client.post(
+                "/api/vocab/vocabularies/bulk", headers=headers, content=jsonl_body(args.rows)
+            )
+    result = response.json()
+    print(json.dumps({
+        "rows": args.rows,
+        "inserted": result["inserted"],
+        "failed": result["failed"],
+        "seconds": round(timer.elapsed, 3),
+        "rows_per_second": round(result["inserted"] / timer.elapsed, 1),
+    }, indent=2))
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    asyncio.run(main(parser.parse_args()))
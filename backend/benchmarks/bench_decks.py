@@ -0,0 +1,215 @@
+# Bộ từ dùng chung (services/decks.py) so với chép bộ từ vào vocabularies cho từng user:
+# dung lượng bảng + chỉ mục (SQLite dbstat, tính cả bảng FTS của tìm kiếm) và độ trễ
+# GET /api/vocab/vocabularies.
+#   - copy: mỗi user có D dòng vocabularies + D dòng review_state. Dựng thật với --copy-users
+#     user rồi ngoại suy tuyến tính tới --users (mọi bảng tăng theo số dòng)
+#   - shared: D từ lưu một lần, --users dòng deck_subscriptions
+# user_categories (rollup theo user) như nhau ở hai mô hình nên dựng ở cả hai.
+# Độ trễ đo trên DB shared (--users người đăng ký), so user đăng ký với một user có bản chép,
+# cả hai thêm --personal từ riêng.
+#
+#   cd backend && python -m benchmarks.bench_decks --users 100000 --deck-words 2000
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import Counter
+
+from benchmarks.common import summarize, use_sqlite
+
+BATCH_SIZE = 5000
+TABLES = ("vocabularies", "vocabularies_fts", "review_state", "user_categories", "deck_subscriptions", "decks")
+# Bảng tăng theo số user ở mô hình chép; bảng còn lại chỉ có trang rỗng, không ngoại suy
+PER_USER_TABLES = ("vocabularies", "vocabularies_fts", "review_state", "user_categories")
+
+
+def deck_words(words, seed):
+    from benchmarks.datagen import generate_rows
+    rows = generate_rows(users=1, words=words, favorite_ratio=0, seed=seed)["vocabularies"]
+    return [{k: v for k, v in row.items() if k not in ("id", "owner_id")} for row in rows]
+
+
+def insert_batches(conn, table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        conn.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def add_users(conn, first, count):
+    from benchmarks.datagen import user_email
+    from models import User
+    insert_batches(conn, User.__table__, [
+        {"id": u, "email": user_email(u), "hashed_password": "x", "is_active": True}
+        for u in range(first, first + count)
+    ])
+
+
+def add_rollups(conn, user_ids, counts):
+    from models import UserCategory
+    rows = [{"user_id": u, "category": c, "word_count": n} for u in user_ids for c, n in counts.items()]
+    insert_batches(conn, UserCategory.__table__, rows)
+
+
+def copy_deck_to(conn, user_ids, deck):
+    # Cách cũ: chép từng dòng + review_state cho từ vừa chép
+    from sqlalchemy import text
+    from models import Vocabulary
+    for user_id in user_ids:
+        insert_batches(conn, Vocabulary.__table__, [{**word, "owner_id": user_id} for word in deck])
+    conn.execute(text(
+        "INSERT INTO review_state (user_id, vocabulary_id, ease, interval, repetitions, due_at) "
+        "SELECT owner_id, id, 2.5, 0, 0, created_at FROM vocabularies WHERE owner_id IS NOT NULL "
+        "AND id NOT IN (SELECT vocabulary_id FROM review_state)"
+    ))
+
+
+def object_sizes(engine):
+    # {bảng: {"table_bytes", "index_bytes"}}; bảng phụ của FTS5 gộp vào vocabularies_fts
+    from sqlalchemy import text
+    with engine.connect() as conn:
+        owners = {name: (table, kind) for name, table, kind in conn.execute(text(
+            "SELECT name, tbl_name, type FROM sqlite_master WHERE type IN ('table', 'index')"
+        ))}
+        sizes = conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")).all()
+    report = {}
+    for name, size in sizes:
+        table, kind = owners.get(name, (name, "table"))
+        if table.startswith("vocabularies_fts"):
+            table = "vocabularies_fts"
+        entry = report.setdefault(table, {"table_bytes": 0, "index_bytes": 0})
+        entry["index_bytes" if kind == "index" else "table_bytes"] += size
+    return report
+
+
+def compared(sizes, scale=1.0):
+    report = {}
+    for table in TABLES:
+        entry = sizes.get(table, {"table_bytes": 0, "index_bytes": 0})
+        factor = scale if table in PER_USER_TABLES else 1.0
+        report[table] = {key: int(value * factor) for key, value in entry.items()}
+    report["total_bytes"] = sum(e["table_bytes"] + e["index_bytes"] for e in report.values())
+    return report
+
+
+def measure_copy_model(deck, copy_users, seed):
+    from sqlalchemy import create_engine
+    from database.migrations import run_migrations
+    fd, path = tempfile.mkstemp(prefix="bench_copy_", suffix=".db")
+    os.close(fd)
+    os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    try:
+        run_migrations(engine, log=lambda _: None)
+        counts = Counter(word["category"] for word in deck)
+        with engine.begin() as conn:
+            add_users(conn, 1, copy_users)
+            copy_deck_to(conn, range(1, copy_users + 1), deck)
+            add_rollups(conn, range(1, copy_users + 1), counts)
+        return object_sizes(engine)
+    finally:
+        engine.dispose()
+        os.remove(path)
+
+
+def build_shared_model(engine, deck, users):
+    from sqlalchemy import insert
+    from models import Deck, DeckSubscription, Vocabulary
+    counts = Counter(word["category"] for word in deck)
+    with engine.begin() as conn:
+        deck_id = conn.execute(insert(Deck.__table__).values(
+            slug="bench", name="Bench deck", word_count=len(deck)
+        )).inserted_primary_key[0]
+        insert_batches(conn, Vocabulary.__table__, [{**word, "deck_id": deck_id} for word in deck])
+        add_users(conn, 1, users)
+        insert_batches(conn, DeckSubscription.__table__, [
+            {"user_id": u, "deck_id": deck_id} for u in range(1, users + 1)
+        ])
+        add_rollups(conn, range(1, users + 1), counts)
+
+
+def add_personal_words(engine, user_ids, words, seed):
+    from models import Vocabulary
+    personal = deck_words(words, seed + 1)
+    with engine.begin() as conn:
+        for user_id in user_ids:
+            insert_batches(conn, Vocabulary.__table__, [{**word, "owner_id": user_id} for word in personal])
+
+
+async def measure_latency(client, tokens, requests):
+    from benchmarks.datagen import CATEGORIES
+    cases = {
+        "first_page": {"after": "", "limit": 100},
+        "category_page": {"after": "", "limit": 100, "category": CATEGORIES[0]},
+        "offset_page": {"skip": 1000, "limit": 100},
+    }
+    samples = {(case, model): [] for case in cases for model in tokens}
+    for _ in range(requests):
+        for case, params in cases.items():
+            for model, headers in tokens.items():
+                start = time.perf_counter()
+                response = await client.get("/api/vocab/vocabularies", params=params, headers=headers)
+                samples[(case, model)].append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+    return {case: {model: summarize(samples[(case, model)]) for model in tokens} for case in cases}
+
+
+async def main(args):
+    db_path = use_sqlite()
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    import httpx
+    from database.database import async_engine, engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import user_email
+    from api.auth import create_access_token
+    from main import app
+
+    deck = deck_words(args.deck_words, args.seed)
+    copy_sizes = measure_copy_model(deck, args.copy_users, args.seed)
+
+    run_migrations(engine, log=lambda _: None)
+    build_shared_model(engine, deck, args.users)
+    shared_sizes = object_sizes(engine)
+
+    # Độ trễ: user 1 đăng ký bộ từ; user users+1 có bản chép như cách cũ
+    copy_user = args.users + 1
+    with engine.begin() as conn:
+        add_users(conn, copy_user, 1)
+        copy_deck_to(conn, [copy_user], deck)
+    add_personal_words(engine, [1, copy_user], args.personal, args.seed)
+    tokens = {
+        model: {"Authorization": f"Bearer {create_access_token({'sub': user_email(user_id)})}"}
+        for model, user_id in (("shared", 1), ("copy", copy_user))
+    }
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await measure_latency(client, tokens, 5)
+        latency = await measure_latency(client, tokens, args.requests)
+
+    copy_report = compared(copy_sizes, args.users / args.copy_users)
+    shared_report = compared(shared_sizes)
+    print(json.dumps({
+        "users": args.users,
+        "deck_words": args.deck_words,
+        "copy_measured_at_users": args.copy_users,
+        "copy_measured": compared(copy_sizes),
+        "copy_extrapolated": copy_report,
+        "shared": shared_report,
+        "size_ratio": round(copy_report["total_bytes"] / shared_report["total_bytes"], 1),
+        "list_latency": latency,
+    }, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--deck-words", type=int, default=2000)
+    parser.add_argument("--copy-users", type=int, default=200, help="số user dựng thật cho mô hình chép")
+    parser.add_argument("--personal", type=int, default=50, help="số từ riêng của hai user đo độ trễ")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
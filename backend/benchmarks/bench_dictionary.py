@@ -0,0 +1,198 @@
+# Từ điển offline (services/dictionary.py): thời gian dựng index, độ trễ tra cứu / autocomplete
+# (trực tiếp và qua HTTP) và bộ nhớ mỗi worker khi W process cùng phục vụ:
+#   - mmap: mỗi worker mmap file index (cách đang dùng)
+#   - heap: mỗi worker nạp TSV vào dict + list khoá đã sort trong heap của mình
+# RSS tính cả trang mmap dùng chung nên gần như nhau giữa các worker; PSS (smaps_rollup, Linux)
+# chia trang dùng chung cho số process đang map, phản ánh chi phí thật của mỗi worker.
+#
+#   cd backend && python -m benchmarks.bench_dictionary --entries 300000 --workers 4
+import argparse
+import asyncio
+import bisect
+import json
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import Timer, summarize, use_sqlite
+
+
+def write_source(path, entries, seed):
+    from benchmarks.datagen import SYLLABLES
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = []
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(entries):
+            # ~1/5 từ có nhiều nghĩa như từ điển thật
+            word = words[-1] if words and rng.random() < 0.2 else "".join(
+                rng.choice(letters) for _ in range(rng.randint(3, 12))
+            )
+            words.append(word)
+            meaning = " ".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 8)))
+            example = f"The {word} " + " ".join(rng.choice(letters) * 3 for _ in range(rng.randint(3, 8))) + "."
+            f.write(f"{word}\t{meaning}\t{example if rng.random() < 0.5 else ''}\n")
+    return sorted(set(words))
+
+
+def memory():
+    # (rss, pss) byte của process hiện tại; pss None nếu không có smaps_rollup
+    values = {}
+    for name in ("/proc/self/smaps_rollup", "/proc/self/status"):
+        try:
+            with open(name) as f:
+                for line in f:
+                    key, _, rest = line.partition(":")
+                    if key in ("Rss", "Pss", "VmRSS"):
+                        values[key] = int(rest.split()[0]) * 1024
+        except OSError:
+            continue
+    return values.get("Rss", values.get("VmRSS")), values.get("Pss")
+
+
+def load_heap(source):
+    from services.dictionary import normalize
+    entries = {}
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            word, meaning, example = line.rstrip("\n").split("\t")
+            entries.setdefault(normalize(word), []).append({"word": word, "meaning": meaning, "example": example or None})
+    return entries, sorted(entries)
+
+
+def worker(mode, index_path, source, words, lookups, seed, barrier, results):
+    from services.dictionary import Dictionary
+    before = memory()
+    rng = random.Random(seed)
+    if mode == "mmap":
+        index = Dictionary(index_path)
+        for word in rng.choices(words, k=lookups):
+            index.lookup(word)
+    else:
+        entries, keys = load_heap(source)
+        for word in rng.choices(words, k=lookups):
+            entries.get(word)
+            bisect.bisect_left(keys, word)
+    # Đo khi mọi worker đều đang giữ dữ liệu để PSS chia trang dùng chung đúng số process
+    barrier.wait()
+    after = memory()
+    results.put({"rss_before": before[0], "rss": after[0], "pss": after[1]})
+    barrier.wait()
+
+
+def measure_workers(mode, args, index_path, source, words):
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(args.workers), context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, index_path, source, words, args.lookups, args.seed + i, barrier, results))
+        for i in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    mb = 1024 * 1024
+    return {
+        "rss_mb_per_worker": round(sum(r["rss"] for r in reports) / len(reports) / mb, 1),
+        "rss_growth_mb_per_worker": round(sum(r["rss"] - r["rss_before"] for r in reports) / len(reports) / mb, 1),
+        "pss_mb_per_worker": (
+            round(sum(r["pss"] for r in reports) / len(reports) / mb, 1) if reports[0]["pss"] is not None else None
+        ),
+    }
+
+
+def time_calls(fn, arguments):
+    samples = []
+    for argument in arguments:
+        start = time.perf_counter()
+        fn(argument)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+async def measure_http(words, prefixes, requests):
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    # Không in log từng request xen vào báo cáo JSON
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import httpx
+    from database.database import async_engine, engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import generate, user_email
+    from api.auth import create_access_token
+    from main import app
+
+    run_migrations(engine, log=lambda _: None)
+    generate(engine, users=1, words=0)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_email(1)})}"}
+    samples = {"lookup": [], "autocomplete": []}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for word, prefix in zip(words[:requests], prefixes[:requests]):
+            for name, path, params in (
+                ("lookup", "/api/vocab/lookup", {"word": word}),
+                ("autocomplete", "/api/vocab/lookup/autocomplete", {"prefix": prefix}),
+            ):
+                start = time.perf_counter()
+                response = await client.get(path, params=params, headers=headers)
+                samples[name].append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+    await async_engine.dispose()
+    engine.dispose()
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def main(args):
+    db_path = use_sqlite()
+    workdir = tempfile.mkdtemp(prefix="bench_dictionary_")
+    source = os.path.join(workdir, "source.tsv")
+    index_path = os.path.join(workdir, "dictionary.idx")
+    os.environ["DICTIONARY_PATH"] = index_path
+    from services.dictionary import Dictionary, build_index
+
+    words = write_source(source, args.entries, args.seed)
+    with Timer() as build_timer, open(source, encoding="utf-8") as f:
+        built = build_index(f, index_path)
+
+    rng = random.Random(args.seed)
+    hits = rng.choices(words, k=args.requests)
+    misses = [word + "qq" for word in rng.choices(words, k=args.requests)]
+    prefixes = [word[:rng.randint(1, 3)] for word in rng.choices(words, k=args.requests)]
+    with Timer() as open_timer:
+        index = Dictionary(index_path)
+    direct = {
+        "lookup_hit": time_calls(index.lookup, hits),
+        "lookup_miss": time_calls(index.lookup, misses),
+        "autocomplete": time_calls(index.complete, prefixes),
+    }
+    index.close()
+
+    report = {
+        "entries": built["entries"],
+        "index_mb": round(built["bytes"] / 1024 / 1024, 1),
+        "source_mb": round(os.path.getsize(source) / 1024 / 1024, 1),
+        "build_s": round(build_timer.elapsed, 2),
+        "open_ms": round(open_timer.elapsed * 1000, 3),
+        "direct": direct,
+        "http": asyncio.run(measure_http(hits, prefixes, args.requests)),
+        "workers": args.workers,
+        "memory": {mode: measure_workers(mode, args, index_path, source, words) for mode in ("mmap", "heap")},
+    }
+    print(json.dumps(report, indent=2))
+    for path in (source, index_path):
+        os.remove(path)
+    os.rmdir(workdir)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=300000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=20000, help="số lần tra trong mỗi worker trước khi đo bộ nhớ")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,57 @@
+# Chi phí phía thread gọi log (thread xử lý request) của từng cách ghi log:
+#   print:        print(f"[DEBUG] ...") như code cũ, format cả danh sách id
+#   debug_off:    logger.debug(...) khi level INFO (bị bỏ qua trước khi format)
+#   queue_info:   logger.info(...) qua QueueHandler (services/log.py)
+#   stream_info:  logger.info(...) ghi thẳng bằng StreamHandler + JsonFormatter
+# Output ghi vào /dev/null để không đo tốc độ terminal.
+#
+#   cd backend && python -m benchmarks.bench_logging --iterations 100000
+import argparse
+import contextlib
+import json
+import logging
+import os
+import time
+
+
+def measure(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(args):
+    from services.log import JsonFormatter, configure_logging, stop_logging
+
+    ids = list(range(200))
+    devnull = open(os.devnull, "w")
+    logger = logging.getLogger("vocab.bench")
+    results = {}
+
+    with contextlib.redirect_stdout(devnull):
+        results["print_us"] = measure(lambda: print(f"[DEBUG] GET /favorites for user_id=1: {ids}"), args.iterations)
+
+    handler = configure_logging(level="INFO", stream=devnull, queue_size=args.iterations + 1)
+    results["debug_off_us"] = measure(lambda: logger.debug("favorites listed", extra={"user_id": 1, "ids": ids}), args.iterations)
+    results["queue_info_us"] = measure(lambda: logger.info("favorites listed", extra={"user_id": 1, "count": len(ids)}), args.iterations)
+    start = time.perf_counter()
+    stop_logging()
+    results["queue_drain_seconds"] = time.perf_counter() - start
+    results["queue_dropped"] = handler.dropped
+
+    stream = logging.StreamHandler(devnull)
+    stream.setFormatter(JsonFormatter())
+    root = logging.getLogger()
+    root.addHandler(stream)
+    results["stream_info_us"] = measure(lambda: logger.info("favorites listed", extra={"user_id": 1, "count": len(ids)}), args.iterations)
+    root.removeHandler(stream)
+    devnull.close()
+
+    print(json.dumps({"iterations": args.iterations, **{k: round(v, 3) for k, v in results.items()}}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100000)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+# p99 của GET /api/vocab/vocabularies khi không có / có login burst song song.
+#
+#   cd backend && python -m benchmarks.bench_login_burst --duration 5 --logins 32
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import summarize, use_sqlite
+
+
+async def _reader(client, headers, stop_at, samples):
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        response = await client.get("/api/vocab/vocabularies", headers=headers)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+
+
+async def _login_loop(client, stop_at, counters):
+    form = {"username": "bench@example.com", "password": "benchpassword"}
+    while time.perf_counter() < stop_at:
+        response = await client.post("/api/auth/token", data=form)
+        counters[response.status_code] = counters.get(response.status_code, 0) + 1
+
+
+async def _phase(client, headers, duration, readers, logins):
+    stop_at = time.perf_counter() + duration
+    samples, counters = [], {}
+    tasks = [_reader(client, headers, stop_at, samples) for _ in range(readers)]
+    tasks += [_login_loop(client, stop_at, counters) for _ in range(logins)]
+    await asyncio.gather(*tasks)
+    result = summarize(samples, duration)
+    result["logins"] = counters
+    return result
+
+
+async def main(args):
+    db_path = use_sqlite()
+    # Đo throughput của endpoint, không phải rate limiter (xem bench_rate_limit)
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    import httpx
+    from main import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        user = {"email": "bench@example.com", "password": "benchpassword"}
+        await client.post("/api/auth/register", json=user)
+        token = (await client.post(
+            "/api/auth/token", data={"username": user["email"], "password": user["password"]}
+        )).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for i in range(100):
+            await client.post("/api/vocab/vocabularies", headers=headers, json={
+                "word": f"word{i}", "meaning": f"nghĩa {i}", "example": "example", "category": "TOEIC",
+            })
+
+        report = {
+            "idle": await _phase(client, headers, args.duration, args.readers, 0),
+            "login_burst": await _phase(client, headers, args.duration, args.readers, args.logins),
+        }
+    print(json.dumps(report, indent=2))
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,89 @@
+# Chi phí của MetricsMiddleware và hook SQL (services/metrics.py).
+#   middleware: gọi thẳng ASGI app rỗng, có và không có middleware
+#   sql_hook:   "SELECT 1" trên SQLite in-memory trong một request (contextvar đã đặt), có và
+#               không có instrument_engine: chỉ đếm (mặc định), đo 1/100 câu, đo mọi câu
+#   request:    middleware + --queries-per-request câu với hook mặc định
+#
+#   cd backend && python -m benchmarks.bench_metrics_overhead --iterations 200000
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import use_sqlite
+
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def measure_asgi(app, iterations):
+    scope = {"type": "http", "method": "GET", "path": "/bench"}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / iterations
+
+
+def measure_sql(engine, iterations):
+    from sqlalchemy import text
+    from services.metrics import RequestStats, current_request
+    statement = text("SELECT 1")
+    token = current_request.set(RequestStats())
+    try:
+        with engine.connect() as conn:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                conn.execute(statement)
+            return (time.perf_counter() - start) / iterations
+    finally:
+        current_request.reset(token)
+
+
+def main(args):
+    use_sqlite()
+    from sqlalchemy import create_engine
+    from services.metrics import MetricsMiddleware, instrument_engine
+
+    bare = asyncio.run(measure_asgi(bare_app, args.iterations))
+    wrapped = asyncio.run(measure_asgi(MetricsMiddleware(bare_app), args.iterations))
+
+    # Các engine đo xen kẽ nhiều vòng, lấy vòng nhanh nhất để bớt nhiễu của máy đo
+    sql_iterations = max(1, args.iterations // 4 // args.rounds)
+    engines = {"plain": create_engine("sqlite://")}
+    for name, timing_every in (("count_only", 0), ("timing_1_in_100", 100), ("timing_every_query", 1)):
+        engines[name] = create_engine("sqlite://")
+        instrument_engine(engines[name], f"bench_{name}", timing_every=timing_every)
+    best = {}
+    for _ in range(args.rounds):
+        for name, engine in engines.items():
+            best[name] = min(best.get(name, float("inf")), measure_sql(engine, sql_iterations))
+    plain = best.pop("plain")
+    hooks = {name: round((value - plain) * 1e6, 2) for name, value in best.items()}
+
+    middleware = (wrapped - bare) * 1e6
+    print(json.dumps({
+        "iterations": args.iterations,
+        "middleware_us_per_request": round(middleware, 2),
+        "sql_hook_us_per_query": hooks,
+        "request_overhead_us": round(middleware + args.queries_per_request * hooks["count_only"], 2),
+        "queries_per_request": args.queries_per_request,
+        "bare_asgi_us": round(bare * 1e6, 2),
+        "plain_select_us": round(plain * 1e6, 2),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--queries-per-request", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    main(parser.parse_args())
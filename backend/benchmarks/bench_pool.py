@@ -0,0 +1,89 @@
+# Độ trễ mỗi request của các endpoint đọc DB khi pool có / không có pool_pre_ping.
+# Cùng app, cùng dữ liệu; bật/tắt pre-ping trên pool đang chạy (pool._pre_ping) và
+# xen kẽ từng khối request để hai biến thể chịu cùng điều kiện máy.
+# Trên SQLite ping chỉ là một SELECT 1 trong process; với MySQL (--database-url) là một
+# round trip mạng nên chênh lệch lớn hơn.
+#
+#   cd backend && python -m benchmarks.bench_pool --requests 2000
+#   cd backend && python -m benchmarks.bench_pool --database-url mysql+pymysql://...
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import summarize, use_sqlite
+
+ENDPOINTS = (
+    ("/api/vocab/vocabularies", {"limit": 20}),
+    ("/api/vocab/categories", {}),
+    ("/api/vocab/favorites", {}),
+)
+
+
+async def measure(client, headers, pool, requests, block):
+    samples = {(path, pre_ping): [] for path, _ in ENDPOINTS for pre_ping in (False, True)}
+    for start in range(0, requests, block):
+        for pre_ping in (False, True):
+            pool._pre_ping = pre_ping
+            for path, params in ENDPOINTS:
+                for _ in range(min(block, requests - start)):
+                    begin = time.perf_counter()
+                    response = await client.get(path, params=params, headers=headers)
+                    samples[(path, pre_ping)].append(time.perf_counter() - begin)
+                    assert response.status_code == 200, response.text
+    pool._pre_ping = False
+    return samples
+
+
+async def main(args):
+    db_path = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = use_sqlite()
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    import httpx
+    from database.database import async_engine, engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import generate
+    from main import app
+    from services.metrics import pool_stats
+
+    run_migrations(engine, log=lambda _: None)
+    if db_path:
+        generate(engine, users=1, words=500, seed=args.seed)
+    from api.auth import create_access_token
+    from benchmarks.datagen import user_email
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_email(1)})}"}
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for path, params in ENDPOINTS:
+            await client.get(path, params=params, headers=headers)
+        samples = await measure(client, headers, async_engine.sync_engine.pool, args.requests, args.block)
+        stats = pool_stats(async_engine.sync_engine.pool)
+
+    report = {}
+    for path, _ in ENDPOINTS:
+        without, with_ping = summarize(samples[(path, False)]), summarize(samples[(path, True)])
+        report[path] = {
+            "no_pre_ping": without,
+            "pre_ping": with_ping,
+            "p50_saved_ms": round(with_ping["p50_ms"] - without["p50_ms"], 3),
+        }
+    print(json.dumps({"requests": args.requests, "endpoints": report, "pool": stats}, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    if db_path:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000, help="số request mỗi endpoint cho mỗi biến thể")
+    parser.add_argument("--block", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,166 @@
+# Thống kê học tập (GET /api/progress/stats) theo số từ của user:
+#   - rollup: services.progress.get_stats, chỉ đọc user_categories + user_daily_stats (cách đang dùng)
+#   - scan: tính cùng số liệu trực tiếp từ vocabularies / favorites / review_state mỗi request
+# Mỗi kích thước --sizes là một user, từ rải đều trong --history ngày; rollup dựng bằng
+# rebuild_progress (đường của `manage.py backfill-progress`), thời gian dựng in kèm.
+#
+#   cd backend && python -m benchmarks.bench_progress --sizes 100,10000,100000
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import time
+
+from benchmarks.common import Timer, summarize, use_sqlite
+
+BATCH_SIZE = 5000
+
+
+def seed(engine, sizes, history, seed):
+    # users.id = vị trí trong sizes; ~10% từ yêu thích, ~60% đã ôn, ~15% đã thuộc
+    from benchmarks.datagen import CATEGORIES, user_email
+    from models import Favorite, ReviewState, User, UserCategory, Vocabulary
+    rng = random.Random(seed)
+    today = datetime.datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    vocabulary_id = 0
+    with engine.begin() as conn:
+        for user_id, size in enumerate(sizes, start=1):
+            conn.execute(User.__table__.insert(), [{
+                "id": user_id, "email": user_email(user_id), "hashed_password": "x", "is_active": True,
+            }])
+            words, states, favorites, counts = [], [], [], {}
+            for _ in range(size):
+                vocabulary_id += 1
+                category = rng.choice(CATEGORIES)
+                counts[category] = counts.get(category, 0) + 1
+                created_at = today - datetime.timedelta(days=rng.randrange(history), seconds=rng.randrange(3600))
+                words.append({
+                    "id": vocabulary_id, "word": f"w{vocabulary_id}", "meaning": "m", "example": "e",
+                    "category": category, "created_at": created_at, "owner_id": user_id,
+                })
+                reviewed = created_at + datetime.timedelta(days=rng.randint(0, 3)) if rng.random() < 0.6 else None
+                if reviewed and reviewed > today:
+                    reviewed = today
+                interval = rng.choice((1, 6, 15, 30, 60)) if reviewed else 0
+                states.append({
+                    "user_id": user_id, "vocabulary_id": vocabulary_id, "ease": 2.5, "interval": interval,
+                    "repetitions": 2 if reviewed else 0, "due_at": created_at, "last_reviewed_at": reviewed,
+                })
+                if rng.random() < 0.1:
+                    favorites.append({"user_id": user_id, "vocabulary_id": vocabulary_id, "created_at": created_at})
+            for table, rows in (
+                (Vocabulary.__table__, words), (ReviewState.__table__, states), (Favorite.__table__, favorites),
+                (UserCategory.__table__, [{"user_id": user_id, "category": c, "word_count": n} for c, n in counts.items()]),
+            ):
+                for start in range(0, len(rows), BATCH_SIZE):
+                    conn.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+async def scan_stats(db, user_id, days):
+    # Cùng số liệu với get_stats nhưng quét bảng gốc của user
+    from sqlalchemy import func, select, union
+    from models import Favorite as FavoriteModel, ReviewState, Vocabulary as VocabularyModel
+    from services.progress import MASTERED_INTERVAL_DAYS
+    today = datetime.datetime.utcnow().date()
+    first = datetime.datetime.combine(today - datetime.timedelta(days=days - 1), datetime.time())
+    categories = (await db.execute(
+        select(VocabularyModel.category, func.count(), func.count(FavoriteModel.id),
+               func.sum(ReviewState.interval >= MASTERED_INTERVAL_DAYS))
+        .outerjoin(FavoriteModel, (FavoriteModel.vocabulary_id == VocabularyModel.id) & (FavoriteModel.user_id == user_id))
+        .outerjoin(ReviewState, (ReviewState.vocabulary_id == VocabularyModel.id) & (ReviewState.user_id == user_id))
+        .where(VocabularyModel.owner_id == user_id)
+        .group_by(VocabularyModel.category)
+    )).all()
+    added = (await db.execute(
+        select(func.date(VocabularyModel.created_at), func.count())
+        .where(VocabularyModel.owner_id == user_id, VocabularyModel.created_at >= first)
+        .group_by(func.date(VocabularyModel.created_at))
+    )).all()
+    reviews = (await db.execute(
+        select(func.date(ReviewState.last_reviewed_at), func.count())
+        .where(ReviewState.user_id == user_id, ReviewState.last_reviewed_at >= first)
+        .group_by(func.date(ReviewState.last_reviewed_at))
+    )).all()
+    # Chuỗi ngày học: mọi ngày có hoạt động của user
+    active = union(
+        select(func.date(VocabularyModel.created_at).label("day")).where(VocabularyModel.owner_id == user_id),
+        select(func.date(ReviewState.last_reviewed_at)).where(
+            ReviewState.user_id == user_id, ReviewState.last_reviewed_at.isnot(None)
+        ),
+    ).subquery()
+    active_days = (await db.execute(select(active.c.day).order_by(active.c.day.desc()))).scalars().all()
+    return categories, added, reviews, len(active_days)
+
+
+async def measure(sizes, requests):
+    import httpx
+    from database.database import AsyncSessionLocal
+    from benchmarks.datagen import user_email
+    from api.auth import create_access_token
+    from main import app
+    from services.progress import get_stats
+
+    report = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for user_id, size in enumerate(sizes, start=1):
+            headers = {"Authorization": f"Bearer {create_access_token({'sub': user_email(user_id)})}"}
+            samples = {"rollup": [], "scan": [], "http": []}
+            async with AsyncSessionLocal() as db:
+                for _ in range(requests):
+                    for name, fn in (("rollup", get_stats), ("scan", scan_stats)):
+                        start = time.perf_counter()
+                        await fn(db, user_id, 30)
+                        samples[name].append(time.perf_counter() - start)
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.get("/api/progress/stats", headers=headers)
+                samples["http"].append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+            body = response.json()
+            report[size] = {
+                "current_streak": body["current_streak"],
+                "mastered_count": body["mastered_count"],
+                **{name: summarize(values) for name, values in samples.items()},
+            }
+    return report
+
+
+async def main(args):
+    db_path = use_sqlite()
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from database.database import AsyncSessionLocal, async_engine, engine
+    from database.migrations import run_migrations
+    from services.progress import rebuild_progress
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    run_migrations(engine, log=lambda _: None)
+    seed(engine, sizes, args.history, args.seed)
+    with Timer() as backfill_timer:
+        async with AsyncSessionLocal() as db:
+            daily_rows = await rebuild_progress(db, list(range(1, len(sizes) + 1)))
+            await db.commit()
+
+    print(json.dumps({
+        "sizes": sizes,
+        "history_days": args.history,
+        "backfill_s": round(backfill_timer.elapsed, 2),
+        "daily_rows": daily_rows,
+        "stats": await measure(sizes, args.requests),
+    }, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,10000,100000", help="số từ của từng user, cách nhau bởi dấu phẩy")
+    parser.add_argument("--history", type=int, default=365, help="số ngày rải created_at")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
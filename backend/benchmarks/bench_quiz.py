@@ -0,0 +1,75 @@
+# Tạo quiz n câu: pool id trong bộ nhớ + một query IN (...) so với ORDER BY RANDOM()
+# cho từng câu (1 query chọn từ + 1 query chọn 3 nghĩa nhiễu cùng category).
+# Đo ở tầng service trên cùng session để so đúng phần truy vấn.
+#
+#   cd backend && python -m benchmarks.bench_quiz --words 20000 --rounds 200
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmarks.common import summarize, use_sqlite
+
+
+async def naive_quiz(db, user_id, category, n):
+    from sqlalchemy import func, select
+    from models import Vocabulary as VocabularyModel
+
+    questions = []
+    for _ in range(n):
+        word = (await db.execute(
+            select(VocabularyModel.id, VocabularyModel.word, VocabularyModel.meaning)
+            .where(VocabularyModel.owner_id == user_id, VocabularyModel.category == category)
+            .order_by(func.random()).limit(1)
+        )).one()
+        distractors = (await db.execute(
+            select(VocabularyModel.meaning)
+            .where(VocabularyModel.owner_id == user_id, VocabularyModel.category == category,
+                   VocabularyModel.id != word.id)
+            .order_by(func.random()).limit(3)
+        )).scalars().all()
+        questions.append((word, distractors))
+    return questions
+
+
+async def main(args):
+    db_path = use_sqlite()
+    from database.database import AsyncSessionLocal, async_engine, engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import CATEGORIES, generate
+    from services.quiz import build_quiz, quiz_pools
+
+    run_migrations(engine, log=lambda _: None)
+    generate(engine, users=1, words=args.words, seed=args.seed)
+    rng = random.Random(args.seed)
+    report = {"words": args.words, "n": args.n}
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        await build_quiz(db, 1, CATEGORIES[0], args.n, rng=rng)
+        report["pool_build_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        for name, fn in (
+            ("pool", lambda c: build_quiz(db, 1, c, args.n, rng=rng)),
+            ("order_by_random", lambda c: naive_quiz(db, 1, c, args.n)),
+        ):
+            samples = []
+            for i in range(args.rounds):
+                start = time.perf_counter()
+                await fn(CATEGORIES[i % len(CATEGORIES)])
+                samples.append(time.perf_counter() - start)
+            report[name] = summarize(samples)
+    report["pool_cache"] = quiz_pools.stats()
+    print(json.dumps(report, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--n", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,68 @@
+# Chi phí một quyết định của rate limiter (services/rate_limit.py), backend trong bộ nhớ:
+#   direct:   MemoryBackend.take_sync, một thread
+#   limiter:  await RateLimiter.hit (đường dùng trong dependency của /api/auth/token)
+#   threads:  take_sync từ --threads thread cùng lúc (tranh lock theo shard)
+# Key lấy từ --keys IP giả, như nhiều client khác nhau.
+#
+#   cd backend && python -m benchmarks.bench_rate_limit --iterations 200000
+import argparse
+import asyncio
+import json
+import threading
+import time
+
+
+def main(args):
+    from services.rate_limit import MemoryBackend, RateLimiter, RateLimitRule
+
+    keys = [f"login_ip:10.0.{i // 256}.{i % 256}" for i in range(args.keys)]
+    rule = RateLimitRule("login_ip", 20, 60)
+    backend = MemoryBackend()
+
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        backend.take_sync(keys[i % args.keys], rule.capacity, rule.rate, time.time())
+    direct = (time.perf_counter() - start) / args.iterations
+
+    limiter = RateLimiter(MemoryBackend())
+    identities = [key.partition(":")[2] for key in keys]
+
+    async def run_limiter():
+        start = time.perf_counter()
+        for i in range(args.iterations):
+            await limiter.hit(rule, identities[i % args.keys])
+        return (time.perf_counter() - start) / args.iterations
+
+    via_limiter = asyncio.run(run_limiter())
+
+    threaded_backend = MemoryBackend()
+    per_thread = args.iterations // args.threads
+
+    def worker(offset):
+        for i in range(per_thread):
+            threaded_backend.take_sync(keys[(i + offset) % args.keys], rule.capacity, rule.rate, time.time())
+
+    threads = [threading.Thread(target=worker, args=(n * 7919,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    threaded = (time.perf_counter() - start) / (per_thread * args.threads)
+
+    print(json.dumps({
+        "iterations": args.iterations,
+        "keys": args.keys,
+        "direct_us": round(direct * 1e6, 3),
+        "limiter_us": round(via_limiter * 1e6, 3),
+        "threads": args.threads,
+        "threaded_us_per_decision": round(threaded * 1e6, 3),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=4)
+    main(parser.parse_args())
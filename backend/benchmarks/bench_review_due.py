@@ -0,0 +1,98 @@
+# Độ trễ hàng đợi thẻ đến hạn (services.review.get_due_cards) cho một user có 100k thẻ.
+# "sql" là riêng câu truy vấn trên sqlite3, "service" là cả đường AsyncSession + ORM.
+#
+#   cd backend && python -m benchmarks.bench_review_due --cards 100000 --iterations 2000
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks.common import Timer, summarize, use_sqlite
+
+
+def seed(db_path, cards):
+    from database.database import Base, engine
+    import models  # noqa: F401
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(42)
+    now = datetime.datetime.utcnow()
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO users (id, email, hashed_password, is_active) VALUES (1, 'review@example.com', 'x', 1)")
+    conn.executemany(
+        "INSERT INTO vocabularies (id, word, meaning, example, category, owner_id) VALUES (?, ?, 'nghĩa', 'e', 'TOEIC', 1)",
+        [(i, f"word{i}") for i in range(1, cards + 1)],
+    )
+    # Khoảng 5% thẻ đến hạn, phần còn lại rải trong 90 ngày tới
+    conn.executemany(
+        "INSERT INTO review_state (user_id, vocabulary_id, ease, interval, repetitions, due_at) VALUES (1, ?, 2.5, 6, 2, ?)",
+        [
+            (i, str(now + datetime.timedelta(minutes=rng.randint(-3 * 1440, 90 * 1440) if i % 20 else -rng.randint(1, 1440))))
+            for i in range(1, cards + 1)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure_sql(db_path, iterations, limit):
+    conn = sqlite3.connect(db_path)
+    now = str(datetime.datetime.utcnow())
+    sql = (
+        "SELECT review_state.*, vocabularies.* FROM review_state"
+        " JOIN vocabularies ON vocabularies.id = review_state.vocabulary_id"
+        " WHERE review_state.user_id = ? AND review_state.due_at <= ?"
+        " ORDER BY review_state.due_at, review_state.vocabulary_id LIMIT ?"
+    )
+    plan = [row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", (1, now, limit))]
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        conn.execute(sql, (1, now, limit)).fetchall()
+        samples.append(time.perf_counter() - start)
+    conn.close()
+    return samples, plan
+
+
+async def measure_service(iterations, limit):
+    from database.database import AsyncSessionLocal
+    from services.review import get_due_cards
+
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await get_due_cards(db, 1, limit)
+            samples.append(time.perf_counter() - start)
+            db.expunge_all()
+    return samples
+
+
+def main(args):
+    db_path = use_sqlite()
+    with Timer() as seed_timer:
+        seed(db_path, args.cards)
+    sql, plan = measure_sql(db_path, args.iterations, args.limit)
+    service = asyncio.run(measure_service(max(1, args.iterations // 10), args.limit))
+    print(json.dumps({
+        "cards": args.cards,
+        "limit": args.limit,
+        "seed_seconds": round(seed_timer.elapsed, 1),
+        "plan": plan,
+        "sql": summarize(sql),
+        "service": summarize(service),
+    }, indent=2, ensure_ascii=False))
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args())
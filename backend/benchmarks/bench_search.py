@@ -0,0 +1,119 @@
+# Độ trễ tìm kiếm (services.search, đường của GET /api/vocab/search) trên kho 1M từ
+# chia cho --users user, so với đường dự phòng LIKE '%q%' (quét mọi từ của user rồi sắp xếp).
+# Từ tiếng Anh lấy từ một bộ từ giả 50k từ, nghĩa là các âm tiết tiếng Việt có dấu.
+#
+#   cd backend && python -m benchmarks.bench_search --rows 1000000 --users 100 --iterations 200
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import time
+
+from benchmarks.common import Timer, summarize, use_sqlite
+
+SYLLABLES = ["đường", "quả", "táo", "nước", "học", "sinh", "việc", "làm", "nhà", "cửa", "bàn", "ghế"]
+
+
+def lexicon(rng, size=50000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def build_queries(rng, words):
+    # Tiền tố gõ dở, từ đầy đủ, nghĩa không dấu, nhiều từ
+    return [
+        words[rng.randrange(len(words))][:2], words[rng.randrange(len(words))][:3],
+        words[rng.randrange(len(words))], "duong", "qua tao", "hoc sinh", "nha",
+    ]
+
+
+def seed(db_path, rows, users, words):
+    from database.database import Base, engine
+    import models  # noqa: F401  (đăng ký bảng và chỉ mục FTS vào metadata)
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(7)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executemany(
+        "INSERT INTO users (id, email, hashed_password, is_active) VALUES (?, ?, 'x', 1)",
+        [(u, f"search{u}@example.com") for u in range(1, users + 1)],
+    )
+    batch = []
+    for i in range(rows):
+        meaning = " ".join(rng.choice(SYLLABLES) for _ in range(3))
+        example = " ".join(rng.choice(words) for _ in range(6))
+        batch.append((rng.choice(words), meaning, example, "TOEIC", i % users + 1))
+        if len(batch) == 10000:
+            conn.executemany(
+                "INSERT INTO vocabularies (word, meaning, example, category, owner_id) VALUES (?, ?, ?, ?, ?)", batch
+            )
+            batch = []
+    if batch:
+        conn.executemany(
+            "INSERT INTO vocabularies (word, meaning, example, category, owner_id) VALUES (?, ?, ?, ?, ?)", batch
+        )
+    conn.commit()
+    conn.close()
+
+
+async def measure_fts(queries, users, iterations):
+    from database.database import AsyncSessionLocal
+    from services.search import search_vocabularies
+
+    samples = []
+    async with AsyncSessionLocal() as db:
+        for i in range(iterations):
+            q = queries[i % len(queries)]
+            start = time.perf_counter()
+            await search_vocabularies(db, i % users + 1, q, prefix=True, limit=20, offset=0)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def measure_like(db_path, queries, users, iterations):
+    conn = sqlite3.connect(db_path)
+    samples = []
+    for i in range(iterations):
+        pattern = f"%{queries[i % len(queries)]}%"
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT * FROM vocabularies WHERE owner_id = ? AND (word LIKE ? OR meaning LIKE ? OR example LIKE ?)"
+            " ORDER BY word, id LIMIT 21", (i % users + 1, pattern, pattern, pattern)
+        ).fetchall()
+        samples.append(time.perf_counter() - start)
+    conn.close()
+    return samples
+
+
+def main(args):
+    db_path = use_sqlite()
+    rng = random.Random(42)
+    words = lexicon(rng)
+    queries = build_queries(rng, words)
+    with Timer() as seed_timer:
+        seed(db_path, args.rows, args.users, words)
+    fts = asyncio.run(measure_fts(queries, args.users, args.iterations))
+    like = measure_like(db_path, queries, args.users, max(1, args.iterations // 10))
+    print(json.dumps({
+        "rows": args.rows,
+        "users": args.users,
+        "seed_seconds": round(seed_timer.elapsed, 1),
+        "fts": summarize(fts),
+        "like_scan": summarize(like),
+    }, indent=2))
+    os.remove(db_path)
+    for suffix in ("-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+# So sánh hai cách trả một trang 1.000 từ:
+#   orm:  select(Vocabulary) -> ORM object -> VocabularySchema (from_attributes) -> jsonable_encoder -> json
+#   fast: select(cột) -> tuple -> dict -> orjson (services/serialization.py)
+# Mỗi vòng gồm cả truy vấn, để thấy phần CPU còn lại sau khi bỏ hydrate + validate.
+#
+#   cd backend && python -m benchmarks.bench_serialization --rows 1000 --iterations 300
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import List
+
+from benchmarks.common import summarize, use_sqlite
+
+
+def seed(rows):
+    from database.database import Base, SessionLocal, engine
+    from models import User, Vocabulary
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="bench-serialization@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all([
+        Vocabulary(word=f"word{i}", meaning=f"nghĩa tiếng Việt {i}", example=f"Example sentence number {i}.",
+                   category="TOEIC", owner_id=user.id)
+        for i in range(rows)
+    ])
+    db.commit()
+    owner_id = user.id
+    db.close()
+    return owner_id
+
+
+async def run(owner_id, rows, iterations):
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from api.vocab import VocabularySchema
+    from database.database import AsyncSessionLocal
+    from models import Vocabulary
+    from services.serialization import VOCABULARY_COLUMNS, json_response, vocabulary_dicts
+
+    adapter = TypeAdapter(List[VocabularySchema])
+
+    async def orm_path(db):
+        query = select(Vocabulary).where(Vocabulary.owner_id == owner_id).order_by(Vocabulary.id).limit(rows)
+        vocabularies = (await db.execute(query)).scalars().all()
+        models = adapter.validate_python(vocabularies, from_attributes=True)
+        return JSONResponse(jsonable_encoder(models)).body
+
+    async def fast_path(db):
+        query = select(*VOCABULARY_COLUMNS).where(Vocabulary.owner_id == owner_id).order_by(Vocabulary.id).limit(rows)
+        return json_response(vocabulary_dicts((await db.execute(query)).all())).body
+
+    results = {}
+    async with AsyncSessionLocal() as db:
+        assert await orm_path(db) == await fast_path(db)
+        for name, path in (("orm", orm_path), ("fast", fast_path)):
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await path(db)
+                samples.append(time.perf_counter() - start)
+                db.expunge_all()
+            results[name] = summarize(samples)
+    return results
+
+
+def main(args):
+    db_path = use_sqlite()
+    owner_id = seed(args.rows)
+    results = asyncio.run(run(owner_id, args.rows, args.iterations))
+    results["speedup_p50"] = round(results["orm"]["p50_ms"] / results["fast"]["p50_ms"], 2)
+    print(json.dumps({"rows": args.rows, **results}, indent=2))
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=300)
+    main(parser.parse_args())
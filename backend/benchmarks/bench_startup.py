@@ -0,0 +1,81 @@
+# Thời gian khởi động lạnh của một worker: tiến trình Python mới, import main, chạy
+# các handler startup (kiểm tra schema version). So với cách cũ (create_all lúc import)
+# và với riêng phần import thư viện (fastapi, sqlalchemy, pydantic, ...).
+#
+# Mục tiêu < 300 ms cho một worker đầy đủ KHÔNG đạt: riêng phần "libraries" đã ~870-1000 ms
+# p50 trên máy đo (fastapi kéo theo pydantic dựng model OpenAPI lúc import). Phần của app
+# (app_overhead_p50_ms) ~220 ms, kiểm tra schema version trong đó chỉ ~7 ms; còn lại chủ yếu
+# là FastAPI dựng response model pydantic cho từng route. Con số dưới 300 ms chỉ áp dụng
+# cho phần của app, không cho thời gian từ lúc tiến trình bắt đầu.
+#
+#   cd backend && python -m benchmarks.bench_startup --runs 10
+#   cd backend && python -m benchmarks.bench_startup --database-url mysql+pymysql://...
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import BACKEND_DIR, percentile, use_sqlite
+
+SNIPPETS = {
+    # Chỉ import thư viện bên thứ ba mà app dùng
+    "libraries": """
+import fastapi, fastapi.security, fastapi.responses, sqlalchemy.ext.asyncio, sqlalchemy.orm, pydantic
+import jose.jwt, passlib.context, orjson, dotenv, aiosqlite, multipart
+""",
+    # Worker hiện tại: import + kiểm tra schema version
+    "worker": """
+import asyncio, main
+asyncio.run(main.app.router.startup())
+""",
+    # Cách cũ: import + create_all (reflect từng bảng) trong mỗi worker
+    "create_all": """
+import asyncio, main, models
+from database.database import engine
+models.Base.metadata.create_all(bind=engine)
+""",
+}
+
+
+def measure(snippet, env, runs):
+    code = "import time\n_start = time.perf_counter()\n" + snippet + \
+        "\nprint(round((time.perf_counter() - _start) * 1000, 3))"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code], cwd=BACKEND_DIR, env=env,
+            capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(float(output.strip().splitlines()[-1]))
+    return {
+        "p50_ms": round(percentile(samples, 50), 1),
+        "p95_ms": round(percentile(samples, 95), 1),
+        "min_ms": round(min(samples), 1),
+    }
+
+
+def main(args):
+    db_path = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = use_sqlite()
+    from database.database import engine
+    from database.migrations import run_migrations
+    run_migrations(engine, log=lambda _: None)
+    engine.dispose()
+
+    env = dict(os.environ)
+    results = {name: measure(snippet, env, args.runs) for name, snippet in SNIPPETS.items()}
+    results["app_overhead_p50_ms"] = round(results["worker"]["p50_ms"] - results["libraries"]["p50_ms"], 1)
+    print(json.dumps({"runs": args.runs, **results}, indent=2))
+    if db_path:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--database-url", default=None)
+    main(parser.parse_args())
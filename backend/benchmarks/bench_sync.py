@@ -0,0 +1,92 @@
+# Làm mới dữ liệu client: tải lại toàn bộ (danh sách từ theo trang + favorites) so với
+# GET /api/vocab/sync?since= sau K thay đổi. Đo số byte và thời gian, in-process.
+#
+#   cd backend && python -m benchmarks.bench_sync --words 20000 --churn 20
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import use_sqlite
+
+
+async def paged(client, headers, path, params, cursor_param, cursor_field):
+    total, cursor = 0, None
+    while True:
+        query = dict(params)
+        if cursor is not None:
+            query[cursor_param] = cursor
+        response = await client.get(path, params=query, headers=headers)
+        assert response.status_code == 200, response.text
+        total += len(response.content)
+        cursor = response.json().get(cursor_field)
+        if not cursor:
+            return total, response.json()
+
+
+async def measure(fn, rounds):
+    best, size = None, 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = await fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"bytes": size, "best_ms": round(best * 1000, 2)}
+
+
+async def main(args):
+    db_path = use_sqlite()
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    import httpx
+    from database.database import async_engine, engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import generate, user_email
+    from api.auth import create_access_token
+    from main import app
+
+    run_migrations(engine, log=lambda _: None)
+    generate(engine, users=1, words=args.words, seed=args.seed)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user_email(1)})}"}
+
+    async def full_refresh():
+        size, _ = await paged(client, headers, "/api/vocab/vocabularies",
+                              {"after": "", "limit": 1000}, "after", "next_cursor")
+        favorites = await client.get("/api/vocab/favorites", headers=headers)
+        return size + len(favorites.content)
+
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        _, snapshot = await paged(client, headers, "/api/vocab/sync", {"limit": 1000}, "cursor", "next_cursor")
+        since = snapshot["seq"]
+        # Thay đổi: nửa thêm từ mới, nửa xoá từ cũ
+        for i in range(args.churn // 2):
+            await client.post("/api/vocab/vocabularies", headers=headers, json={
+                "word": f"new{i}", "meaning": "m", "example": "e", "category": "TOEIC",
+            })
+            await client.delete(f"/api/vocab/{i + 1}", headers=headers)
+
+        async def delta():
+            size, page = await paged(client, headers, "/api/vocab/sync",
+                                     {"since": since, "limit": 1000}, "cursor", "next_cursor")
+            assert not page["reset"]
+            return size
+
+        report = {
+            "words": args.words,
+            "churn": args.churn,
+            "full_refresh": await measure(full_refresh, args.rounds),
+            "sync_delta": await measure(delta, args.rounds),
+        }
+    print(json.dumps(report, indent=2))
+    await async_engine.dispose()
+    engine.dispose()
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--churn", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
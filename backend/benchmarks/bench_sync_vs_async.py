@@ -0,0 +1,110 @@
+# So sánh throughput của cùng một truy vấn danh sách từ vựng qua
+# handler sync (threadpool + SessionLocal) và handler async (AsyncSession)
+# với 500 client đồng thời.
+#
+#   cd backend && python -m benchmarks.bench_sync_vs_async --clients 500 --requests 5000
+#   cd backend && python -m benchmarks.bench_sync_vs_async --database-url mysql+pymysql://...
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from benchmarks.common import summarize, use_sqlite
+
+
+def build_apps(rows):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from database.database import AsyncSessionLocal, Base, SessionLocal, engine
+    from models import User, Vocabulary
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email="bench-sync-async@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all([
+        Vocabulary(word=f"word{i}", meaning=f"nghĩa {i}", example="example", category="TOEIC", owner_id=user.id)
+        for i in range(rows)
+    ])
+    db.commit()
+    owner_id = user.id
+    db.close()
+
+    query = select(Vocabulary.id, Vocabulary.word, Vocabulary.meaning).where(
+        Vocabulary.owner_id == owner_id
+    ).limit(50)
+
+    def get_sync_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/words")
+    def sync_words(db=Depends(get_sync_db)):
+        return [dict(row._mapping) for row in db.execute(query)]
+
+    async_app = FastAPI()
+
+    @async_app.get("/words")
+    async def async_words(db=Depends(get_async_db)):
+        return [dict(row._mapping) for row in await db.execute(query)]
+
+    return sync_app, async_app
+
+
+async def run_load(app, clients, total):
+    import httpx
+
+    samples = []
+    remaining = iter(range(total))
+
+    async def client_loop(client):
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get("/words")
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(app=app, base_url="http://bench", limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, elapsed)
+
+
+async def main(args):
+    db_path = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = use_sqlite()
+    sync_app, async_app = build_apps(args.rows)
+    report = {
+        "clients": args.clients,
+        "requests": args.requests,
+        "sync": await run_load(sync_app, args.clients, args.requests),
+        "async": await run_load(async_app, args.clients, args.requests),
+    }
+    print(json.dumps(report, indent=2))
+    if db_path:
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,120 @@
+# Sinh dữ liệu giả có seed cho benchmark: N user x M từ, một phần từ được đánh dấu
+# yêu thích, category phân bố lệch (Zipf: vài category chiếm phần lớn số từ).
+# Cùng seed và tham số thì cùng dữ liệu (id, thời gian, nội dung) để so sánh giữa các lần chạy.
+#
+#   cd backend && python -m benchmarks.datagen --users 50 --words 2000 --db /tmp/vocab_bench.db
+import argparse
+import datetime
+import json
+import random
+
+from benchmarks.common import Timer
+
+CATEGORIES = (
+    "TOEIC", "IELTS", "Communication", "Business", "Travel", "Technology",
+    "Health", "Food", "Sports", "Science", "Music", "Finance",
+)
+SYLLABLES = (
+    "đường", "quả", "táo", "nước", "học", "sinh", "việc", "làm", "nhà", "cửa",
+    "bàn", "ghế", "bạn", "mới", "người", "thời", "gian", "điện", "thoại", "sách",
+)
+PASSWORD = "benchpassword"
+EPOCH = datetime.datetime(2024, 1, 1)
+BATCH_SIZE = 5000
+
+
+def user_email(user_id):
+    return f"user{user_id}@bench.example.com"
+
+
+def category_weights(skew):
+    # Trọng số Zipf: category thứ k có trọng số 1 / k^skew
+    return [1.0 / (k ** skew) for k in range(1, len(CATEGORIES) + 1)]
+
+
+def generate_rows(users, words, favorite_ratio=0.1, skew=1.2, seed=42):
+    # Trả về dict bảng -> danh sách dòng (dict), chưa ghi gì vào database
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    lexicon = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(5000)]
+    weights = category_weights(skew)
+
+    rows = {"users": [], "vocabularies": [], "favorites": [], "user_categories": [], "review_state": []}
+    vocabulary_id = favorite_id = 0
+    for user_id in range(1, users + 1):
+        rows["users"].append({"id": user_id, "email": user_email(user_id), "is_active": True, "data_version": 0})
+        # Mỗi user xoay thứ tự category để category "lớn" khác nhau giữa các user
+        offset = rng.randrange(len(CATEGORIES))
+        user_categories = CATEGORIES[offset:] + CATEGORIES[:offset]
+        counts = {}
+        for i in range(words):
+            vocabulary_id += 1
+            category = rng.choices(user_categories, weights)[0]
+            counts[category] = counts.get(category, 0) + 1
+            created_at = EPOCH + datetime.timedelta(seconds=i, microseconds=user_id)
+            word = rng.choice(lexicon)
+            rows["vocabularies"].append({
+                "id": vocabulary_id,
+                "word": word,
+                "meaning": " ".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))),
+                "example": f"The {word} " + " ".join(rng.choice(lexicon) for _ in range(rng.randint(3, 10))) + ".",
+                "category": category,
+                "created_at": created_at,
+                "owner_id": user_id,
+            })
+            rows["review_state"].append({
+                "user_id": user_id, "vocabulary_id": vocabulary_id, "ease": 2.5, "interval": 0,
+                "repetitions": 0, "due_at": created_at,
+            })
+            if rng.random() < favorite_ratio:
+                favorite_id += 1
+                rows["favorites"].append({"id": favorite_id, "user_id": user_id, "vocabulary_id": vocabulary_id})
+        for category, count in counts.items():
+            rows["user_categories"].append({"user_id": user_id, "category": category, "word_count": count})
+    return rows
+
+
+def generate(engine, users, words, favorite_ratio=0.1, skew=1.2, seed=42, password=PASSWORD):
+    # Ghi dữ liệu vào schema đã có (migrate hoặc create_all). Mọi user dùng chung một
+    # mật khẩu; bcrypt chỉ chạy một lần.
+    from models import Favorite, ReviewState, User, UserCategory, Vocabulary
+    from services.hashing import hash_password
+
+    rows = generate_rows(users, words, favorite_ratio, skew, seed)
+    hashed = hash_password(password)
+    for user in rows["users"]:
+        user["hashed_password"] = hashed
+    tables = (
+        (User.__table__, "users"), (Vocabulary.__table__, "vocabularies"), (Favorite.__table__, "favorites"),
+        (UserCategory.__table__, "user_categories"), (ReviewState.__table__, "review_state"),
+    )
+    with engine.begin() as conn:
+        for table, name in tables:
+            data = rows[name]
+            for start in range(0, len(data), BATCH_SIZE):
+                conn.execute(table.insert(), data[start:start + BATCH_SIZE])
+    return {name: len(data) for name, data in rows.items()}
+
+
+def main(args):
+    from benchmarks.common import use_sqlite
+    use_sqlite(args.db)
+    from database.database import engine
+    from database.migrations import run_migrations
+
+    run_migrations(engine, log=lambda _: None)
+    with Timer() as timer:
+        counts = generate(engine, args.users, args.words, args.favorite_ratio, args.skew, args.seed)
+    engine.dispose()
+    print(json.dumps({"db": args.db, "seconds": round(timer.elapsed, 2), **counts}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", required=True)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--words", type=int, default=2000, help="số từ mỗi user")
+    parser.add_argument("--favorite-ratio", type=float, default=0.1)
+    parser.add_argument("--skew", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=42)
+    main(parser.parse_args())
@@ -0,0 +1,262 @@
+# Load test offline (SQLite, app chạy trong process qua httpx) theo kịch bản, trên dữ liệu
+# sinh bởi benchmarks/datagen.py. Báo p50/p95/p99 và requests/sec cho từng endpoint (theo
+# template của route) dạng JSON; --baseline so với một lần chạy trước và trả exit code 1
+# nếu p95 của endpoint nào tệ hơn quá --threshold.
+#
+#   cd backend && python -m benchmarks.load_test --output run.json
+#   cd backend && python -m benchmarks.load_test --scenarios flashcards,favorites --baseline run.json
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+
+from benchmarks.common import Timer, summarize, use_sqlite
+
+
+class Runner:
+    def __init__(self, client, users, words, seed):
+        self.client = client
+        self.users = users
+        self.words = words
+        self.seed = seed
+        self.samples = {}
+        self.errors = {}
+        self._tokens = {}
+
+    def headers(self, user_id):
+        # Token ký trực tiếp (không qua bcrypt) cho các kịch bản không đo đăng nhập
+        from api.auth import create_access_token
+        from benchmarks.datagen import user_email
+        from datetime import timedelta
+
+        token = self._tokens.get(user_id)
+        if token is None:
+            token = self._tokens[user_id] = create_access_token(
+                {"sub": user_email(user_id)}, expires_delta=timedelta(hours=1)
+            )
+        return {"Authorization": f"Bearer {token}"}
+
+    async def request(self, method, route, user_id=None, label=None, expect=(200,), headers=None, **kwargs):
+        # route là template (/api/vocab/favorites/{vocabulary_id}); tham số path lấy từ kwargs
+        path_params = {k: kwargs.pop(k) for k in list(kwargs) if "{" + k + "}" in route}
+        request_headers = dict(self.headers(user_id)) if user_id is not None else {}
+        request_headers.update(headers or {})
+        key = f"{method} {label or route}"
+        start = time.perf_counter()
+        response = await self.client.request(method, route.format(**path_params), headers=request_headers, **kwargs)
+        self.samples.setdefault(key, []).append(time.perf_counter() - start)
+        if response.status_code not in expect:
+            self.errors[key] = self.errors.get(key, 0) + 1
+        return response
+
+    def user_ids(self, worker, workers):
+        return [u for u in range(1, self.users + 1) if u % workers == worker % workers] or [1]
+
+    def vocabulary_id(self, rng, user_id):
+        # id do datagen gán liên tiếp theo user
+        return (user_id - 1) * self.words + rng.randint(1, self.words)
+
+
+async def login_burst(runner, worker, workers, iterations):
+    from benchmarks.datagen import PASSWORD, user_email
+
+    rng = random.Random(runner.seed + worker)
+    users = runner.user_ids(worker, workers)
+    for _ in range(iterations):
+        user_id = rng.choice(users)
+        await runner.request("POST", "/api/auth/token", data={"username": user_email(user_id), "password": PASSWORD})
+        await runner.request("GET", "/api/auth/me", user_id)
+
+
+async def flashcard_browsing(runner, worker, workers, iterations):
+    # Mở màn flashcard, lật qua vài trang của một category, ôn thẻ đến hạn; lần mở lại
+    # gửi If-None-Match như trình duyệt
+    rng = random.Random(runner.seed + worker)
+    users = runner.user_ids(worker, workers)
+    for _ in range(iterations):
+        user_id = rng.choice(users)
+        response = await runner.request("GET", "/api/vocab/session", user_id, params={"limit": 50})
+        session = response.json()
+        await runner.request(
+            "GET", "/api/vocab/session", user_id, label="/api/vocab/session (If-None-Match)",
+            expect=(304,), headers={"If-None-Match": response.headers.get("etag", "")}, params={"limit": 50},
+        )
+        if session["categories"]:
+            category = rng.choice(session["categories"])
+            cursor = ""
+            for _ in range(3):
+                page = (await runner.request(
+                    "GET", "/api/vocab/vocabularies", user_id, params={"category": category, "after": cursor, "limit": 20},
+                )).json()
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+        cards = (await runner.request("GET", "/api/vocab/review/due", user_id, params={"limit": 20})).json()
+        for card in cards[:5]:
+            await runner.request(
+                "POST", "/api/vocab/review/{vocabulary_id}", user_id,
+                vocabulary_id=card["vocabulary"]["id"], json={"grade": rng.randint(0, 5)},
+            )
+
+
+async def deep_pagination(runner, worker, workers, iterations):
+    # Đi hết danh sách từ của user: keyset (?after=) và offset cũ (?skip=) ở trang sâu
+    rng = random.Random(runner.seed + worker)
+    users = runner.user_ids(worker, workers)
+    page_size = 100
+    for _ in range(iterations):
+        user_id = rng.choice(users)
+        cursor = ""
+        while cursor is not None:
+            page = (await runner.request(
+                "GET", "/api/vocab/vocabularies", user_id, label="/api/vocab/vocabularies?after=",
+                params={"after": cursor, "limit": page_size},
+            )).json()
+            cursor = page["next_cursor"]
+        skip = max(0, runner.words - page_size)
+        await runner.request(
+            "GET", "/api/vocab/vocabularies", user_id, label="/api/vocab/vocabularies?skip=",
+            params={"skip": rng.randint(skip // 2, skip), "limit": page_size},
+        )
+
+
+async def favorite_toggling(runner, worker, workers, iterations):
+    rng = random.Random(runner.seed + worker)
+    users = runner.user_ids(worker, workers)
+    for _ in range(iterations):
+        user_id = rng.choice(users)
+        vocabulary_id = runner.vocabulary_id(rng, user_id)
+        # Từ đã yêu thích sẵn (datagen) trả 400, vẫn tính là một lượt hợp lệ
+        added = await runner.request(
+            "POST", "/api/vocab/favorites/{vocabulary_id}", user_id, vocabulary_id=vocabulary_id, expect=(200, 400),
+        )
+        if added.status_code == 200:
+            await runner.request("DELETE", "/api/vocab/favorites/{vocabulary_id}", user_id, vocabulary_id=vocabulary_id)
+        await runner.request("GET", "/api/vocab/favorites", user_id)
+
+
+async def bulk_import(runner, worker, workers, iterations, rows=500):
+    from benchmarks.datagen import CATEGORIES
+
+    rng = random.Random(runner.seed + worker)
+    users = runner.user_ids(worker, workers)
+    for i in range(iterations):
+        user_id = rng.choice(users)
+        body = "\n".join(json.dumps({
+            "word": f"import{worker}x{i}x{n}", "meaning": f"nghĩa {n}", "example": "Imported example.",
+            "category": rng.choice(CATEGORIES),
+        }, ensure_ascii=False) for n in range(rows))
+        await runner.request(
+            "POST", "/api/vocab/vocabularies/bulk", user_id, content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+
+SCENARIOS = {
+    "login_burst": login_burst,
+    "flashcards": flashcard_browsing,
+    "deep_pagination": deep_pagination,
+    "favorites": favorite_toggling,
+    "bulk_import": bulk_import,
+}
+
+
+async def run_scenario(client, name, users, words, seed, concurrency, iterations):
+    runner = Runner(client, users, words, seed)
+    scenario = SCENARIOS[name]
+    with Timer() as timer:
+        await asyncio.gather(*(scenario(runner, w, concurrency, iterations) for w in range(concurrency)))
+    total = sum(len(s) for s in runner.samples.values())
+    return {
+        "seconds": round(timer.elapsed, 3),
+        "requests": total,
+        "rps": round(total / timer.elapsed, 1),
+        "errors": runner.errors,
+        "endpoints": {key: summarize(samples, timer.elapsed) for key, samples in sorted(runner.samples.items())},
+    }
+
+
+async def run(app, scenarios, users, words, seed, concurrency, iterations):
+    import httpx
+
+    report = {}
+    async with httpx.AsyncClient(app=app, base_url="http://bench", timeout=None) as client:
+        for name in scenarios:
+            report[name] = await run_scenario(client, name, users, words, seed, concurrency, iterations)
+    return report
+
+
+def compare(report, baseline, threshold):
+    # Endpoint có p95 tăng quá threshold (tỉ lệ) so với baseline
+    regressions = []
+    for name, scenario in report.items():
+        old_endpoints = baseline.get("scenarios", {}).get(name, {}).get("endpoints", {})
+        for key, stats in scenario["endpoints"].items():
+            old = old_endpoints.get(key)
+            if old and old["p95_ms"] > 0 and stats["p95_ms"] > old["p95_ms"] * (1 + threshold):
+                regressions.append({
+                    "scenario": name, "endpoint": key, "baseline_p95_ms": old["p95_ms"], "p95_ms": stats["p95_ms"],
+                })
+    return regressions
+
+
+def main(args):
+    scenarios = args.scenarios.split(",")
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+
+    db_path = use_sqlite()
+    # Đo throughput của endpoint, không phải rate limiter (xem bench_rate_limit)
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+    from database.database import engine
+    from database.migrations import run_migrations
+    from benchmarks.datagen import generate
+    from main import app
+
+    run_migrations(engine, log=lambda _: None)
+    with Timer() as seed_timer:
+        counts = generate(engine, args.users, args.words, args.favorite_ratio, args.skew, args.seed)
+    report = asyncio.run(run(app, scenarios, args.users, args.words, args.seed, args.concurrency, args.iterations))
+    output = {
+        "config": {
+            "users": args.users, "words": args.words, "favorite_ratio": args.favorite_ratio, "skew": args.skew,
+            "seed": args.seed, "concurrency": args.concurrency, "iterations": args.iterations,
+        },
+        "dataset": {**counts, "seed_seconds": round(seed_timer.elapsed, 2)},
+        "scenarios": report,
+    }
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            output["regressions"] = compare(report, json.load(f), args.threshold)
+        exit_code = 1 if output["regressions"] else 0
+
+    text = json.dumps(output, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--words", type=int, default=1000, help="số từ mỗi user")
+    parser.add_argument("--favorite-ratio", type=float, default=0.1)
+    parser.add_argument("--skew", type=float, default=1.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=20, help="số vòng kịch bản mỗi virtual user")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    raise SystemExit(main(parser.parse_args()))
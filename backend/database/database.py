@@ -1,28 +1,130 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from dotenv import load_dotenv
+from services.metrics import instrument_engine, observe_pool_timeout, observe_pool_wait
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://vocabuser:admin@db:3306/vocabdb?charset=utf8mb4")
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # Kiểm tra kết nối trước khi sử dụng
-    pool_recycle=3600,   # Tái tạo kết nối sau mỗi giờ
-    pool_size=5,         # Số lượng kết nối trong pool
-    max_overflow=10      # Số lượng kết nối tối đa có thể tạo thêm
+# Driver async tương ứng với driver sync trong DATABASE_URL (chỉ các driver có trong
+# requirements.txt; dialect khác thì đặt ASYNC_DATABASE_URL với driver async đã cài)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+}
+
+def to_async_url(url):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+# Có thể chỉ định riêng, ví dụ ASYNC_DATABASE_URL=sqlite+aiosqlite:///./test.db
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Kích thước pool theo env, tính cho mỗi engine của mỗi worker: tổng connection tới DB
+# tối đa là số worker x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Chờ lấy connection tối đa bao lâu trước khi báo lỗi (API trả 503) thay vì 30 giây mặc định
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+# Không dùng pool_pre_ping (thêm một SELECT 1 mỗi lần checkout, tức mỗi request):
+# connection chết được PoolSweeper phát hiện ở nền (database/pool.py), cộng với pool_recycle
+QUEUE_POOL_OPTIONS = dict(
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
 )
 
+# Pool đo thời gian chờ lấy connection và số lần hết thời gian chờ
+# (db_pool_checkout_wait_seconds, db_pool_checkout_timeouts_total ở /metrics)
+class TimedCheckoutMixin:
+    metrics_name = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            observe_pool_timeout(self.metrics_name)
+            raise
+        finally:
+            observe_pool_wait(self.metrics_name, time.perf_counter() - start)
+
+class TimedQueuePool(TimedCheckoutMixin, QueuePool):
+    metrics_name = "sync"
+
+class TimedAsyncQueuePool(TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+class TimedReplicaQueuePool(TimedAsyncQueuePool):
+    metrics_name = "replica"
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def sync_engine_options(url):
+    # SQLite in-memory giữ pool mặc định của SQLAlchemy (một connection dùng chung)
+    if is_memory_sqlite(url):
+        return {}
+    return dict(QUEUE_POOL_OPTIONS, poolclass=TimedQueuePool)
+
+# Engine sync: dùng cho script (init_db, wait_for_db, migrate)
+engine = create_engine(DATABASE_URL, **sync_engine_options(DATABASE_URL))
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def async_engine_options(url, poolclass=TimedAsyncQueuePool):
+    # aiosqlite mặc định dùng NullPool (mỗi session mở connection + thread mới);
+    # file SQLite vẫn dùng pool như MySQL
+    if is_memory_sqlite(url):
+        return {}
+    return dict(QUEUE_POOL_OPTIONS, poolclass=poolclass)
+
+# Engine async: dùng cho các router
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options(ASYNC_DATABASE_URL))
+
+# Replica chỉ đọc (tuỳ chọn), ví dụ REPLICA_DATABASE_URL=mysql+pymysql://...@db-replica/vocabdb.
+# Không đặt thì replica chính là primary. Chọn session nào cho request: database/routing.py
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or (
+    to_async_url(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+)
+
+if ASYNC_REPLICA_DATABASE_URL:
+    replica_async_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL, **async_engine_options(ASYNC_REPLICA_DATABASE_URL, TimedReplicaQueuePool)
+    )
+else:
+    replica_async_engine = async_engine
+
+# Đếm câu SQL / thời gian DB theo request (services/metrics.py)
+instrument_engine(engine, "sync")
+instrument_engine(async_engine.sync_engine, "async")
+if replica_async_engine is not async_engine:
+    instrument_engine(replica_async_engine.sync_engine, "replica")
+
+def make_sessionmaker(bind):
+    # expire_on_commit=False: object vẫn đọc được sau commit mà không cần lazy load
+    return async_sessionmaker(bind=bind, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+AsyncSessionLocal = make_sessionmaker(async_engine)
+ReplicaSessionLocal = make_sessionmaker(replica_async_engine) if replica_async_engine is not async_engine else AsyncSessionLocal
+
 Base = declarative_base()
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
@@ -0,0 +1,130 @@
+import datetime
+import importlib.util
+import os
+import re
+from collections import namedtuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, inspect, select, text
+
+# Migration có version, chạy MỘT lần như một bước riêng (python manage.py migrate),
+# không chạy lúc import app. Mỗi file migrations/NNNN_ten.py định nghĩa upgrade(conn)
+# với conn là Connection sync đang trong transaction; version đã chạy được ghi vào
+# bảng schema_version. Lúc khởi động, worker chỉ so version (check_schema_version).
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+MIGRATION_FILE_RE = re.compile(r"^(\d{4})_(\w+)\.py$")
+# MySQL: khoá tư vấn để hai tiến trình migrate không chạy chồng lên nhau
+MIGRATION_LOCK_NAME = "vocab_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+Migration = namedtuple("Migration", "version name path")
+
+metadata = MetaData()
+schema_version = Table(
+    "schema_version", metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    pass
+
+
+def discover():
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE_RE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)))
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise SchemaVersionError(f"Duplicate migration versions in {MIGRATIONS_DIR}")
+    return migrations
+
+
+def latest_version():
+    # Chỉ đọc tên file, không import migration
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+def load_upgrade(migration):
+    spec = importlib.util.spec_from_file_location(f"migrations.m{migration.version:04d}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.upgrade
+
+
+def current_version(conn):
+    if not inspect(conn).has_table("schema_version"):
+        return 0
+    return conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def check_schema_version(conn, expected=None):
+    # Một câu SELECT trên bảng nhỏ; gọi lúc worker khởi động
+    expected = latest_version() if expected is None else expected
+    try:
+        version = conn.execute(select(func.max(schema_version.c.version))).scalar() or 0
+    except Exception as e:
+        raise SchemaVersionError(
+            "Database schema is not initialized; run `python manage.py migrate`"
+        ) from e
+    if version != expected:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, code expects {expected}; "
+            "run `python manage.py migrate`"
+        )
+    return version
+
+
+def run_migrations(engine, target=None, log=print):
+    migrations = discover()
+    if target is None:
+        target = migrations[-1].version if migrations else 0
+    applied = []
+    with engine.connect() as lock_conn:
+        if engine.dialect.name == "mysql":
+            locked = lock_conn.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT},
+            ).scalar()
+            if not locked:
+                raise SchemaVersionError("Another migration is running")
+        try:
+            with engine.begin() as conn:
+                metadata.create_all(conn, tables=[schema_version])
+                version = current_version(conn)
+            if version > target:
+                raise SchemaVersionError(f"Database schema version {version} is newer than {target}")
+            for migration in migrations:
+                if migration.version <= version or migration.version > target:
+                    continue
+                upgrade = load_upgrade(migration)
+                # MySQL tự commit sau DDL nên các migration phải chạy lại được (kiểm tra tồn tại trước khi tạo)
+                with engine.begin() as conn:
+                    upgrade(conn)
+                    conn.execute(schema_version.insert().values(
+                        version=migration.version, name=migration.name, applied_at=datetime.datetime.utcnow(),
+                    ))
+                log(f"Applied migration {migration.version:04d}_{migration.name}")
+                applied.append(migration.version)
+        finally:
+            if engine.dialect.name == "mysql":
+                lock_conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME})
+    return applied
+
+
+# Tiện ích cho các file migration
+
+def has_table(conn, table):
+    return inspect(conn).has_table(table)
+
+
+def has_column(conn, table, column):
+    return any(c["name"] == column for c in inspect(conn).get_columns(table))
+
+
+def has_index(conn, table, index):
+    return any(i["name"] == index for i in inspect(conn).get_indexes(table))
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import os
+from sqlalchemy import exc
+from database.database import async_engine, replica_async_engine
+from services.metrics import pool_stats, pool_swept_dead, pool_sweeps
+
+# Thay cho pool_pre_ping: định kỳ lấy các connection đang rảnh trong pool và SELECT 1.
+# Connection chết (DB restart, failover, bị server cắt vì idle) bị SQLAlchemy invalidate
+# cùng mọi connection cũ hơn trong pool, nên request sau nhận connection mới mà không
+# phải trả thêm một round trip mỗi lần checkout.
+
+logger = logging.getLogger("vocab.db.pool")
+
+DB_POOL_SWEEP_INTERVAL = float(os.getenv("DB_POOL_SWEEP_INTERVAL", "30"))
+
+
+class PoolSweeper:
+    def __init__(self, engines, interval=DB_POOL_SWEEP_INTERVAL):
+        # engines: tên -> AsyncEngine
+        self.engines = engines
+        self.interval = interval
+        self._task = None
+
+    async def sweep_engine(self, name, engine):
+        stats = pool_stats(engine.sync_engine.pool)
+        if stats is None:
+            return 0
+        # Ping lần lượt từng connection rảnh (lấy, SELECT 1, trả lại) để sweeper không bao giờ
+        # giữ quá một connection. Queue của pool là FIFO nên connection vừa trả đứng cuối và
+        # lần lấy sau nhận connection rảnh kế tiếp; request chen vào giữa có thể làm một
+        # connection được ping hai lần hoặc sót đến lượt sweep sau. Pool hết connection rảnh
+        # (đang tải cao) thì dừng, không chờ hay mở overflow.
+        pool = engine.sync_engine.pool
+        dead = 0
+        for _ in range(stats["checked_in"]):
+            if pool.checkedin() == 0:
+                break
+            async with engine.connect() as conn:
+                try:
+                    await conn.exec_driver_sql("SELECT 1")
+                except exc.DBAPIError as error:
+                    if not error.connection_invalidated:
+                        raise
+                    dead += 1
+        pool_sweeps.inc((name,))
+        if dead:
+            pool_swept_dead.inc((name,), dead)
+            logger.warning("dead pooled connections invalidated", extra={"engine": name, "dead": dead})
+        return dead
+
+    async def sweep(self):
+        dead = 0
+        for name, engine in self.engines.items():
+            try:
+                dead += await self.sweep_engine(name, engine)
+            except Exception:
+                logger.warning("pool sweep failed", extra={"engine": name}, exc_info=True)
+        return dead
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+pool_sweeper = PoolSweeper(
+    {"async": async_engine, **({"replica": replica_async_engine} if replica_async_engine is not async_engine else {})}
+)
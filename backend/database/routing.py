@@ -0,0 +1,110 @@
+import os
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from database.database import AsyncSessionLocal, ReplicaSessionLocal
+from services.ttl_cache import TTLCache
+
+# Định tuyến đọc/ghi: route chỉ đọc lấy session từ SessionRouter.reader(), còn lại dùng get_db
+# (primary). User vừa ghi (commit có mark_written) được ghim vào primary trong
+# READ_YOUR_WRITES_SECONDS để không đọc phải replica chưa kịp nhận thay đổi:
+#   - trong process: bảng pin theo user id (LRU + TTL)
+#   - giữa các worker: cookie PRIMARY_COOKIE chứa thời điểm hết ghim, do
+#     ReadYourWritesMiddleware gắn vào response của request có ghi
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_MAX_USERS = int(os.getenv("READ_YOUR_WRITES_MAX_USERS", "100000"))
+PRIMARY_COOKIE = "primary_until"
+
+
+class SessionRouter:
+    def __init__(self, primary, replica, sticky_seconds=READ_YOUR_WRITES_SECONDS,
+                 maxsize=READ_YOUR_WRITES_MAX_USERS, clock=time.time):
+        self.primary = primary
+        self.replica = replica
+        self.sticky_seconds = sticky_seconds
+        self.clock = clock
+        self.pins = TTLCache(maxsize=maxsize, ttl=sticky_seconds, clock=clock)
+
+    @property
+    def has_replica(self):
+        return self.replica is not self.primary
+
+    def pin(self, user_id):
+        self.pins.set(user_id, True)
+        return self.clock() + self.sticky_seconds
+
+    def is_pinned(self, user_id, pinned_until=None):
+        # pinned_until: giá trị cookie của client (epoch giây), có thể do worker khác đặt
+        if self.pins.get(user_id) is not None:
+            return True
+        return pinned_until is not None and pinned_until > self.clock()
+
+    def reader(self, user_id, pinned_until=None):
+        if not self.has_replica or self.is_pinned(user_id, pinned_until):
+            return self.primary
+        return self.replica
+
+
+session_router = SessionRouter(AsyncSessionLocal, ReplicaSessionLocal)
+
+# Thời điểm hết ghim của request hiện tại (None nếu request không ghi gì)
+_request_pin = ContextVar("request_pin", default=None)
+
+
+def mark_written(db, user_id):
+    # Gọi trong transaction ghi dữ liệu của user; có hiệu lực khi commit
+    if user_id is not None:
+        db.sync_session.info.setdefault("written_users", set()).add(user_id)
+
+
+def cookie_pinned_until(request):
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, ""))
+    except ValueError:
+        return None
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_writers_on_commit(session):
+    users = session.info.pop("written_users", None)
+    if not users or not session_router.has_replica:
+        return
+    for user_id in users:
+        until = session_router.pin(user_id)
+    holder = _request_pin.get()
+    if holder is not None:
+        holder[0] = until
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_users(session):
+    session.info.pop("written_users", None)
+
+
+class ReadYourWritesMiddleware:
+    # ASGI thuần: gắn cookie ghim primary vào response nếu request đã commit thay đổi
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not session_router.has_replica:
+            await self.app(scope, receive, send)
+            return
+        holder = [None]
+        token = _request_pin.set(holder)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and holder[0] is not None:
+                cookie = (
+                    f"{PRIMARY_COOKIE}={holder[0]:.3f}; Max-Age={int(session_router.sticky_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _request_pin.reset(token)
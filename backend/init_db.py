@@ -1,41 +1,49 @@
+import asyncio
 import json
-from sqlalchemy.orm import Session
-from database.database import SessionLocal, engine
-from models import models
+from sqlalchemy import select
+from database.database import AsyncSessionLocal, engine
+from database.migrations import run_migrations
+from api.vocab import VocabularyCreate
+from services.bulk_import import import_vocabularies, iter_list_rows
+from services.decks import apply_deck_growth, get_or_create_deck
+import models
 import os
 
-def init_db():
-    # Create tables
-    models.Base.metadata.create_all(bind=engine)
-    
-    # Create a session
-    db = SessionLocal()
-    
-    try:
+async def load_sample_data(data):
+    async with AsyncSessionLocal() as db:
         # Check if we already have data
-        if db.query(models.Vocabulary).first():
+        if (await db.execute(select(models.Vocabulary.id).limit(1))).first():
             print("Database already has data. Skipping initialization.")
             return
-        
+
+        # Dữ liệu mẫu là bộ từ dùng chung "sample": user đăng ký qua POST /api/decks/{id}/subscribe
+        # (cùng đường bulk insert với POST /api/vocab/vocabularies/bulk)
+        deck = await get_or_create_deck(db, "sample", "Sample vocabulary")
+        result = await import_vocabularies(
+            db, iter_list_rows(data["vocabularies"]), owner_id=None, schema=VocabularyCreate, deck_id=deck.id
+        )
+        await apply_deck_growth(db, deck, {})
+        for error in result["errors"]:
+            print(f"Skipped row {error['line']}: {error['error']}")
+
+        # Commit changes
+        await db.commit()
+        print(f"Sample data initialized successfully! ({result['inserted']} words)")
+
+def init_db():
+    # Tạo / nâng cấp schema
+    run_migrations(engine)
+
+    try:
         # Load sample data
         sample_data_path = os.path.join(os.path.dirname(__file__), "..", "shared", "vocab_data", "sample_vocab.json")
         with open(sample_data_path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        
-        # Add vocabularies
-        for vocab in data["vocabularies"]:
-            db_vocab = models.Vocabulary(**vocab)
-            db.add(db_vocab)
-        
-        # Commit changes
-        db.commit()
-        print("Sample data initialized successfully!")
-        
+
+        asyncio.run(load_sample_data(data))
+
     except Exception as e:
         print(f"Error initializing database: {e}")
-        db.rollback()
-    finally:
-        db.close()
 
 if __name__ == "__main__":
-    init_db() 
\ No newline at end of file
+    init_db()
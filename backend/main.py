@@ -1,12 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import exc
 from api.vocab import router as vocab_router
 from api.auth import router as auth_router
-from database.database import engine
-import models
+from api.decks import router as decks_router
+from api.progress import router as progress_router
+from database.database import async_engine
+from database.migrations import check_schema_version
+from database.pool import pool_sweeper
+from database.routing import ReadYourWritesMiddleware
+from services.hashing import hashing_pool
+from services.log import RequestIdMiddleware, configure_logging, stop_logging
+from services.metrics import MetricsMiddleware, registry
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Log JSON qua hàng đợi, thread nền ghi stdout (services/log.py)
+configure_logging()
 
 app = FastAPI(
     title="Vocabulary Learning App API",
@@ -23,10 +33,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
-app.include_router(vocab_router, prefix="/api/vocab", tags=["Vocabulary"])
+# Cookie ghim primary sau khi ghi khi có replica (database/routing.py)
+app.add_middleware(ReadYourWritesMiddleware)
+
+# Latency / status / số câu SQL theo route, xem GET /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Ngoài cùng: request id có sẵn cho mọi log của request, kể cả log của middleware khác
+app.add_middleware(RequestIdMiddleware)
+
+# Router đã mang sẵn prefix/tags (api/*.py). Gắn thẳng route vào app thay cho include_router:
+# include_router dựng lại mọi APIRoute (và response model pydantic của nó) lần thứ hai,
+# tốn ~150 ms lúc khởi động worker
+for api_router in (auth_router, vocab_router, decks_router, progress_router):
+    for route in api_router.routes:
+        if isinstance(route, APIRoute):
+            route.dependency_overrides_provider = app
+        app.router.routes.append(route)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to Vocabulary Learning App API"} 
\ No newline at end of file
+    return {"message": "Welcome to Vocabulary Learning App API"} 
+
+# Pool hết connection quá DB_POOL_TIMEOUT: trả lỗi nhanh cho client thử lại thay vì treo request
+@app.exception_handler(exc.TimeoutError)
+async def pool_timeout_handler(request: Request, error: exc.TimeoutError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+# Schema do `python manage.py migrate` tạo (chạy một lần trước khi khởi động worker);
+# worker chỉ kiểm tra version đã lưu, không reflect / create_all
+@app.on_event("startup")
+async def verify_schema_version():
+    async with async_engine.connect() as conn:
+        await conn.run_sync(check_schema_version)
+
+# Kiểm tra connection rảnh ở nền thay cho pool_pre_ping (database/pool.py)
+@app.on_event("startup")
+async def start_pool_sweeper():
+    pool_sweeper.start()
+
+@app.on_event("shutdown")
+async def stop_pool_sweeper():
+    await pool_sweeper.stop()
+
+@app.on_event("shutdown")
+def shutdown_hashing_pool():
+    hashing_pool.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_logging():
+    stop_logging()
@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import json
+from sqlalchemy import select
+from api.vocab import VocabularyCreate
+from database.database import AsyncSessionLocal, engine
+from database.migrations import current_version, latest_version, run_migrations
+from models import User as UserModel
+from services.bulk_import import import_vocabularies, iter_list_rows
+from services.category_counts import check_category_counts, rebuild_category_counts
+from services.decks import apply_deck_growth, deck_category_counts, get_or_create_deck
+from services.dictionary import DICTIONARY_PATH, build_index
+from services.progress import rebuild_progress
+from services.review import add_deck_review_states, add_missing_review_states
+from services.sync import SYNC_TOMBSTONE_RETENTION_DAYS, compact_tombstones
+
+# Các lệnh bảo trì chạy tay / qua cron:
+#   python manage.py migrate [--target 7]
+#   python manage.py schema-version
+#   python manage.py check-categories
+#   python manage.py rebuild-categories [--user-id 42]
+#   python manage.py backfill-reviews [--user-id 42]
+#   python manage.py compact-tombstones [--days 30] [--user-id 42]
+#   python manage.py import-deck --slug toeic --name "TOEIC 600" --file toeic.json
+#   python manage.py build-dictionary --source en_vi.tsv [--output data/dictionary.idx]
+#   python manage.py backfill-progress [--user-id 42] [--batch-size 500]
+
+async def migrate(args):
+    # Chạy một lần trước khi khởi động worker (docker-compose / init container)
+    applied = run_migrations(engine, args.target)
+    print(f"{len(applied)} migrations applied")
+    return 0
+
+async def show_schema_version(args):
+    with engine.connect() as conn:
+        version = current_version(conn)
+    expected = latest_version()
+    print(f"database={version} code={expected}")
+    return 0 if version == expected else 1
+
+async def check_categories(args):
+    async with AsyncSessionLocal() as db:
+        mismatches = await check_category_counts(db, args.user_id)
+    for m in mismatches:
+        print(f"user={m['user_id']} category={m['category']!r} stored={m['stored']} actual={m['actual']}")
+    print(f"{len(mismatches)} mismatched rollup rows")
+    return 1 if mismatches else 0
+
+async def rebuild_categories(args):
+    async with AsyncSessionLocal() as db:
+        await rebuild_category_counts(db, args.user_id)
+        await db.commit()
+    print("user_categories rebuilt")
+    return 0
+
+async def backfill_reviews(args):
+    # Tạo review_state cho các từ có từ trước khi có bộ lập lịch ôn tập, kể cả từ của các
+    # bộ từ đã đăng ký
+    async with AsyncSessionLocal() as db:
+        created = await add_missing_review_states(db, args.user_id)
+        created += await add_deck_review_states(
+            db, user_ids=None if args.user_id is None else [args.user_id]
+        )
+        await db.commit()
+    print(f"{created} review_state rows created")
+    return 0
+
+async def compact_sync_tombstones(args):
+    # Chạy định kỳ (cron): client offline lâu hơn --days ngày sẽ phải đồng bộ lại toàn bộ
+    async with AsyncSessionLocal() as db:
+        removed = await compact_tombstones(db, args.days, args.user_id)
+        await db.commit()
+    print(f"{removed} tombstones removed")
+    return 0
+
+async def import_deck(args):
+    # Thêm từ vào bộ từ dùng chung (tạo bộ từ nếu chưa có); người đã đăng ký thấy ngay,
+    # client đồng bộ của họ tải lại ảnh chụp
+    with open(args.file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    rows = data["vocabularies"] if isinstance(data, dict) else data
+    async with AsyncSessionLocal() as db:
+        deck = await get_or_create_deck(db, args.slug, args.name, args.description)
+        before = await deck_category_counts(db, deck.id)
+        result = await import_vocabularies(
+            db, iter_list_rows(rows), owner_id=None, schema=VocabularyCreate, deck_id=deck.id
+        )
+        subscribers = await apply_deck_growth(db, deck, before)
+        await db.commit()
+    for error in result["errors"]:
+        print(f"Skipped row {error['line']}: {error['error']}")
+    print(f"{result['inserted']} words added to deck {args.slug!r} ({subscribers} subscribers)")
+    return 0
+
+async def build_dictionary(args):
+    # Biên dịch TSV (word \t meaning [\t example]) thành index mmap cho /api/vocab/lookup;
+    # khởi động lại worker để dùng bản mới
+    with open(args.source, "r", encoding="utf-8") as f:
+        result = build_index(f, args.output)
+    print(f"{result['entries']} entries, {result['skipped']} skipped lines, {result['bytes']} bytes -> {args.output}")
+    return 0
+
+async def backfill_progress(args):
+    # Dựng lại rollup thống kê học tập từ bảng gốc, theo lô user (keyset trên users.id),
+    # mỗi lô một transaction ngắn. Chạy lại an toàn: mỗi lô xoá rồi dựng lại dữ liệu của lô đó.
+    after, users, days = 0, 0, 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            query = select(UserModel.id).where(UserModel.id > after).order_by(UserModel.id).limit(args.batch_size)
+            if args.user_id is not None:
+                query = query.where(UserModel.id == args.user_id)
+            user_ids = (await db.execute(query)).scalars().all()
+            if not user_ids:
+                break
+            days += await rebuild_progress(db, user_ids)
+            await db.commit()
+        users += len(user_ids)
+        after = user_ids[-1]
+    print(f"progress rebuilt for {users} users ({days} daily rows)")
+    return 0
+
+COMMANDS = {
+    "migrate": migrate,
+    "schema-version": show_schema_version,
+    "check-categories": check_categories,
+    "rebuild-categories": rebuild_categories,
+    "backfill-reviews": backfill_reviews,
+    "compact-tombstones": compact_sync_tombstones,
+    "import-deck": import_deck,
+    "build-dictionary": build_dictionary,
+    "backfill-progress": backfill_progress,
+}
+
+USER_SCOPED_COMMANDS = (
+    "check-categories", "rebuild-categories", "backfill-reviews", "compact-tombstones", "backfill-progress",
+)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vocabulary app maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name in COMMANDS:
+        sub = subparsers.add_parser(name)
+        if name == "migrate":
+            sub.add_argument("--target", type=int, default=None)
+        elif name in USER_SCOPED_COMMANDS:
+            sub.add_argument("--user-id", type=int, default=None)
+        if name == "compact-tombstones":
+            sub.add_argument("--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS)
+        elif name == "import-deck":
+            sub.add_argument("--slug", required=True)
+            sub.add_argument("--name", required=True)
+            sub.add_argument("--description", default=None)
+            sub.add_argument("--file", required=True, help="JSON: list từ hoặc {\"vocabularies\": [...]}")
+        elif name == "build-dictionary":
+            sub.add_argument("--source", required=True)
+            sub.add_argument("--output", default=DICTIONARY_PATH)
+        elif name == "backfill-progress":
+            sub.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    return asyncio.run(COMMANDS[args.command](args))
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+# Schema ban đầu (users, vocabularies, favorites) như create_all của bản đầu tiên.
+# checkfirst: database đã được tạo bằng create_all trước đây giữ nguyên.
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, MetaData, String, Table, func
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("email", String(255), unique=True, index=True),
+    Column("hashed_password", String(255)),
+    Column("is_active", Boolean),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+Table(
+    "vocabularies", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("word", String(100), index=True),
+    Column("meaning", String(1000)),
+    Column("example", String(2000)),
+    Column("category", String(50), index=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Column("owner_id", Integer, ForeignKey("users.id")),
+)
+
+Table(
+    "favorites", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("vocabulary_id", Integer, ForeignKey("vocabularies.id")),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def upgrade(conn):
+    metadata.create_all(conn, checkfirst=True)
@@ -0,0 +1,14 @@
+# Chỉ mục cho keyset pagination theo (created_at, id)
+from sqlalchemy import text
+from database.migrations import has_index
+
+INDEXES = {
+    "ix_vocabularies_owner_category_created": "owner_id, category, created_at, id",
+    "ix_vocabularies_owner_created": "owner_id, created_at, id",
+}
+
+
+def upgrade(conn):
+    for name, columns in INDEXES.items():
+        if not has_index(conn, "vocabularies", name):
+            conn.execute(text(f"CREATE INDEX {name} ON vocabularies ({columns})"))
@@ -0,0 +1,24 @@
+# Rollup số từ theo (user, category), dựng lại từ vocabularies hiện có
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, text
+from database.migrations import has_table
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+user_categories = Table(
+    "user_categories", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("category", String(50), primary_key=True),
+    Column("word_count", Integer, nullable=False),
+)
+
+
+def upgrade(conn):
+    if has_table(conn, "user_categories"):
+        return
+    user_categories.create(conn)
+    conn.execute(text(
+        "INSERT INTO user_categories (user_id, category, word_count) "
+        "SELECT owner_id, category, COUNT(*) FROM vocabularies "
+        "WHERE owner_id IS NOT NULL AND category IS NOT NULL GROUP BY owner_id, category"
+    ))
@@ -0,0 +1,45 @@
+# Chỉ mục full-text cho GET /api/vocab/search
+#   SQLite: bảng FTS5 vocabularies_fts + trigger đồng bộ; "đ" đổi thành "d" để tìm không dấu
+#   MySQL: FULLTEXT (word, meaning, example)
+from sqlalchemy import text
+from database.migrations import has_index, has_table
+
+FOLD = "replace(replace({}, 'đ', 'd'), 'Đ', 'D')"
+
+
+def fts_values(row):
+    return ", ".join([
+        f"{row}.id",
+        FOLD.format(f"coalesce({row}.word, '')"),
+        FOLD.format(f"coalesce({row}.meaning, '')"),
+        FOLD.format(f"coalesce({row}.example, '')"),
+        f"'u' || coalesce({row}.owner_id, '')",
+    ])
+
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS vocabularies_fts USING fts5("
+    "word, meaning, example, owner_key, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_ai AFTER INSERT ON vocabularies BEGIN "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({fts_values('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_ad AFTER DELETE ON vocabularies BEGIN "
+    "DELETE FROM vocabularies_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_au AFTER UPDATE ON vocabularies BEGIN "
+    "DELETE FROM vocabularies_fts WHERE rowid = old.id; "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({fts_values('new')}); END",
+]
+
+
+def upgrade(conn):
+    if conn.dialect.name == "sqlite":
+        created = not has_table(conn, "vocabularies_fts")
+        for statement in SQLITE_STATEMENTS:
+            conn.exec_driver_sql(statement)
+        if created:
+            conn.exec_driver_sql(
+                "INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) "
+                f"SELECT {fts_values('vocabularies')} FROM vocabularies"
+            )
+    elif conn.dialect.name == "mysql":
+        if not has_index(conn, "vocabularies", "ft_vocabularies_text"):
+            conn.execute(text("ALTER TABLE vocabularies ADD FULLTEXT INDEX ft_vocabularies_text (word, meaning, example)"))
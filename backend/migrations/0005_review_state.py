@@ -0,0 +1,37 @@
+# Lịch ôn tập SM-2; mọi từ đã có của user đến hạn ngay
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, Table, func, literal, select
+from database.migrations import has_table
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+vocabularies = Table(
+    "vocabularies", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("owner_id", Integer),
+    Column("created_at", DateTime(timezone=True)),
+)
+review_state = Table(
+    "review_state", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("vocabulary_id", Integer, ForeignKey("vocabularies.id"), primary_key=True),
+    Column("ease", Float, nullable=False),
+    Column("interval", Integer, nullable=False),
+    Column("repetitions", Integer, nullable=False),
+    Column("due_at", DateTime(timezone=True), nullable=False),
+    Column("last_reviewed_at", DateTime(timezone=True)),
+    Index("ix_review_state_user_due", "user_id", "due_at", "vocabulary_id"),
+)
+
+
+def upgrade(conn):
+    if has_table(conn, "review_state"):
+        return
+    review_state.create(conn)
+    conn.execute(review_state.insert().from_select(
+        ["user_id", "vocabulary_id", "ease", "interval", "repetitions", "due_at"],
+        select(
+            vocabularies.c.owner_id, vocabularies.c.id, literal(2.5), literal(0), literal(0),
+            func.coalesce(vocabularies.c.created_at, func.now()),
+        ).where(vocabularies.c.owner_id.is_not(None)),
+    ))
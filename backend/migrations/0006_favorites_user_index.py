@@ -0,0 +1,8 @@
+# Tập id yêu thích của user đọc thẳng từ chỉ mục
+from sqlalchemy import text
+from database.migrations import has_index
+
+
+def upgrade(conn):
+    if not has_index(conn, "favorites", "ix_favorites_user_vocabulary"):
+        conn.execute(text("CREATE INDEX ix_favorites_user_vocabulary ON favorites (user_id, vocabulary_id)"))
@@ -0,0 +1,8 @@
+# Version dữ liệu theo user cho ETag của các endpoint danh sách
+from sqlalchemy import text
+from database.migrations import has_column
+
+
+def upgrade(conn):
+    if not has_column(conn, "users", "data_version"):
+        conn.execute(text("ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0"))
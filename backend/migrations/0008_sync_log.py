@@ -0,0 +1,40 @@
+# Đồng bộ tăng dần: seq trên vocabularies/favorites, bảng tombstone, mốc dọn tombstone của user.
+# Dòng có sẵn nhận seq = data_version hiện tại của owner (client mới luôn bắt đầu bằng một lần tải đầy đủ).
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, text
+from database.migrations import has_column, has_index, has_table
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+sync_tombstones = Table(
+    "sync_tombstones", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False),
+    Column("kind", String(20), nullable=False),
+    Column("object_id", Integer, nullable=False),
+    Column("seq", Integer, nullable=False),
+    Column("deleted_at", DateTime(timezone=True), nullable=False),
+    Index("ix_sync_tombstones_user_seq", "user_id", "seq", "id"),
+    Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+)
+
+SEQ_COLUMNS = (
+    ("vocabularies", "owner_id", "ix_vocabularies_owner_sync"),
+    ("favorites", "user_id", "ix_favorites_user_sync"),
+)
+
+
+def upgrade(conn):
+    if not has_column(conn, "users", "sync_floor"):
+        conn.execute(text("ALTER TABLE users ADD COLUMN sync_floor INTEGER NOT NULL DEFAULT 0"))
+    for table, owner, index in SEQ_COLUMNS:
+        if not has_column(conn, table, "sync_seq"):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN sync_seq INTEGER NOT NULL DEFAULT 0"))
+            conn.execute(text(
+                f"UPDATE {table} SET sync_seq = COALESCE("
+                f"(SELECT users.data_version FROM users WHERE users.id = {table}.{owner}), 0)"
+            ))
+        if not has_index(conn, table, index):
+            conn.execute(text(f"CREATE INDEX {index} ON {table} ({owner}, sync_seq, id)"))
+    if not has_table(conn, "sync_tombstones"):
+        sync_tombstones.create(conn)
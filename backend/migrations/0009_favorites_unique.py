@@ -0,0 +1,21 @@
+# Mỗi (user, từ) yêu thích tối đa một lần: bỏ dòng trùng rồi thay chỉ mục thường bằng unique
+from sqlalchemy import text
+from database.migrations import has_index
+
+
+def upgrade(conn):
+    if not has_index(conn, "favorites", "uq_favorites_user_vocabulary"):
+        # Bảng dẫn xuất: MySQL không cho DELETE đọc trực tiếp bảng đang xoá trong subquery
+        conn.execute(text(
+            "DELETE FROM favorites WHERE id NOT IN ("
+            "SELECT id FROM (SELECT MIN(id) AS id FROM favorites GROUP BY user_id, vocabulary_id) AS keep)"
+        ))
+        conn.execute(text(
+            "CREATE UNIQUE INDEX uq_favorites_user_vocabulary ON favorites (user_id, vocabulary_id)"
+        ))
+    # Tạo unique trước khi xoá chỉ mục cũ: trên MySQL khoá ngoại user_id cần một chỉ mục bắt đầu bằng user_id
+    if has_index(conn, "favorites", "ix_favorites_user_vocabulary"):
+        if conn.dialect.name in ("mysql", "mariadb"):
+            conn.execute(text("DROP INDEX ix_favorites_user_vocabulary ON favorites"))
+        else:
+            conn.execute(text("DROP INDEX ix_favorites_user_vocabulary"))
@@ -0,0 +1,68 @@
+# Bộ từ dùng chung: bảng decks / deck_subscriptions, vocabularies.deck_id / copied_from_id.
+# Từ không có owner (dữ liệu mẫu do init_db.py nạp trước đây) được gom vào bộ từ "sample".
+import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, func, text
+from database.migrations import has_column, has_index, has_table
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+decks = Table(
+    "decks", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("slug", String(100), nullable=False, unique=True),
+    Column("name", String(255), nullable=False),
+    Column("description", String(1000)),
+    Column("word_count", Integer, nullable=False, server_default="0"),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+)
+deck_subscriptions = Table(
+    "deck_subscriptions", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("deck_id", Integer, ForeignKey("decks.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    Index("ix_deck_subscriptions_deck", "deck_id", "user_id"),
+)
+
+INDEXES = (
+    ("ix_vocabularies_deck_category_created", "deck_id, category, created_at, id", False),
+    ("ix_vocabularies_deck_created", "deck_id, created_at, id", False),
+    ("ix_vocabularies_owner_copied", "owner_id, copied_from_id", True),
+)
+
+
+def upgrade(conn):
+    if not has_table(conn, "decks"):
+        decks.create(conn)
+    if not has_table(conn, "deck_subscriptions"):
+        deck_subscriptions.create(conn)
+    if not has_column(conn, "vocabularies", "deck_id"):
+        if conn.dialect.name in ("mysql", "mariadb"):
+            conn.execute(text(
+                "ALTER TABLE vocabularies ADD COLUMN deck_id INTEGER NULL, "
+                "ADD CONSTRAINT fk_vocabularies_deck FOREIGN KEY (deck_id) REFERENCES decks (id)"
+            ))
+        else:
+            conn.execute(text("ALTER TABLE vocabularies ADD COLUMN deck_id INTEGER REFERENCES decks (id)"))
+    if not has_column(conn, "vocabularies", "copied_from_id"):
+        conn.execute(text("ALTER TABLE vocabularies ADD COLUMN copied_from_id INTEGER"))
+    for name, columns, unique in INDEXES:
+        if not has_index(conn, "vocabularies", name):
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            conn.execute(text(f"CREATE {kind} {name} ON vocabularies ({columns})"))
+
+    orphans = conn.execute(text(
+        "SELECT COUNT(*) FROM vocabularies WHERE owner_id IS NULL AND deck_id IS NULL"
+    )).scalar()
+    if orphans:
+        deck_id = conn.execute(text("SELECT id FROM decks WHERE slug = 'sample'")).scalar()
+        if deck_id is None:
+            deck_id = conn.execute(decks.insert().values(
+                slug="sample", name="Sample vocabulary", word_count=0, created_at=datetime.datetime.utcnow(),
+            )).inserted_primary_key[0]
+        conn.execute(text(
+            "UPDATE vocabularies SET deck_id = :deck WHERE owner_id IS NULL AND deck_id IS NULL"
+        ), {"deck": deck_id})
+        conn.execute(text(
+            "UPDATE decks SET word_count = (SELECT COUNT(*) FROM vocabularies WHERE deck_id = :deck) WHERE id = :deck"
+        ), {"deck": deck_id})
@@ -0,0 +1,26 @@
+# Thống kê học tập: bảng user_daily_stats, user_categories.favorite_count / mastered_count.
+# Chỉ tạo schema; dữ liệu cũ dựng bằng `python manage.py backfill-progress` (theo lô user,
+# mỗi lô một transaction) để không khoá bảng lớn trong lúc migrate.
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, Table, text
+from database.migrations import has_column, has_table
+
+metadata = MetaData()
+
+Table("users", metadata, Column("id", Integer, primary_key=True))
+user_daily_stats = Table(
+    "user_daily_stats", metadata,
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("day", Date, primary_key=True),
+    Column("words_added", Integer, nullable=False, server_default="0"),
+    Column("reviews", Integer, nullable=False, server_default="0"),
+    Column("reviews_correct", Integer, nullable=False, server_default="0"),
+    Column("favorites_added", Integer, nullable=False, server_default="0"),
+)
+
+
+def upgrade(conn):
+    if not has_table(conn, "user_daily_stats"):
+        user_daily_stats.create(conn)
+    for column in ("favorite_count", "mastered_count"):
+        if not has_column(conn, "user_categories", column):
+            conn.execute(text(f"ALTER TABLE user_categories ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
@@ -0,0 +1,36 @@
+# Tìm kiếm thấy từ của bộ từ dùng chung: owner_key của từ không có owner đổi từ 'u' thành
+# 'd<deck_id>' (SQLite FTS5). Tạo lại trigger đồng bộ và đánh chỉ mục lại các dòng đó.
+# MySQL không đổi: FULLTEXT chỉ trên word/meaning/example, lọc user bằng SQL.
+from database.migrations import has_table
+
+FOLD = "replace(replace({}, 'đ', 'd'), 'Đ', 'D')"
+
+
+def fts_values(row):
+    return ", ".join([
+        f"{row}.id",
+        FOLD.format(f"coalesce({row}.word, '')"),
+        FOLD.format(f"coalesce({row}.meaning, '')"),
+        FOLD.format(f"coalesce({row}.example, '')"),
+        f"CASE WHEN {row}.owner_id IS NULL THEN 'd' || coalesce({row}.deck_id, '') ELSE 'u' || {row}.owner_id END",
+    ])
+
+
+SQLITE_STATEMENTS = [
+    "DROP TRIGGER IF EXISTS vocabularies_fts_ai",
+    "DROP TRIGGER IF EXISTS vocabularies_fts_au",
+    "CREATE TRIGGER vocabularies_fts_ai AFTER INSERT ON vocabularies BEGIN "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({fts_values('new')}); END",
+    "CREATE TRIGGER vocabularies_fts_au AFTER UPDATE ON vocabularies BEGIN "
+    "DELETE FROM vocabularies_fts WHERE rowid = old.id; "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({fts_values('new')}); END",
+    "DELETE FROM vocabularies_fts WHERE rowid IN (SELECT id FROM vocabularies WHERE owner_id IS NULL)",
+    "INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) "
+    f"SELECT {fts_values('vocabularies')} FROM vocabularies WHERE owner_id IS NULL",
+]
+
+
+def upgrade(conn):
+    if conn.dialect.name == "sqlite" and has_table(conn, "vocabularies_fts"):
+        for statement in SQLITE_STATEMENTS:
+            conn.exec_driver_sql(statement)
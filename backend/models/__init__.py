@@ -0,0 +1,13 @@
+# Các model dùng chung: "from models import User" và "from models import models" đều được
+from models.models import (  # noqa: F401
+    Base,
+    Deck,
+    DeckSubscription,
+    Favorite,
+    ReviewState,
+    SyncTombstone,
+    User,
+    UserCategory,
+    UserDailyStats,
+    Vocabulary,
+)
@@ -1,39 +1,209 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime
+from sqlalchemy import DDL, Boolean, Column, Date, ForeignKey, Float, Index, Integer, String, DateTime, event
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from database.database import Base
 import datetime
+import os
+
+# Cấu hình database URL với pymysql driver
+DATABASE_URL = os.getenv("DATABASE_URL", "mysql+pymysql://vocabuser:admin@db:3306/vocabdb?charset=utf8mb4")
 
 class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True)
-    hashed_password = Column(String)
+    email = Column(String(255), unique=True, index=True)
+    hashed_password = Column(String(255))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Tăng mỗi lần dữ liệu của user thay đổi; dùng làm ETag (services/data_version.py)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Seq lớn nhất đã bị dọn khỏi sync_tombstones; client đồng bộ từ seq nhỏ hơn phải tải lại toàn bộ
+    sync_floor = Column(Integer, nullable=False, default=0, server_default="0")
     
+    # Relationships
+    vocabularies = relationship("Vocabulary", back_populates="owner")
     favorites = relationship("Favorite", back_populates="user")
 
 class Vocabulary(Base):
     __tablename__ = "vocabularies"
 
     id = Column(Integer, primary_key=True, index=True)
-    word = Column(String, index=True)
-    meaning = Column(String)
-    example = Column(String)
-    category = Column(String, index=True)  # TOEIC, IELTS, Communication, etc.
-    language = Column(String, default="en")  # For future language support
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    word = Column(String(100), index=True)
+    meaning = Column(String(1000))
+    example = Column(String(2000))
+    category = Column(String(50), index=True)
+    # Gán từ phía ứng dụng để giá trị lưu và giá trị trong cursor phân trang
+    # có cùng định dạng (CURRENT_TIMESTAMP của SQLite không có phần micro giây)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=datetime.datetime.utcnow)
+    owner_id = Column(Integer, ForeignKey("users.id"))
+    # data_version của owner ở transaction ghi dòng này gần nhất (services/sync.py)
+    sync_seq = Column(Integer, nullable=False, default=0, server_default="0")
+    # Từ của bộ từ dùng chung: owner_id NULL, deck_id là bộ từ (services/decks.py)
+    deck_id = Column(Integer, ForeignKey("decks.id"))
+    # Bản sao riêng khi user sửa một từ của bộ từ: id từ gốc, từ gốc bị ẩn với user này.
+    # Không đặt khoá ngoại để bộ từ vẫn sửa/xoá được khi đã có bản sao.
+    copied_from_id = Column(Integer)
     
+    # Relationships
+    owner = relationship("User", back_populates="vocabularies")
     favorites = relationship("Favorite", back_populates="vocabulary")
 
+    __table_args__ = (
+        # Keyset pagination theo (created_at, id), có và không có filter category
+        Index("ix_vocabularies_owner_category_created", "owner_id", "category", "created_at", "id"),
+        Index("ix_vocabularies_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_vocabularies_owner_sync", "owner_id", "sync_seq", "id"),
+        Index("ix_vocabularies_deck_category_created", "deck_id", "category", "created_at", "id"),
+        Index("ix_vocabularies_deck_created", "deck_id", "created_at", "id"),
+        # Mỗi user tối đa một bản sao cho mỗi từ gốc (hai request sửa cùng lúc không tạo hai bản)
+        Index("ix_vocabularies_owner_copied", "owner_id", "copied_from_id", unique=True),
+    )
+
 class Favorite(Base):
     __tablename__ = "favorites"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     vocabulary_id = Column(Integer, ForeignKey("vocabularies.id"))
-    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sync_seq = Column(Integer, nullable=False, default=0, server_default="0")
     
+    # Relationships
     user = relationship("User", back_populates="favorites")
-    vocabulary = relationship("Vocabulary", back_populates="favorites") 
\ No newline at end of file
+    vocabulary = relationship("Vocabulary", back_populates="favorites") 
+
+    __table_args__ = (
+        # Tập id yêu thích của user đọc thẳng từ chỉ mục (GET /api/vocab/session);
+        # unique để thêm hàng loạt bằng insert-or-ignore (POST /api/vocab/batch)
+        Index("uq_favorites_user_vocabulary", "user_id", "vocabulary_id", unique=True),
+        Index("ix_favorites_user_sync", "user_id", "sync_seq", "id"),
+    )
+
+class UserCategory(Base):
+    # Rollup số từ theo (user, category), cập nhật cùng transaction với mọi thao tác ghi
+    # trên vocabularies (xem services/category_counts.py)
+    __tablename__ = "user_categories"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    category = Column(String(50), primary_key=True)
+    word_count = Column(Integer, nullable=False, default=0)
+    # Số từ yêu thích / đã thuộc trong category (GET /api/progress/stats, services/progress.py)
+    favorite_count = Column(Integer, nullable=False, default=0, server_default="0")
+    mastered_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+class UserDailyStats(Base):
+    # Rollup hoạt động học theo (user, ngày UTC), cập nhật cùng transaction với thao tác ghi
+    # (services/progress.py); thống kê chuỗi ngày / theo ngày chỉ đọc bảng này
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    words_added = Column(Integer, nullable=False, default=0, server_default="0")
+    reviews = Column(Integer, nullable=False, default=0, server_default="0")
+    reviews_correct = Column(Integer, nullable=False, default=0, server_default="0")
+    favorites_added = Column(Integer, nullable=False, default=0, server_default="0")
+
+class Deck(Base):
+    # Bộ từ dùng chung (TOEIC, IELTS, dữ liệu mẫu...): từ lưu một lần trong vocabularies
+    # với deck_id, user đăng ký thay vì chép từng dòng
+    __tablename__ = "decks"
+
+    id = Column(Integer, primary_key=True)
+    slug = Column(String(100), nullable=False, unique=True)
+    name = Column(String(255), nullable=False)
+    description = Column(String(1000))
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=datetime.datetime.utcnow)
+
+class DeckSubscription(Base):
+    __tablename__ = "deck_subscriptions"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    deck_id = Column(Integer, ForeignKey("decks.id"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        # Danh sách người đăng ký của một bộ từ (cập nhật rollup khi bộ từ đổi)
+        Index("ix_deck_subscriptions_deck", "deck_id", "user_id"),
+    )
+
+class SyncTombstone(Base):
+    # Dấu xoá cho đồng bộ tăng dần (GET /api/vocab/sync); object_id là id từ vựng
+    # (kind 'vocabulary') hoặc vocabulary_id của mục yêu thích (kind 'favorite').
+    # Dọn định kỳ bằng `python manage.py compact-tombstones`.
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String(20), nullable=False)
+    object_id = Column(Integer, nullable=False)
+    seq = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, default=datetime.datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_seq", "user_id", "seq", "id"),
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+class ReviewState(Base):
+    # Trạng thái ôn tập SM-2 của từng thẻ; mỗi từ của user có đúng một dòng,
+    # tạo cùng lúc với từ (services/vocab_writes.py). Hàng đợi thẻ đến hạn là một
+    # range scan trên (user_id, due_at).
+    __tablename__ = "review_state"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    vocabulary_id = Column(Integer, ForeignKey("vocabularies.id"), primary_key=True)
+    ease = Column(Float, nullable=False, default=2.5)
+    interval = Column(Integer, nullable=False, default=0)  # số ngày
+    repetitions = Column(Integer, nullable=False, default=0)
+    due_at = Column(DateTime(timezone=True), nullable=False)
+    last_reviewed_at = Column(DateTime(timezone=True))
+
+    vocabulary = relationship("Vocabulary")
+
+    __table_args__ = (
+        Index("ix_review_state_user_due", "user_id", "due_at", "vocabulary_id"),
+    )
+
+# Chỉ mục full-text cho tìm kiếm (services/search.py).
+# MySQL: FULLTEXT trên (word, meaning, example); collation utf8mb4_unicode_ci đã bỏ dấu khi so khớp.
+# SQLite: bảng FTS5 đồng bộ bằng trigger; tokenizer unicode61 bỏ dấu thanh, riêng "đ"
+# (không phải dấu theo Unicode) được đổi thành "d" ngay trong trigger.
+# Cột owner_key = 'u<owner_id>' (từ riêng) hoặc 'd<deck_id>' (từ của bộ từ dùng chung) để lọc
+# theo user / bộ từ đã đăng ký ngay trong chỉ mục FTS; prefix = '2 3'
+# thêm chỉ mục tiền tố cho truy vấn gõ dở ngắn (tiền tố 2-3 ký tự mở rộng ra rất nhiều term).
+SQLITE_FOLD = "replace(replace({}, 'đ', 'd'), 'Đ', 'D')"
+
+def _fts_values(row):
+    return ", ".join([
+        f"{row}.id",
+        SQLITE_FOLD.format(f"coalesce({row}.word, '')"),
+        SQLITE_FOLD.format(f"coalesce({row}.meaning, '')"),
+        SQLITE_FOLD.format(f"coalesce({row}.example, '')"),
+        f"CASE WHEN {row}.owner_id IS NULL THEN 'd' || coalesce({row}.deck_id, '') ELSE 'u' || {row}.owner_id END",
+    ])
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS vocabularies_fts USING fts5("
+    "word, meaning, example, owner_key, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_ai AFTER INSERT ON vocabularies BEGIN "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({_fts_values('new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_ad AFTER DELETE ON vocabularies BEGIN "
+    "DELETE FROM vocabularies_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS vocabularies_fts_au AFTER UPDATE ON vocabularies BEGIN "
+    "DELETE FROM vocabularies_fts WHERE rowid = old.id; "
+    f"INSERT INTO vocabularies_fts (rowid, word, meaning, example, owner_key) VALUES ({_fts_values('new')}); END",
+]
+
+for statement in SQLITE_FTS_DDL:
+    event.listen(Vocabulary.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    Vocabulary.__table__, "after_drop",
+    DDL("DROP TABLE IF EXISTS vocabularies_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    Vocabulary.__table__, "after_create",
+    DDL("ALTER TABLE vocabularies ADD FULLTEXT INDEX ft_vocabularies_text (word, meaning, example)")
+    .execute_if(dialect="mysql"),
+)
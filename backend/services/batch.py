@@ -0,0 +1,82 @@
+from sqlalchemy import and_, select
+from models import Favorite as FavoriteModel
+from models import Vocabulary as VocabularyModel
+from services import vocab_writes
+from services.visibility import visible_to
+from services.serialization import VOCABULARY_COLUMNS, vocabulary_dicts
+
+# POST /api/vocab/batch: nhiều thao tác trong một transaction, SQL theo tập hợp.
+#   1. một query IN (...) lấy quyền sở hữu + trạng thái yêu thích của mọi id được nhắc tới
+#      (từ của bộ từ đã đăng ký: được yêu thích, không được xoá)
+#   2. mô phỏng các op theo đúng thứ tự gửi lên trên trạng thái đó để ra kết quả từng op
+#   3. ghi phần chênh lệch cuối cùng: insert từ mới (executemany), insert-or-ignore / delete
+#      yêu thích, delete từ, mỗi loại một vài câu lệnh
+# Op lỗi (404/400) không huỷ các op khác; mọi op thành công commit cùng nhau với một seq đồng bộ.
+
+
+def _error(status, detail):
+    return {"status": status, "detail": detail}
+
+
+async def run_batch(db, user_id, ops):
+    # ops: list BatchOperation (.op, .id, .data là VocabularyCreate hoặc None). Caller commit.
+    results = [None] * len(ops)
+    referenced = {op.id for op in ops if op.op != "create" and op.id is not None}
+    visible, favorites = {}, set()
+    if referenced:
+        rows = (await db.execute(
+            select(VocabularyModel.id, VocabularyModel.category, VocabularyModel.owner_id,
+                   FavoriteModel.id.label("favorite_id"))
+            .outerjoin(FavoriteModel, and_(
+                FavoriteModel.vocabulary_id == VocabularyModel.id, FavoriteModel.user_id == user_id
+            ))
+            .where(VocabularyModel.id.in_(referenced), visible_to(user_id))
+        )).all()
+        visible = {row.id: row for row in rows}
+        favorites = {row.id for row in rows if row.favorite_id is not None}
+    existing_favorites = set(favorites)
+    creates, deleted = [], []
+
+    for index, op in enumerate(ops):
+        if op.op == "create":
+            if op.data is None:
+                results[index] = _error(400, "data is required")
+            else:
+                creates.append(index)
+            continue
+        if op.id is None:
+            results[index] = _error(400, "id is required")
+        elif op.op == "unfavorite":
+            if op.id in favorites:
+                favorites.discard(op.id)
+                results[index] = {"status": 200, "message": "Removed from favorites"}
+            else:
+                results[index] = _error(404, "Favorite not found")
+        elif op.id not in visible or (op.op == "delete" and visible[op.id].owner_id != user_id):
+            results[index] = _error(404, "Vocabulary not found")
+        elif op.op == "favorite":
+            if op.id in favorites:
+                results[index] = _error(400, "Already in favorites")
+            else:
+                favorites.add(op.id)
+                results[index] = {"status": 200, "message": "Added to favorites"}
+        else:
+            deleted.append(visible.pop(op.id))
+            favorites.discard(op.id)
+            results[index] = {"status": 200, "message": "Deleted"}
+
+    deleted_ids = {row.id for row in deleted}
+    if creates:
+        watermark = await vocab_writes.insert_vocabularies(db, user_id, [ops[i].data.model_dump() for i in creates])
+        created = (await db.execute(
+            select(*VOCABULARY_COLUMNS)
+            .where(VocabularyModel.owner_id == user_id, VocabularyModel.id > watermark)
+            .order_by(VocabularyModel.id)
+        )).all()
+        for index, vocabulary in zip(creates, vocabulary_dicts(created)):
+            results[index] = {"status": 200, "vocabulary": vocabulary}
+    await vocab_writes.add_favorites(db, user_id, sorted(favorites - existing_favorites))
+    # Yêu thích của từ bị xoá đi cùng từ (delete_vocabularies)
+    await vocab_writes.remove_favorites(db, user_id, sorted(existing_favorites - favorites - deleted_ids))
+    await vocab_writes.delete_vocabularies(db, user_id, deleted)
+    return results
@@ -0,0 +1,186 @@
+import codecs
+import csv
+import json
+import os
+from pydantic import ValidationError
+from services.vocab_writes import insert_vocabularies
+
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "1000"))
+# Giới hạn số lỗi trả về để response không phình to khi cả file sai định dạng
+MAX_REPORTED_ERRORS = 1000
+# Cả lần import chạy trong một transaction: giới hạn số dòng mỗi request của user (lệnh quản trị
+# không giới hạn) và kích thước một bản ghi CSV nhiều dòng
+MAX_IMPORT_ROWS = int(os.getenv("MAX_IMPORT_ROWS", "100000"))
+MAX_CSV_RECORD_BYTES = 64 * 1024
+# Số dòng mới gom lại trước mỗi lần chạy csv.reader (một reader cho cả lô)
+CSV_PARSE_BATCH_LINES = 256
+
+
+class ImportTooLarge(Exception):
+    def __init__(self, max_rows):
+        super().__init__(f"At most {max_rows} rows per import")
+        self.max_rows = max_rows
+
+
+async def iter_lines(chunks):
+    # Ghép các chunk bytes thành từng dòng (utf-8, chấp nhận BOM ở đầu file)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def iter_jsonl_rows(chunks):
+    # Trả về (số dòng, dict) hoặc (số dòng, lỗi parse)
+    line_no = 0
+    async for line in iter_lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line_no, ValueError("Each line must be a JSON object")
+            continue
+        yield line_no, row
+
+
+class _Lines:
+    # Nguồn dòng cho csv.reader, ghi nhận đã đọc hết hay chưa
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self.exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._lines)
+        except StopIteration:
+            self.exhausted = True
+            raise
+
+
+def _parse_csv(lines):
+    # csv.reader quyết định ranh giới bản ghi (kể cả dấu " lẻ trong trường không có ngoặc kép).
+    # Trả về ([(vị trí dòng đầu, values hoặc lỗi)], số dòng đã dùng, bản ghi cuối chưa trọn?)
+    source = _Lines(text + "\n" for text in lines)
+    reader = csv.reader(source, strict=True)
+    records, used = [], 0
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            return records, used, False
+        except csv.Error as e:
+            if source.exhausted:
+                # Hết input giữa trường trong ngoặc kép: chờ thêm dòng
+                return records, used, True
+            values = ValueError(f"Invalid CSV: {e}")
+        records.append((used, values))
+        used = reader.line_num
+
+
+async def iter_csv_rows(chunks, max_record_bytes=MAX_CSV_RECORD_BYTES):
+    # Bản ghi có trường trong ngoặc kép có thể trải nhiều dòng: giữ các dòng chưa thành bản ghi
+    # trọn vẹn đến khi csv.reader đọc được. Ngoặc kép không bao giờ đóng (hết file hoặc vượt
+    # max_record_bytes) chỉ làm hỏng dòng mở ngoặc; các dòng sau được đọc lại từ đầu.
+    header = None
+    pending, line_no, unparsed = [], 0, 0
+
+    def parse(final):
+        nonlocal pending, header
+        while pending:
+            records, used, incomplete = _parse_csv([text for _, text in pending])
+            for offset, values in records:
+                start_line = pending[offset][0]
+                if isinstance(values, Exception):
+                    yield start_line, values
+                elif not values or (len(values) == 1 and not values[0].strip()):
+                    continue
+                elif header is None:
+                    header = [h.strip() for h in values]
+                elif len(values) != len(header):
+                    yield start_line, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+                else:
+                    yield start_line, dict(zip(header, values))
+            pending = pending[used:]
+            if not incomplete or (not final and sum(len(text) + 1 for _, text in pending) <= max_record_bytes):
+                return
+            yield pending[0][0], ValueError("Unterminated quoted field")
+            pending = pending[1:]
+
+    async for line in iter_lines(chunks):
+        line_no += 1
+        pending.append((line_no, line))
+        unparsed += 1
+        if unparsed >= CSV_PARSE_BATCH_LINES:
+            unparsed = 0
+            for row in parse(final=False):
+                yield row
+    for row in parse(final=True):
+        yield row
+
+
+async def iter_list_rows(rows):
+    for line_no, row in enumerate(rows, start=1):
+        yield line_no, row
+
+
+def _format_error(error):
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()
+        )
+    return str(error)
+
+
+async def import_vocabularies(
+    db, rows, owner_id, schema, batch_size=BULK_IMPORT_BATCH_SIZE, deck_id=None, max_rows=None
+):
+    # Validate từng dòng, insert theo batch (executemany) trong transaction của db.
+    # Caller chịu trách nhiệm commit; ImportTooLarge khi vượt max_rows thì caller rollback.
+    inserted, errors, error_count = 0, [], 0
+    batch = []
+
+    async def flush():
+        nonlocal inserted
+        if batch:
+            await insert_vocabularies(db, owner_id, batch, deck_id=deck_id)
+            inserted += len(batch)
+            batch.clear()
+
+    async for line_no, row in rows:
+        if max_rows is not None and inserted + len(batch) + error_count >= max_rows:
+            raise ImportTooLarge(max_rows)
+        if not isinstance(row, Exception):
+            try:
+                row = schema(**row).model_dump()
+            except ValidationError as e:
+                row = e
+        if isinstance(row, Exception):
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"line": line_no, "error": _format_error(row)})
+            continue
+        batch.append(row)
+        if len(batch) >= batch_size:
+            await flush()
+    await flush()
+
+    return {
+        "inserted": inserted,
+        "failed": error_count,
+        "errors": errors,
+        "errors_truncated": error_count > len(errors),
+    }
@@ -0,0 +1,96 @@
+from collections import Counter
+from sqlalchemy import delete, exists, func, select, union_all, update
+from sqlalchemy.orm import aliased
+from models import DeckSubscription, UserCategory, Vocabulary as VocabularyModel
+from services.upsert import upsert_increment
+
+table = UserCategory.__table__
+
+
+async def adjust_category_counts(db, user_id, deltas, column="word_count"):
+    # deltas: {category: +n/-n}; chạy trong transaction của caller.
+    # column: word_count, hoặc favorite_count / mastered_count (services/progress.py)
+    deltas = {category: delta for category, delta in Counter(deltas).items() if delta}
+    if user_id is None or not deltas:
+        return
+    await upsert_increment(
+        db, table, ["user_id", "category"],
+        [{"user_id": user_id, "category": c, column: d} for c, d in deltas.items()],
+        [column],
+    )
+    if column == "word_count" and any(d < 0 for d in deltas.values()):
+        await db.execute(delete(table).where(table.c.user_id == user_id, table.c.word_count <= 0))
+
+
+async def get_category_counts(db, user_id):
+    result = await db.execute(
+        select(table.c.category, table.c.word_count)
+        .where(table.c.user_id == user_id, table.c.word_count > 0)
+        .order_by(table.c.category)
+    )
+    return [(category, count) for category, count in result.all()]
+
+
+async def get_category_count(db, user_id, category):
+    result = await db.execute(
+        select(table.c.word_count).where(table.c.user_id == user_id, table.c.category == category)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+def _actual_counts_query(user_id=None):
+    # Từ riêng + từ của các bộ từ đã đăng ký mà user chưa có bản sao riêng
+    personal = (
+        select(VocabularyModel.owner_id.label("user_id"), VocabularyModel.category, func.count().label("word_count"))
+        .where(VocabularyModel.owner_id.isnot(None), VocabularyModel.category.isnot(None))
+        .group_by(VocabularyModel.owner_id, VocabularyModel.category)
+    )
+    copy = aliased(VocabularyModel)
+    subscribed = (
+        select(DeckSubscription.user_id, VocabularyModel.category, func.count().label("word_count"))
+        .join(VocabularyModel, VocabularyModel.deck_id == DeckSubscription.deck_id)
+        .where(VocabularyModel.category.isnot(None))
+        .where(~exists().where(copy.owner_id == DeckSubscription.user_id, copy.copied_from_id == VocabularyModel.id))
+        .group_by(DeckSubscription.user_id, VocabularyModel.category)
+    )
+    if user_id is not None:
+        personal = personal.where(VocabularyModel.owner_id == user_id)
+        subscribed = subscribed.where(DeckSubscription.user_id == user_id)
+    counts = union_all(personal, subscribed).subquery()
+    return (
+        select(counts.c.user_id, counts.c.category, func.sum(counts.c.word_count).label("word_count"))
+        .group_by(counts.c.user_id, counts.c.category)
+    )
+
+
+async def check_category_counts(db, user_id=None):
+    # So rollup với số đếm thật từ vocabularies; trả về danh sách chênh lệch
+    actual = {(u, c): n for u, c, n in (await db.execute(_actual_counts_query(user_id))).all()}
+    query = select(table.c.user_id, table.c.category, table.c.word_count)
+    if user_id is not None:
+        query = query.where(table.c.user_id == user_id)
+    stored = {(u, c): n for u, c, n in (await db.execute(query)).all() if n}
+    return [
+        {"user_id": u, "category": c, "stored": stored.get((u, c), 0), "actual": actual.get((u, c), 0)}
+        for u, c in sorted(set(actual) | set(stored), key=lambda k: (k[0], k[1] or ""))
+        if stored.get((u, c), 0) != actual.get((u, c), 0)
+    ]
+
+
+async def rebuild_category_counts(db, user_id=None, batch_size=1000):
+    # Dựng lại word_count từ vocabularies (một transaction, caller commit).
+    # favorite_count / mastered_count giữ nguyên (services/progress.py có lệnh dựng lại riêng).
+    reset = update(table).values(word_count=0)
+    if user_id is not None:
+        reset = reset.where(table.c.user_id == user_id)
+    await db.execute(reset)
+    rows = [
+        {"user_id": u, "category": c, "word_count": n}
+        for u, c, n in (await db.execute(_actual_counts_query(user_id))).all()
+    ]
+    for start in range(0, len(rows), batch_size):
+        await upsert_increment(db, table, ["user_id", "category"], rows[start:start + batch_size], ["word_count"])
+    stale = delete(table).where(table.c.word_count <= 0)
+    if user_id is not None:
+        stale = stale.where(table.c.user_id == user_id)
+    await db.execute(stale)
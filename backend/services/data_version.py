@@ -0,0 +1,84 @@
+import os
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from database.routing import mark_written
+from models import User as UserModel
+from services.ttl_cache import TTLCache
+
+# users.data_version tăng trong cùng transaction với mọi thao tác ghi dữ liệu của user
+# (từ vựng, yêu thích). ETag của các endpoint danh sách = (user, data_version), nên
+# If-None-Match khớp thì trả 304 mà không cần đọc vocabularies.
+#
+# Cache trong process: invalidate ngay sau commit ở process này; các worker khác
+# thấy version mới muộn nhất sau DATA_VERSION_CACHE_TTL_SECONDS. ETag là strong nên
+# request có If-None-Match luôn đọc version từ DB (cached=False, một lần tra khoá chính):
+# version cũ chỉ được dùng để gắn ETag cho response 200, không bao giờ để trả 304.
+
+DATA_VERSION_CACHE_MAX_SIZE = int(os.getenv("DATA_VERSION_CACHE_MAX_SIZE", "10000"))
+DATA_VERSION_CACHE_TTL_SECONDS = float(os.getenv("DATA_VERSION_CACHE_TTL_SECONDS", "5"))
+
+data_version_cache = TTLCache(maxsize=DATA_VERSION_CACHE_MAX_SIZE, ttl=DATA_VERSION_CACHE_TTL_SECONDS)
+
+users = UserModel.__table__
+
+
+async def bump_data_version(db, user_id):
+    # Tăng một lần mỗi transaction và trả về version mới; version này cũng là seq đồng bộ
+    # của mọi dòng ghi trong transaction (services/sync.py). UPDATE giữ khoá dòng users
+    # đến khi commit nên các transaction ghi của cùng user nhận seq theo đúng thứ tự commit.
+    if user_id is None:
+        return None
+    bumps = db.sync_session.info.setdefault("data_version_bumps", {})
+    if user_id in bumps:
+        return bumps[user_id]
+    stmt = update(users).where(users.c.id == user_id).values(data_version=users.c.data_version + 1)
+    if db.bind.dialect.update_returning:
+        version = (await db.execute(stmt.returning(users.c.data_version))).scalar_one_or_none()
+    else:
+        # MySQL không có UPDATE ... RETURNING
+        await db.execute(stmt)
+        version = (await db.execute(
+            select(users.c.data_version).where(users.c.id == user_id)
+        )).scalar_one_or_none()
+    bumps[user_id] = version or 0
+    data_version_cache.invalidate(user_id)
+    # Đọc của user này đi primary một lúc sau commit (replica có thể chưa kịp nhận)
+    mark_written(db, user_id)
+    return bumps[user_id]
+
+
+async def get_data_version(db, user_id, cached=True):
+    version = data_version_cache.get(user_id) if cached else None
+    if version is None:
+        generation = data_version_cache.generation()
+        version = (await db.execute(
+            select(users.c.data_version).where(users.c.id == user_id)
+        )).scalar_one_or_none() or 0
+        data_version_cache.set(user_id, version, generation=generation)
+    return version
+
+
+def make_etag(user_id, version):
+    return f'"{user_id}.{version}"'
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # So khớp yếu theo RFC 9110: bỏ tiền tố W/ của client
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_versions_on_commit(session):
+    # Request khác có thể đã đọc version cũ giữa lúc UPDATE và commit
+    for user_id in session.info.pop("data_version_bumps", ()):
+        data_version_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_version_bumps(session):
+    session.info.pop("data_version_bumps", None)
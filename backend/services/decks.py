@@ -0,0 +1,139 @@
+from collections import Counter
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.orm import aliased
+from models import Deck, DeckSubscription, Favorite as FavoriteModel, ReviewState, UserCategory
+from models import User as UserModel
+from models import Vocabulary as VocabularyModel
+from services.category_counts import adjust_category_counts
+from services.data_version import bump_data_version, data_version_cache
+from services.progress import forget_words
+from services.quiz import record_reset
+from services.review import add_deck_review_states
+from services.upsert import upsert_increment
+from services.visibility import subscribed_deck_ids
+
+# Bộ từ dùng chung: từ của bộ từ lưu MỘT lần trong vocabularies (owner_id NULL, deck_id),
+# user đăng ký bộ từ thay vì chép từng dòng. Từ user thấy = từ riêng ∪ từ của các bộ từ đã
+# đăng ký, trừ các từ đã có bản sao riêng (copy-on-write khi sửa, copied_from_id = id từ gốc).
+# Id của từ bộ từ dùng chung không gian id với từ riêng nên favorites/quiz/sync dùng như nhau.
+#
+# Danh sách từ: UNION ALL hai nhánh, mỗi nhánh đi theo chỉ mục riêng (owner_id, ...) và
+# (deck_id, ...) rồi mới trộn và cắt trang. user_categories đếm cả từ của bộ từ đã đăng ký
+# (cộng khi đăng ký, trừ khi huỷ), nên /categories vẫn chỉ đọc rollup. Người đăng ký có
+# review_state riêng cho từng từ của bộ từ (tạo khi đăng ký / khi bộ từ thêm từ, xoá khi huỷ).
+# Đăng ký / huỷ đăng ký nâng users.sync_floor: client đồng bộ tải lại ảnh chụp đầy đủ.
+
+subscriptions = DeckSubscription.__table__
+user_categories = UserCategory.__table__
+users = UserModel.__table__
+
+
+async def list_decks(db, user_id):
+    subscribed = set((await db.execute(subscribed_deck_ids(user_id))).scalars().all())
+    decks = (await db.execute(select(Deck).order_by(Deck.name, Deck.id))).scalars().all()
+    return [
+        {
+            "id": deck.id, "slug": deck.slug, "name": deck.name, "description": deck.description,
+            "word_count": deck.word_count, "subscribed": deck.id in subscribed,
+        }
+        for deck in decks
+    ]
+
+
+async def _visible_deck_counts(db, user_id, deck_id):
+    copy = aliased(VocabularyModel)
+    rows = (await db.execute(
+        select(VocabularyModel.category, func.count())
+        .where(VocabularyModel.deck_id == deck_id)
+        .where(~exists().where(copy.owner_id == user_id, copy.copied_from_id == VocabularyModel.id))
+        .group_by(VocabularyModel.category)
+    )).all()
+    return {category: count for category, count in rows if category is not None}
+
+
+async def _reset_sync(db, user_id):
+    # Tập từ thay đổi hàng loạt: client có since cũ hơn seq này phải tải lại ảnh chụp đầy đủ
+    seq = await bump_data_version(db, user_id)
+    await db.execute(update(users).where(users.c.id == user_id).values(sync_floor=seq))
+    record_reset(db, user_id)
+
+
+async def subscribe(db, user_id, deck_id):
+    # Trả về False nếu đã đăng ký. Caller commit.
+    exists_already = (await db.execute(
+        select(subscriptions.c.deck_id).where(subscriptions.c.user_id == user_id, subscriptions.c.deck_id == deck_id)
+    )).first()
+    if exists_already:
+        return False
+    await _reset_sync(db, user_id)
+    await db.execute(insert(subscriptions).values(user_id=user_id, deck_id=deck_id))
+    await adjust_category_counts(db, user_id, await _visible_deck_counts(db, user_id, deck_id))
+    await add_deck_review_states(db, deck_id, [user_id])
+    return True
+
+
+async def unsubscribe(db, user_id, deck_id):
+    # Bản sao riêng đã sửa vẫn giữ; yêu thích / lịch ôn của từ gốc trong bộ từ bị xoá
+    deleted = (await db.execute(
+        delete(subscriptions).where(subscriptions.c.user_id == user_id, subscriptions.c.deck_id == deck_id)
+    )).rowcount
+    if not deleted:
+        return False
+    await _reset_sync(db, user_id)
+    await forget_words(db, user_id, VocabularyModel.deck_id == deck_id)
+    deck_word_ids = select(VocabularyModel.id).where(VocabularyModel.deck_id == deck_id)
+    await db.execute(delete(FavoriteModel).where(
+        FavoriteModel.user_id == user_id, FavoriteModel.vocabulary_id.in_(deck_word_ids)
+    ))
+    await db.execute(delete(ReviewState).where(
+        ReviewState.user_id == user_id, ReviewState.vocabulary_id.in_(deck_word_ids)
+    ))
+    counts = await _visible_deck_counts(db, user_id, deck_id)
+    await adjust_category_counts(db, user_id, {category: -n for category, n in counts.items()})
+    return True
+
+
+async def get_or_create_deck(db, slug, name, description=None):
+    deck = (await db.execute(select(Deck).where(Deck.slug == slug))).scalar_one_or_none()
+    if deck is None:
+        deck = Deck(slug=slug, name=name, description=description, word_count=0)
+        db.add(deck)
+        await db.flush()
+    return deck
+
+
+async def deck_category_counts(db, deck_id):
+    rows = (await db.execute(
+        select(VocabularyModel.category, func.count())
+        .where(VocabularyModel.deck_id == deck_id, VocabularyModel.category.isnot(None))
+        .group_by(VocabularyModel.category)
+    )).all()
+    return Counter(dict(rows))
+
+
+async def apply_deck_growth(db, deck, before, batch_size=1000):
+    # Sau khi thêm từ vào bộ từ (import): cộng phần tăng vào rollup của mọi người đăng ký, tạo
+    # review_state cho từ mới và nâng sync_floor để client của họ tải lại. Thao tác quản trị,
+    # chạy ngoài giờ cao điểm.
+    after = await deck_category_counts(db, deck.id)
+    deck.word_count = sum(after.values())
+    delta = {category: after[category] - before.get(category, 0) for category in after}
+    delta = {category: n for category, n in delta.items() if n}
+    subscribers = (await db.execute(
+        select(subscriptions.c.user_id).where(subscriptions.c.deck_id == deck.id)
+    )).scalars().all()
+    for start in range(0, len(subscribers), batch_size):
+        chunk = subscribers[start:start + batch_size]
+        await upsert_increment(
+            db, user_categories, ["user_id", "category"],
+            [{"user_id": u, "category": c, "word_count": n} for u in chunk for c, n in delta.items()],
+            ["word_count"],
+        )
+        await add_deck_review_states(db, deck.id, chunk)
+        # Hai câu riêng: MySQL dùng giá trị đã cập nhật trong cùng SET, SQLite dùng giá trị cũ
+        await db.execute(update(users).where(users.c.id.in_(chunk)).values(data_version=users.c.data_version + 1))
+        await db.execute(update(users).where(users.c.id.in_(chunk)).values(sync_floor=users.c.data_version))
+        for user_id in chunk:
+            record_reset(db, user_id)
+    data_version_cache.clear()
+    return len(subscribers)
@@ -0,0 +1,154 @@
+import mmap
+import os
+import struct
+
+# Từ điển Anh–Việt offline cho GET /api/vocab/lookup và autocomplete.
+# Index là một file nhị phân dựng sẵn (python manage.py build-dictionary), mỗi worker mmap
+# chỉ đọc: các trang nằm trong page cache của OS và được mọi worker dùng chung, heap của
+# worker không tăng theo kích thước từ điển. Tra cứu là binary search trên bảng offset.
+#
+# Định dạng (số nguyên little-endian):
+#   MAGIC (8 byte) | count (u64) | count x offset (u64, theo thứ tự khoá) | các bản ghi
+#   bản ghi: key \t word \t meaning \t example \n  (UTF-8; key = normalize(word))
+# So sánh byte UTF-8 cùng thứ tự với so sánh code point nên sort theo key.encode() là đủ.
+#
+# Dựng lại index ghi file tạm rồi os.replace: worker đang chạy vẫn đọc inode cũ,
+# khởi động lại worker để dùng bản mới.
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DICTIONARY_PATH = os.getenv("DICTIONARY_PATH", os.path.join(BACKEND_DIR, "data", "dictionary.idx"))
+MAX_AUTOCOMPLETE = 50
+
+MAGIC = b"VDICT001"
+COUNT = struct.Struct("<Q")
+OFFSET = struct.Struct("<Q")
+HEADER_SIZE = len(MAGIC) + COUNT.size
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def _clean(value):
+    # Tab / xuống dòng là ký tự phân cách của bản ghi
+    return " ".join((value or "").split())
+
+
+def build_index(lines, output_path):
+    # lines: các dòng TSV "word \t meaning [\t example]"; dòng trống hoặc bắt đầu bằng # bị bỏ qua.
+    # Một từ có thể xuất hiện nhiều dòng (nhiều nghĩa), giữ theo thứ tự trong file nguồn.
+    entries, skipped = [], 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        word = _clean(fields[0])
+        meaning = _clean(fields[1]) if len(fields) > 1 else ""
+        key = normalize(word)
+        if not key or not meaning:
+            skipped += 1
+            continue
+        example = _clean(fields[2]) if len(fields) > 2 else ""
+        entries.append((key.encode("utf-8"), len(entries), word, meaning, example))
+    entries.sort()
+
+    records = [b"\t".join((key, *(f.encode("utf-8") for f in (word, meaning, example)))) + b"\n"
+               for key, _, word, meaning, example in entries]
+    offset = HEADER_SIZE + OFFSET.size * len(records)
+    offsets = bytearray()
+    for record in records:
+        offsets += OFFSET.pack(offset)
+        offset += len(record)
+
+    tmp_path = f"{output_path}.tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(COUNT.pack(len(records)))
+        f.write(offsets)
+        for record in records:
+            f.write(record)
+    os.replace(tmp_path, output_path)
+    return {"entries": len(records), "skipped": skipped, "bytes": offset}
+
+
+class Dictionary:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            # mmap giữ tham chiếu tới file, đóng file object không ảnh hưởng
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a dictionary index")
+        self.count = COUNT.unpack_from(self._mm, len(MAGIC))[0]
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._mm.close()
+
+    def _offset(self, index):
+        return OFFSET.unpack_from(self._mm, HEADER_SIZE + OFFSET.size * index)[0]
+
+    def _key(self, index):
+        start = self._offset(index)
+        return self._mm[start:self._mm.find(b"\t", start)]
+
+    def _entry(self, index):
+        start = self._offset(index)
+        _, word, meaning, example = self._mm[start:self._mm.find(b"\n", start)].decode("utf-8").split("\t")
+        return {"word": word, "meaning": meaning, "example": example or None}
+
+    def _lower_bound(self, key):
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, word):
+        # Mọi nghĩa của từ (không phân biệt hoa thường / khoảng trắng thừa)
+        key = normalize(word).encode("utf-8")
+        if not key:
+            return []
+        index, entries = self._lower_bound(key), []
+        while index < self.count and self._key(index) == key:
+            entries.append(self._entry(index))
+            index += 1
+        return entries
+
+    def complete(self, prefix, limit=10):
+        # Các từ bắt đầu bằng prefix theo thứ tự chữ cái, mỗi từ một lần kèm nghĩa đầu tiên
+        key = normalize(prefix).encode("utf-8")
+        if not key:
+            return []
+        index, suggestions, last = self._lower_bound(key), [], None
+        while index < self.count and len(suggestions) < limit:
+            current = self._key(index)
+            if not current.startswith(key):
+                break
+            if current != last:
+                entry = self._entry(index)
+                suggestions.append({"word": entry["word"], "meaning": entry["meaning"]})
+                last = current
+            index += 1
+        return suggestions
+
+
+_opened = {}
+
+
+def get_dictionary(path=None):
+    # Mở lười trong từng worker (sau fork); None nếu chưa dựng index
+    path = path or DICTIONARY_PATH
+    dictionary = _opened.get(path)
+    if dictionary is None:
+        if not os.path.exists(path):
+            return None
+        dictionary = _opened[path] = Dictionary(path)
+    return dictionary
@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+import os
+from sqlalchemy import select
+from database.database import AsyncSessionLocal
+from models import Vocabulary as VocabularyModel
+from services.visibility import select_visible
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = ("id", "word", "meaning", "example", "category", "created_at")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _encode_ndjson(rows):
+    lines = []
+    for row in rows:
+        item = dict(zip(EXPORT_COLUMNS, row))
+        if item["created_at"] is not None:
+            item["created_at"] = item["created_at"].isoformat()
+        lines.append(json.dumps(item, ensure_ascii=False))
+    lines.append("")
+    return "\n".join(lines).encode()
+
+
+def _encode_csv(rows, header=False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if hasattr(value, "isoformat") else value for value in row
+        ])
+    return buffer.getvalue().encode()
+
+
+async def stream_vocabularies(owner_id, format, session_factory=AsyncSessionLocal):
+    # Session riêng cho stream: response còn chạy sau khi dependency get_db đã đóng.
+    # Server-side cursor + yield_per: chỉ giữ tối đa EXPORT_BATCH_SIZE dòng trong bộ nhớ.
+    if format == "csv":
+        yield _encode_csv([], header=True)
+    # Từ riêng ∪ từ của các bộ từ đã đăng ký, theo (created_at, id) như danh sách từ
+    query = select_visible(
+        owner_id, select(*(getattr(VocabularyModel, column) for column in EXPORT_COLUMNS)),
+    ).execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            yield _encode_csv(rows) if format == "csv" else _encode_ndjson(rows)
@@ -0,0 +1,147 @@
+import atexit
+import datetime
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+
+import orjson
+
+# Log có cấu trúc (một dòng JSON mỗi record) qua QueueHandler: thread xử lý request chỉ
+# đưa LogRecord vào hàng đợi, việc format + ghi stdout do thread của QueueListener làm.
+# Gọi theo kiểu logger.info("login failed", extra={"user_id": 1}) hoặc dùng %-args, không
+# dùng f-string: khi level bị tắt, logger bỏ qua record trước khi format bất cứ thứ gì.
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Field có tên này (ở extra hoặc dict lồng bên trong) luôn bị che khi ghi log
+REDACTED_FIELDS = frozenset({
+    "password", "hashed_password", "new_password", "token", "access_token", "refresh_token",
+    "authorization", "secret", "secret_key", "api_key",
+})
+REDACTED = "[REDACTED]"
+
+# Thuộc tính sẵn có của LogRecord; phần còn lại là field truyền qua extra
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+request_id = ContextVar("request_id", default=None)
+
+
+def redact(value):
+    if isinstance(value, dict):
+        return {k: REDACTED if str(k).lower() in REDACTED_FIELDS else redact(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        rid = getattr(record, "request_id", None)
+        if rid is not None:
+            entry["request_id"] = rid
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = REDACTED if key.lower() in REDACTED_FIELDS else redact(value)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+class RequestIdFilter(logging.Filter):
+    # Chạy trên thread gọi log (trước khi vào hàng đợi) để đọc được ContextVar của request
+    def filter(self, record):
+        record.request_id = request_id.get()
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Listener cùng process nên giữ nguyên record; format để thread nền làm
+        return record
+
+    def enqueue(self, record):
+        # Hàng đợi đầy (stdout nghẽn): bỏ record thay vì chặn request
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener = None
+_handler = None
+
+
+def configure_logging(level=LOG_LEVEL, stream=None, queue_size=LOG_QUEUE_SIZE):
+    # Gắn QueueHandler vào root logger (gọi lại thì thay cấu hình cũ)
+    global _listener, _handler
+    stop_logging()
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    _handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+    _handler.addFilter(RequestIdFilter())
+    _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=False)
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+    _listener.start()
+    return _handler
+
+
+def stop_logging():
+    # Ghi nốt các record còn trong hàng đợi rồi dừng thread nền
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+
+
+atexit.register(stop_logging)
+
+
+class RequestIdMiddleware:
+    # Lấy X-Request-ID của client (hoặc sinh mới), gắn vào mọi log của request và trả lại
+    # trong header response
+    def __init__(self, app, header="x-request-id"):
+        self.app = app
+        self.header = header.encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = None
+        for name, value in scope["headers"]:
+            if name == self.header:
+                rid = value.decode("latin-1")[:128]
+                break
+        if not rid:
+            rid = uuid.uuid4().hex
+        token = request_id.set(rid)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(self.header, rid.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
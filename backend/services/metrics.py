@@ -0,0 +1,302 @@
+import itertools
+import logging
+import os
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+
+# Metric trong process, xuất ở GET /metrics theo định dạng text của Prometheus.
+# Ghi nhận chỉ là vài phép cộng trên dict/list (không lock: middleware và event SQL
+# chạy trên thread của event loop), phần cộng dồn bucket để lúc render.
+
+logger = logging.getLogger("vocab.metrics")
+
+SQL_METRICS_ENABLED = os.getenv("SQL_METRICS", "1") != "0"
+
+# Đo thời gian 1/N câu SQL vào db_query_duration_seconds; 0 = chỉ đếm câu (mặc định)
+SQL_TIMING_SAMPLE_EVERY = int(os.getenv("SQL_TIMING_SAMPLE_EVERY", "0"))
+
+# Cảnh báo N+1: số câu SQL tối đa của một request trước khi log warning
+SQL_QUERY_BUDGET = int(os.getenv("SQL_QUERY_BUDGET", "20"))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values = {}
+
+    def inc(self, label_values=(), amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    # function: gauge đọc lúc render (ví dụ trạng thái pool), không tốn gì lúc xử lý request
+    def __init__(self, name, help, labels=(), function=None):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values = {}
+        self.function = function
+
+    def inc(self, label_values=(), amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def dec(self, label_values=(), amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) - amount
+
+    def set(self, label_values=(), value=0):
+        self.values[label_values] = value
+
+    def render(self):
+        values = self.function() if self.function is not None else self.values
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # key -> [đếm theo bucket (không cộng dồn) + bucket +Inf, sum, count]
+        self.values = {}
+
+    def observe(self, value, label_values=()):
+        entry = self.values.get(label_values)
+        if entry is None:
+            entry = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        label_names = self.labels + ("le",)
+        for key, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(label_names, key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status"),
+))
+http_latency = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route"),
+))
+http_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+))
+request_queries = registry.register(Histogram(
+    "http_request_db_queries", "SQL statements issued per request", ("route",), QUERY_COUNT_BUCKETS,
+))
+query_budget_exceeded = registry.register(Counter(
+    "http_request_db_query_budget_exceeded_total", "Requests that issued more than SQL_QUERY_BUDGET statements",
+    ("route",),
+))
+db_queries = registry.register(Counter(
+    "db_queries_total", "SQL statements executed", ("engine",),
+))
+db_query_time = registry.register(Histogram(
+    "db_query_duration_seconds", "SQL statement latency (1 in SQL_TIMING_SAMPLE_EVERY statements)", ("engine",),
+))
+pool_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",),
+))
+pool_timeouts = registry.register(Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT", ("engine",),
+))
+pool_sweeps = registry.register(Counter(
+    "db_pool_sweeps_total", "Background liveness sweeps of idle connections", ("engine",),
+))
+pool_swept_dead = registry.register(Counter(
+    "db_pool_dead_connections_total", "Idle connections found dead by the sweeper", ("engine",),
+))
+
+# Các engine có pool cần báo trạng thái: tên -> engine (sync)
+_pools = {}
+
+
+def pool_stats(pool):
+    # Trạng thái QueuePool; None với pool không giới hạn (NullPool, StaticPool, ...)
+    if not hasattr(pool, "checkedout"):
+        return None
+    size = pool.size()
+    checked_out = pool.checkedout()
+    capacity = size + max(pool._max_overflow, 0)
+    return {
+        "size": size,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(0, checked_out - size),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 4) if capacity else 0,
+    }
+
+
+def _pool_status():
+    values = {}
+    for name, engine in _pools.items():
+        stats = pool_stats(engine.pool)
+        for state, value in (stats or {}).items():
+            values[(name, state)] = value
+    return values
+
+
+registry.register(Gauge(
+    "db_pool", "Connection pool state (size, checked_in, checked_out, overflow, capacity, saturation)",
+    ("engine", "state"), function=_pool_status,
+))
+
+
+class RequestStats:
+    __slots__ = ("queries",)
+
+    def __init__(self):
+        self.queries = 0
+
+
+# Thống kê SQL của request hiện tại; event SQL cộng vào object này
+current_request = ContextVar("current_request", default=None)
+
+
+def instrument_engine(engine, name, timing_every=SQL_TIMING_SAMPLE_EVERY):
+    # engine: Engine sync (với AsyncEngine truyền async_engine.sync_engine)
+    label = (name,)
+    _pools[name] = engine
+    if not SQL_METRICS_ENABLED:
+        return
+
+    # Đếm bằng event của dialect (do_execute*): cộng counter engine và counter của request
+    # trong contextvar. Event before/after_cursor_execute bật toàn bộ nhánh dispatch event
+    # của Connection (~10 µs/câu kể cả listener rỗng); cặp perf_counter + histogram trên
+    # đó từng tốn ~15 µs/câu (benchmarks/bench_metrics_overhead.py). Listener trả None nên
+    # dialect vẫn tự chạy câu lệnh.
+    def _count(*args):
+        db_queries.inc(label)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+
+    for name in ("do_execute", "do_execute_no_params", "do_executemany"):
+        event.listen(engine, name, _count)
+
+    if timing_every > 0:
+        _sample_timing(engine, label, timing_every)
+
+
+def _sample_timing(engine, label, every):
+    # Cần before/after_cursor_execute nên mọi câu (kể cả câu không được lấy mẫu) trả thêm
+    # ~10 µs dispatch event; chỉ bật khi cần xem latency SQL
+    seen = itertools.count()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if next(seen) % every == 0:
+            context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_start", None)
+        if start is not None:
+            db_query_time.observe(time.perf_counter() - start, label)
+
+
+def observe_pool_wait(name, elapsed):
+    pool_wait.observe(elapsed, (name,))
+
+
+def observe_pool_timeout(name):
+    pool_timeouts.inc((name,))
+
+
+class MetricsMiddleware:
+    # ASGI thuần (không dùng BaseHTTPMiddleware): không tạo task, không bọc body
+    def __init__(self, app, query_budget=SQL_QUERY_BUDGET):
+        self.app = app
+        self.query_budget = query_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        stats = RequestStats()
+        token = current_request.set(stats)
+        http_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_in_flight.dec()
+            current_request.reset(token)
+            # Template của route (/api/vocab/{vocab_id}) để số series không phụ thuộc id
+            route = scope.get("route")
+            path = route.path if route is not None else "<unmatched>"
+            method = scope["method"]
+            http_requests.inc((method, path, status))
+            http_latency.observe(elapsed, (method, path))
+            if stats.queries:
+                request_queries.observe(stats.queries, (path,))
+                if stats.queries > self.query_budget:
+                    query_budget_exceeded.inc((path,))
+                    logger.warning(
+                        "%s %s issued %d SQL statements (budget %d)",
+                        method, path, stats.queries, self.query_budget,
+                    )
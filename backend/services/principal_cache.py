@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Principal:
+    # Bản sao nhẹ của User, an toàn để dùng chung giữa các request/session
+    id: int
+    email: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(id=user.id, email=user.email, is_active=user.is_active)
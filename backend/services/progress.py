@@ -0,0 +1,209 @@
+import datetime
+from collections import Counter
+from sqlalchemy import case, delete, func, or_, select, update
+from models import Favorite as FavoriteModel, ReviewState, UserCategory, UserDailyStats
+from models import Vocabulary as VocabularyModel
+from services.category_counts import adjust_category_counts
+from services.upsert import upsert_increment
+
+# Thống kê học tập (GET /api/progress/stats) chỉ đọc rollup, không quét vocabularies/favorites:
+#   - user_categories.word_count / favorite_count / mastered_count: số từ, từ yêu thích, từ đã
+#     thuộc (khoảng ôn >= MASTERED_INTERVAL_DAYS) theo category
+#   - user_daily_stats: số từ thêm / lượt ôn / lượt ôn đúng / yêu thích mới theo (user, ngày UTC)
+# Cả hai cập nhật cùng transaction với thao tác ghi (vocab_writes, review, decks) bằng upsert
+# cộng dồn. Chi phí đọc theo số category + số ngày trong cửa sổ + độ dài chuỗi ngày học,
+# không theo số từ của user. Dữ liệu cũ dựng bằng `python manage.py backfill-progress`.
+
+MASTERED_INTERVAL_DAYS = 21
+STATS_MAX_DAYS = 365
+DAILY_COUNTERS = ("words_added", "reviews", "reviews_correct", "favorites_added")
+STREAK_PAGE_SIZE = 64
+
+daily = UserDailyStats.__table__
+user_categories = UserCategory.__table__
+
+
+def today():
+    return datetime.datetime.utcnow().date()
+
+
+def is_mastered(interval):
+    return interval >= MASTERED_INTERVAL_DAYS
+
+
+async def record_activity(db, user_id, day=None, **counters):
+    # Cộng counters (words_added=1, reviews=1, ...) vào dòng của ngày day (mặc định hôm nay)
+    counters = {name: value for name, value in counters.items() if value}
+    if user_id is None or not counters:
+        return
+    await upsert_increment(
+        db, daily, ["user_id", "day"],
+        [{"user_id": user_id, "day": day or today(), **counters}],
+        list(counters),
+    )
+
+
+async def _flag_counts(db, user_id, condition):
+    # ({category: số từ yêu thích}, {category: số từ đã thuộc}) của user trong các từ thoả condition
+    favorites = (await db.execute(
+        select(VocabularyModel.category, func.count())
+        .join(FavoriteModel, FavoriteModel.vocabulary_id == VocabularyModel.id)
+        .where(FavoriteModel.user_id == user_id, condition)
+        .group_by(VocabularyModel.category)
+    )).all()
+    mastered = (await db.execute(
+        select(VocabularyModel.category, func.count())
+        .join(ReviewState, ReviewState.vocabulary_id == VocabularyModel.id)
+        .where(ReviewState.user_id == user_id, ReviewState.interval >= MASTERED_INTERVAL_DAYS, condition)
+        .group_by(VocabularyModel.category)
+    )).all()
+    return Counter(dict(favorites)), Counter(dict(mastered))
+
+
+async def forget_words(db, user_id, condition):
+    # Gọi TRƯỚC khi xoá từ / yêu thích / review_state của các từ thoả condition
+    favorites, mastered = await _flag_counts(db, user_id, condition)
+    await adjust_category_counts(db, user_id, {c: -n for c, n in favorites.items()}, "favorite_count")
+    await adjust_category_counts(db, user_id, {c: -n for c, n in mastered.items()}, "mastered_count")
+
+
+async def recategorize(db, user_id, vocabulary_id, old_category, new_category):
+    # Từ đổi category: chuyển cờ yêu thích / đã thuộc sang category mới. Gọi trước khi
+    # yêu thích / review_state bị chuyển sang bản sao (copy-on-write)
+    if old_category == new_category:
+        return
+    favorites, mastered = await _flag_counts(db, user_id, VocabularyModel.id == vocabulary_id)
+    for column, flags in (("favorite_count", favorites), ("mastered_count", mastered)):
+        if flags:
+            await adjust_category_counts(db, user_id, {old_category: -1, new_category: 1}, column)
+
+
+async def _current_streak(db, user_id, day):
+    # Số ngày học liên tiếp (thêm từ hoặc ôn tập) tính đến hôm nay; hôm nay chưa học thì tính
+    # đến hôm qua. Đọc ngược theo khoá chính (user_id, day) từng trang, dừng ở ngày đứt chuỗi.
+    active = or_(daily.c.words_added > 0, daily.c.reviews > 0)
+    streak, expected, before = 0, None, day + datetime.timedelta(days=1)
+    while True:
+        days = (await db.execute(
+            select(daily.c.day)
+            .where(daily.c.user_id == user_id, daily.c.day < before, active)
+            .order_by(daily.c.day.desc())
+            .limit(STREAK_PAGE_SIZE)
+        )).scalars().all()
+        for current in days:
+            if expected is None and current >= day - datetime.timedelta(days=1):
+                expected = current
+            if current != expected:
+                return streak
+            streak += 1
+            expected -= datetime.timedelta(days=1)
+        if len(days) < STREAK_PAGE_SIZE:
+            return streak
+        before = days[-1]
+
+
+async def get_stats(db, user_id, days=30, now=None):
+    day = (now or datetime.datetime.utcnow()).date()
+    first = day - datetime.timedelta(days=days - 1)
+    categories = (await db.execute(
+        select(
+            user_categories.c.category, user_categories.c.word_count,
+            user_categories.c.favorite_count, user_categories.c.mastered_count,
+        )
+        .where(user_categories.c.user_id == user_id, user_categories.c.word_count > 0)
+        .order_by(user_categories.c.category)
+    )).all()
+    rows = (await db.execute(
+        select(daily.c.day, *(daily.c[name] for name in DAILY_COUNTERS))
+        .where(daily.c.user_id == user_id, daily.c.day >= first, daily.c.day <= day)
+    )).all()
+    by_day = {row.day: row for row in rows}
+    return {
+        "date": day,
+        "total_words": sum(row.word_count for row in categories),
+        "favorite_count": sum(row.favorite_count for row in categories),
+        "mastered_count": sum(row.mastered_count for row in categories),
+        "current_streak": await _current_streak(db, user_id, day),
+        "daily": [
+            {"day": current, **{name: getattr(by_day.get(current), name, 0) for name in DAILY_COUNTERS}}
+            for current in (first + datetime.timedelta(days=i) for i in range(days))
+        ],
+        "categories": [
+            {
+                "category": row.category, "word_count": row.word_count,
+                "favorite_count": row.favorite_count, "mastered_count": row.mastered_count,
+                "mastery": round(row.mastered_count / row.word_count, 4),
+            }
+            for row in categories
+        ],
+    }
+
+
+def _as_date(value):
+    # func.date trả về chuỗi 'YYYY-MM-DD' trên SQLite, date trên MySQL
+    return value if isinstance(value, datetime.date) else datetime.date.fromisoformat(value)
+
+
+async def rebuild_progress(db, user_ids, batch_size=1000):
+    # Dựng lại rollup thống kê của user_ids từ bảng gốc (caller commit). Lịch sử bảng gốc
+    # không giữ thì không dựng lại được: từ đã xoá, các lượt ôn trước lượt gần nhất của mỗi
+    # từ (chỉ last_reviewed_at còn lại; lượt đó tính là đúng nếu repetitions > 0).
+    counts = {}
+
+    def add(user_id, day, **values):
+        counts.setdefault((user_id, _as_date(day)), dict.fromkeys(DAILY_COUNTERS, 0)).update(values)
+
+    words = await db.execute(
+        select(VocabularyModel.owner_id, func.date(VocabularyModel.created_at), func.count())
+        .where(VocabularyModel.owner_id.in_(user_ids), VocabularyModel.created_at.isnot(None))
+        # Bản sao riêng của từ bộ từ giữ created_at của từ gốc, không phải từ mới thêm
+        .where(VocabularyModel.copied_from_id.is_(None))
+        .group_by(VocabularyModel.owner_id, func.date(VocabularyModel.created_at))
+    )
+    for user_id, day, count in words.all():
+        add(user_id, day, words_added=count)
+    favorites = await db.execute(
+        select(FavoriteModel.user_id, func.date(FavoriteModel.created_at), func.count())
+        .where(FavoriteModel.user_id.in_(user_ids), FavoriteModel.created_at.isnot(None))
+        .group_by(FavoriteModel.user_id, func.date(FavoriteModel.created_at))
+    )
+    for user_id, day, count in favorites.all():
+        add(user_id, day, favorites_added=count)
+    reviews = await db.execute(
+        select(
+            ReviewState.user_id, func.date(ReviewState.last_reviewed_at), func.count(),
+            func.sum(case((ReviewState.repetitions > 0, 1), else_=0)),
+        )
+        .where(ReviewState.user_id.in_(user_ids), ReviewState.last_reviewed_at.isnot(None))
+        .group_by(ReviewState.user_id, func.date(ReviewState.last_reviewed_at))
+    )
+    for user_id, day, count, correct in reviews.all():
+        add(user_id, day, reviews=count, reviews_correct=correct)
+
+    await db.execute(delete(daily).where(daily.c.user_id.in_(user_ids)))
+    days = [{"user_id": u, "day": d, **row} for (u, d), row in sorted(counts.items())]
+    for start in range(0, len(days), batch_size):
+        await db.execute(daily.insert(), days[start:start + batch_size])
+
+    await db.execute(
+        update(user_categories).where(user_categories.c.user_id.in_(user_ids))
+        .values(favorite_count=0, mastered_count=0)
+    )
+    flags = (
+        ("favorite_count", select(FavoriteModel.user_id, VocabularyModel.category, func.count())
+         .join(VocabularyModel, VocabularyModel.id == FavoriteModel.vocabulary_id)
+         .where(FavoriteModel.user_id.in_(user_ids))
+         .group_by(FavoriteModel.user_id, VocabularyModel.category)),
+        ("mastered_count", select(ReviewState.user_id, VocabularyModel.category, func.count())
+         .join(VocabularyModel, VocabularyModel.id == ReviewState.vocabulary_id)
+         .where(ReviewState.user_id.in_(user_ids), ReviewState.interval >= MASTERED_INTERVAL_DAYS)
+         .group_by(ReviewState.user_id, VocabularyModel.category)),
+    )
+    for column, query in flags:
+        rows = [
+            {"user_id": u, "category": c, column: n}
+            for u, c, n in (await db.execute(query)).all() if c is not None
+        ]
+        for start in range(0, len(rows), batch_size):
+            await upsert_increment(db, user_categories, ["user_id", "category"], rows[start:start + batch_size], [column])
+    return len(days)
@@ -0,0 +1,183 @@
+import os
+import random
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from models import Vocabulary as VocabularyModel
+from services.ttl_cache import TTLCache
+from services.visibility import select_visible, visible_to
+
+# Quiz trắc nghiệm: mỗi câu là nghĩa đúng + tối đa 3 nghĩa nhiễu cùng category.
+# Thay cho ORDER BY RAND() mỗi câu, giữ trong process một pool id theo (user, category):
+#   - dựng bằng một query (id, category) của user khi chưa có trong cache
+#   - cập nhật tăng dần sau commit các thao tác ghi qua services/vocab_writes.py
+#   - rút mẫu O(1) mỗi lần (random.sample trên list), sau đó một query IN (...) để lấy nội dung
+# Worker khác ghi thì pool ở đây thấy muộn nhất sau QUIZ_POOL_TTL_SECONDS; id đã bị xoá
+# ở worker khác được phát hiện lúc hydrate (thiếu dòng) và pool được dựng lại.
+
+QUIZ_POOL_MAX_USERS = int(os.getenv("QUIZ_POOL_MAX_USERS", "1000"))
+QUIZ_POOL_TTL_SECONDS = float(os.getenv("QUIZ_POOL_TTL_SECONDS", "300"))
+QUIZ_CHOICES = 4
+
+quiz_pools = TTLCache(maxsize=QUIZ_POOL_MAX_USERS, ttl=QUIZ_POOL_TTL_SECONDS)
+
+
+class IdPool:
+    # list để rút ngẫu nhiên theo chỉ số, dict id -> vị trí để thêm/xoá O(1) (swap với phần tử cuối)
+    def __init__(self):
+        self.ids = []
+        self.positions = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, vocab_id):
+        if vocab_id not in self.positions:
+            self.positions[vocab_id] = len(self.ids)
+            self.ids.append(vocab_id)
+
+    def remove(self, vocab_id):
+        position = self.positions.pop(vocab_id, None)
+        if position is None:
+            return
+        last = self.ids.pop()
+        if last != vocab_id:
+            self.ids[position] = last
+            self.positions[last] = position
+
+    def sample(self, k, exclude=(), rng=random):
+        # k id khác nhau, không nằm trong exclude (exclude nhỏ: lấy dư rồi lọc)
+        k = min(k, len(self.ids) - sum(1 for i in exclude if i in self.positions))
+        if k <= 0:
+            return []
+        picked = rng.sample(self.ids, min(len(self.ids), k + len(exclude)))
+        return [i for i in picked if i not in exclude][:k]
+
+
+class UserQuizPool:
+    def __init__(self, rows=()):
+        self.all = IdPool()
+        self.categories = {}
+        self.category_of = {}
+        for vocab_id, category in rows:
+            self.add(vocab_id, category)
+
+    def add(self, vocab_id, category):
+        self.remove(vocab_id)
+        self.all.add(vocab_id)
+        self.categories.setdefault(category, IdPool()).add(vocab_id)
+        self.category_of[vocab_id] = category
+
+    def remove(self, vocab_id):
+        if vocab_id not in self.category_of:
+            return
+        category = self.category_of.pop(vocab_id)
+        self.all.remove(vocab_id)
+        pool = self.categories[category]
+        pool.remove(vocab_id)
+        if not pool:
+            del self.categories[category]
+
+    def questions(self, category, n, rng=random):
+        pool = self.all if category is None else self.categories.get(category)
+        return pool.sample(n, rng=rng) if pool else []
+
+    def distractors(self, vocab_id, k=QUIZ_CHOICES - 1, rng=random):
+        # Ưu tiên cùng category; thiếu thì bù từ các category khác của user
+        picked = self.categories[self.category_of[vocab_id]].sample(k, exclude={vocab_id}, rng=rng)
+        if len(picked) < k:
+            picked += self.all.sample(k - len(picked), exclude={vocab_id, *picked}, rng=rng)
+        return picked
+
+
+async def get_quiz_pool(db, user_id):
+    pool = quiz_pools.get(user_id)
+    if pool is None:
+        # generation lấy trước query: nếu có commit xen giữa thì pool vừa dựng chỉ dùng cho request này
+        generation = quiz_pools.generation()
+        rows = (await db.execute(
+            select_visible(user_id, select(VocabularyModel.id, VocabularyModel.category), order_by=("id",))
+        )).all()
+        pool = UserQuizPool(rows)
+        quiz_pools.set(user_id, pool, generation=generation)
+    return pool
+
+
+async def build_quiz(db, user_id, category=None, n=10, rng=random):
+    # Trả về None nếu user có ít hơn 2 từ (không đủ để có lựa chọn sai)
+    for _ in range(2):
+        pool = await get_quiz_pool(db, user_id)
+        if len(pool.all) < 2:
+            return None
+        question_ids = pool.questions(category, n, rng=rng)
+        if not question_ids:
+            return []
+        choice_ids = {vocab_id: pool.distractors(vocab_id, rng=rng) for vocab_id in question_ids}
+        wanted = set(question_ids).union(*choice_ids.values())
+        rows = {row.id: row for row in (await db.execute(
+            select(VocabularyModel.id, VocabularyModel.word, VocabularyModel.meaning,
+                   VocabularyModel.example, VocabularyModel.category)
+            .where(VocabularyModel.id.in_(wanted), visible_to(user_id))
+        )).all()}
+        if len(rows) == len(wanted):
+            break
+        # Pool cũ hơn DB (từ bị xoá ở worker khác): dựng lại một lần
+        quiz_pools.invalidate(user_id)
+    questions = []
+    for vocab_id in question_ids:
+        row = rows.get(vocab_id)
+        if row is None:
+            continue
+        # Bỏ nghĩa nhiễu trùng nghĩa đúng hoặc trùng nhau để mỗi câu có đúng một đáp án
+        choices = [row.meaning]
+        for other in choice_ids[vocab_id]:
+            if other in rows and rows[other].meaning not in choices:
+                choices.append(rows[other].meaning)
+        rng.shuffle(choices)
+        questions.append({
+            "id": row.id,
+            "word": row.word,
+            "example": row.example,
+            "category": row.category,
+            "choices": choices,
+            "answer": choices.index(row.meaning),
+        })
+    return questions
+
+
+def record_added(db, user_id, vocab_id, category):
+    _changes(db).append(("add", user_id, vocab_id, category))
+
+
+def record_removed(db, user_id, vocab_id):
+    _changes(db).append(("remove", user_id, vocab_id, None))
+
+
+def record_reset(db, user_id):
+    # Insert hàng loạt không có id (executemany): bỏ pool, lần sau dựng lại
+    _changes(db).append(("reset", user_id, None, None))
+
+
+def _changes(db):
+    return db.sync_session.info.setdefault("quiz_pool_changes", [])
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_quiz_pool_changes(session):
+    for op, user_id, vocab_id, category in session.info.pop("quiz_pool_changes", ()):
+        if user_id is None:
+            continue
+        pool = quiz_pools.get(user_id) if op != "reset" else None
+        if pool is None:
+            # Chưa có pool (hoặc reset): tăng generation để pool đang dựng dở từ dữ liệu cũ không được lưu
+            quiz_pools.invalidate(user_id)
+            continue
+        if op == "add":
+            pool.add(vocab_id, category)
+        else:
+            pool.remove(vocab_id)
+        quiz_pools.bump_generation(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_quiz_pool_changes(session):
+    session.info.pop("quiz_pool_changes", None)
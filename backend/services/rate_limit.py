@@ -0,0 +1,154 @@
+import importlib
+import logging
+import math
+import os
+import threading
+import time
+
+# Token bucket: mỗi key có tối đa `capacity` token, hồi `capacity / period` token mỗi giây;
+# mỗi request lấy một token, hết token thì bị từ chối kèm thời gian chờ (Retry-After).
+# Trạng thái một key chỉ là (tokens, thời điểm cập nhật) nên mỗi quyết định là O(1).
+#
+# Backend lưu trạng thái:
+#   MemoryBackend  dict chia shard trong process (mặc định); mỗi worker có hạn mức riêng
+#   RedisBackend   dùng chung giữa các worker; client chỉ cần `await eval(script, numkeys, *args)`
+#                  (redis.asyncio.Redis, hoặc bản giả trong test)
+
+logger = logging.getLogger("vocab.rate_limit")
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") != "0"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+# Chỉ bật khi app đứng sau reverse proxy tin cậy, nếu không client tự đặt được IP
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "0") == "1"
+
+
+def parse_rate(value):
+    # "20/60" -> 20 request mỗi 60 giây (cũng là burst tối đa)
+    count, _, period = value.partition("/")
+    return int(count), float(period or 60)
+
+
+class RateLimitRule:
+    def __init__(self, name, capacity, period):
+        self.name = name
+        self.capacity = capacity
+        self.rate = capacity / period
+
+    @classmethod
+    def from_env(cls, name, env, default):
+        return cls(name, *parse_rate(os.getenv(env, default)))
+
+
+class MemoryBackend:
+    def __init__(self, shards=64, max_keys=100000):
+        # Mỗi shard một dict + lock riêng: thread khác nhau hiếm khi tranh cùng lock
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+        self._max_per_shard = max(1, max_keys // shards)
+
+    async def take(self, key, capacity, rate, now, cost=1):
+        return self.take_sync(key, capacity, rate, now, cost)
+
+    def take_sync(self, key, capacity, rate, now, cost=1):
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            state = buckets.pop(key, None)
+            if state is None:
+                tokens = capacity
+                if len(buckets) >= self._max_per_shard:
+                    # Bỏ key lâu không dùng nhất (dict giữ thứ tự chèn, key vừa dùng được chèn lại cuối)
+                    del buckets[next(iter(buckets))]
+            else:
+                tokens = min(capacity, state[0] + max(0.0, now - state[1]) * rate)
+            if tokens >= cost:
+                tokens -= cost
+                retry_after = 0.0
+            else:
+                retry_after = (cost - tokens) / rate
+            buckets[key] = (tokens, now)
+        return retry_after == 0.0, retry_after
+
+    def clear(self):
+        for buckets, lock in self._shards:
+            with lock:
+                buckets.clear()
+
+
+# Cùng thuật toán với MemoryBackend, chạy nguyên tử trong Redis. Key tự hết hạn khi
+# bucket đã đầy lại. Số thực trả về dạng chuỗi (Redis cắt số Lua thành integer).
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+if tokens == nil then
+  tokens = capacity
+else
+  tokens = math.min(capacity, tokens + math.max(0, now - tonumber(state[2])) * rate)
+end
+local retry_after = 0
+if tokens >= cost then
+  tokens = tokens - cost
+else
+  retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisBackend:
+    def __init__(self, client, prefix="ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url):
+        # redis là dependency tuỳ chọn, chỉ cần khi đặt RATE_LIMIT_REDIS_URL
+        return cls(importlib.import_module("redis.asyncio").from_url(url))
+
+    async def take(self, key, capacity, rate, now, cost=1):
+        result = await self.client.eval(TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, capacity, rate, now, cost)
+        retry_after = float(result.decode() if isinstance(result, bytes) else result)
+        return retry_after == 0.0, retry_after
+
+
+class RateLimiter:
+    def __init__(self, backend, enabled=True, clock=time.time):
+        self.backend = backend
+        self.enabled = enabled
+        self.clock = clock
+
+    async def hit(self, rule, identity):
+        # Trả về số giây cần chờ (0 nếu được phép)
+        if not self.enabled:
+            return 0.0
+        try:
+            allowed, retry_after = await self.backend.take(
+                f"{rule.name}:{identity}", rule.capacity, rule.rate, self.clock()
+            )
+        except Exception:
+            # Backend (Redis) lỗi: cho qua thay vì khoá đăng nhập của mọi người
+            logger.warning("rate limit backend unavailable", exc_info=True)
+            return 0.0
+        return 0.0 if allowed else max(1, math.ceil(retry_after))
+
+
+def client_ip(request):
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+rate_limiter = RateLimiter(
+    RedisBackend.from_url(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else MemoryBackend(),
+    enabled=RATE_LIMIT_ENABLED,
+)
+
+LOGIN_PER_IP = RateLimitRule.from_env("login_ip", "LOGIN_RATE_LIMIT_PER_IP", "20/60")
+LOGIN_PER_ACCOUNT = RateLimitRule.from_env("login_account", "LOGIN_RATE_LIMIT_PER_ACCOUNT", "5/60")
+REGISTER_PER_IP = RateLimitRule.from_env("register_ip", "REGISTER_RATE_LIMIT_PER_IP", "10/3600")
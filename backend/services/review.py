@@ -0,0 +1,129 @@
+import datetime
+from sqlalchemy import and_, delete, exists, func, insert, literal, select
+from sqlalchemy.orm import aliased, contains_eager
+from models import DeckSubscription, ReviewState, Vocabulary as VocabularyModel
+from services.category_counts import adjust_category_counts
+from services.progress import is_mastered, record_activity
+
+# Lập lịch ôn tập kiểu SM-2 (SuperMemo 2). Điểm 0-5; dưới 3 là quên, thẻ học lại từ đầu.
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_GRADE = 3
+
+
+def sm2(ease, interval, repetitions, grade):
+    # Trả về (ease, interval, repetitions) mới; interval tính theo ngày
+    if grade < PASSING_GRADE:
+        repetitions, interval = 0, 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = max(1, round(interval * ease))
+    ease = max(MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+    return ease, interval, repetitions
+
+
+def new_review_state(user_id, vocabulary):
+    # Thẻ mới đến hạn ngay, theo thứ tự được thêm vào
+    return ReviewState(
+        user_id=user_id, vocabulary_id=vocabulary.id, ease=DEFAULT_EASE, interval=0, repetitions=0,
+        due_at=vocabulary.created_at or datetime.datetime.utcnow(),
+    )
+
+
+async def add_missing_review_states(db, user_id=None, min_vocabulary_id=0):
+    # INSERT ... SELECT cho các từ chưa có review_state (sau bulk insert hoặc backfill dữ liệu cũ).
+    # min_vocabulary_id giới hạn range scan theo khoá chính ở phần vừa insert.
+    table = ReviewState.__table__
+    query = select(
+        VocabularyModel.owner_id, VocabularyModel.id, literal(DEFAULT_EASE), literal(0), literal(0),
+        func.coalesce(VocabularyModel.created_at, func.now()),
+    ).where(
+        VocabularyModel.owner_id.is_not(None),
+        VocabularyModel.id > min_vocabulary_id,
+        ~exists().where(and_(
+            table.c.user_id == VocabularyModel.owner_id,
+            table.c.vocabulary_id == VocabularyModel.id,
+        )),
+    )
+    if user_id is not None:
+        query = query.where(VocabularyModel.owner_id == user_id)
+    result = await db.execute(insert(table).from_select(
+        ["user_id", "vocabulary_id", "ease", "interval", "repetitions", "due_at"], query
+    ))
+    return result.rowcount
+
+
+async def add_deck_review_states(db, deck_id=None, user_ids=None):
+    # Như trên cho từ của bộ từ dùng chung: mỗi người đăng ký một review_state cho từng từ của
+    # bộ từ (trừ từ đã có bản sao riêng, lịch ôn nằm ở bản sao). Gọi khi đăng ký, khi bộ từ
+    # thêm từ (user_ids: lô người đăng ký) và khi backfill.
+    table = ReviewState.__table__
+    subscriptions = DeckSubscription.__table__
+    copy = aliased(VocabularyModel)
+    query = select(
+        subscriptions.c.user_id, VocabularyModel.id, literal(DEFAULT_EASE), literal(0), literal(0),
+        func.coalesce(VocabularyModel.created_at, func.now()),
+    ).join(
+        VocabularyModel, VocabularyModel.deck_id == subscriptions.c.deck_id,
+    ).where(
+        ~exists().where(and_(
+            table.c.user_id == subscriptions.c.user_id,
+            table.c.vocabulary_id == VocabularyModel.id,
+        )),
+        ~exists().where(copy.owner_id == subscriptions.c.user_id, copy.copied_from_id == VocabularyModel.id),
+    )
+    if deck_id is not None:
+        query = query.where(subscriptions.c.deck_id == deck_id)
+    if user_ids is not None:
+        query = query.where(subscriptions.c.user_id.in_(user_ids))
+    result = await db.execute(insert(table).from_select(
+        ["user_id", "vocabulary_id", "ease", "interval", "repetitions", "due_at"], query
+    ))
+    return result.rowcount
+
+
+async def delete_review_states(db, vocabulary_ids):
+    await db.execute(delete(ReviewState).where(ReviewState.vocabulary_id.in_(vocabulary_ids)))
+
+
+async def get_due_cards(db, user_id, limit, now=None):
+    # Range scan trên ix_review_state_user_due rồi lookup từ theo khoá chính
+    now = now or datetime.datetime.utcnow()
+    result = await db.execute(
+        select(ReviewState)
+        .join(ReviewState.vocabulary)
+        .options(contains_eager(ReviewState.vocabulary))
+        .where(ReviewState.user_id == user_id, ReviewState.due_at <= now)
+        .order_by(ReviewState.due_at, ReviewState.vocabulary_id)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def record_review(db, user_id, vocabulary_id, grade, now=None):
+    # Trả về None nếu thẻ không thuộc user
+    now = now or datetime.datetime.utcnow()
+    state = await db.get(ReviewState, (user_id, vocabulary_id))
+    if state is None:
+        return None
+    was_mastered = is_mastered(state.interval)
+    state.ease, state.interval, state.repetitions = sm2(state.ease, state.interval, state.repetitions, grade)
+    state.due_at = now + datetime.timedelta(days=state.interval)
+    state.last_reviewed_at = now
+    await db.flush()
+    # Rollup thống kê học tập (services/progress.py)
+    if is_mastered(state.interval) != was_mastered:
+        category = (await db.execute(
+            select(VocabularyModel.category).where(VocabularyModel.id == vocabulary_id)
+        )).scalar_one()
+        await adjust_category_counts(db, user_id, {category: 1 if not was_mastered else -1}, "mastered_count")
+    await record_activity(
+        db, user_id, day=now.date(), reviews=1, reviews_correct=int(grade >= PASSING_GRADE)
+    )
+    return state
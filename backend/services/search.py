@@ -0,0 +1,88 @@
+import re
+from sqlalchemy import Float, Integer, desc, or_, select, text
+from models import Vocabulary as VocabularyModel
+from services.visibility import subscribed_deck_ids, visible_to
+
+# Tìm kiếm full-text trên word/meaning/example.
+# Chỉ mục được tạo cùng bảng vocabularies (xem models.py):
+#   - SQLite: bảng ảo FTS5 vocabularies_fts, xếp hạng bằng bm25 (word nặng nhất)
+#   - MySQL: FULLTEXT ft_vocabularies_text, MATCH ... AGAINST (BOOLEAN MODE)
+# Dialect khác dùng LIKE (không có chỉ mục, chỉ để chạy được).
+# Kết quả gồm từ riêng và từ của các bộ từ đã đăng ký (trừ từ đã có bản sao riêng), lọc
+# bằng services/visibility.visible_to rồi mới sắp xếp và cắt trang.
+
+MAX_SEARCH_LIMIT = 100
+# Trọng số bm25 theo cột của vocabularies_fts: word, meaning, example, owner_key
+FTS_WEIGHTS = "10.0, 2.0, 1.0, 0.0"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fold(value):
+    # "đ" không phải dấu theo Unicode nên tokenizer không bỏ được; chỉ mục cũng lưu dạng đã đổi
+    return value.replace("đ", "d").replace("Đ", "D")
+
+
+def tokenize(q):
+    return TOKEN_RE.findall(fold(q))
+
+
+def fts5_query(owner_id, deck_ids, tokens, prefix):
+    # owner_key: 'u<owner_id>' cho từ riêng, 'd<deck_id>' cho từ của bộ từ (models.py)
+    suffix = "*" if prefix else ""
+    terms = " AND ".join(f'"{token}"{suffix}' for token in tokens)
+    keys = " OR ".join([f"u{owner_id}"] + [f"d{deck_id}" for deck_id in deck_ids])
+    return f"owner_key : ({keys}) AND {{word meaning example}} : ({terms})"
+
+
+def boolean_query(tokens, prefix):
+    suffix = "*" if prefix else ""
+    return " ".join(f"+{token}{suffix}" for token in tokens)
+
+
+async def search_vocabularies(db, owner_id, q, prefix=True, limit=20, offset=0):
+    # Lấy thừa 1 dòng để biết còn trang sau hay không
+    tokens = tokenize(q)
+    if not tokens:
+        return [], None
+    dialect_name = db.bind.dialect.name
+    query = select(VocabularyModel).where(visible_to(owner_id))
+    paged = False
+
+    if dialect_name == "sqlite":
+        deck_ids = (await db.execute(subscribed_deck_ids(owner_id))).scalars().all()
+        statement = (
+            f"SELECT rowid, bm25(vocabularies_fts, {FTS_WEIGHTS}) AS rank FROM vocabularies_fts"
+            " WHERE vocabularies_fts MATCH :q"
+        )
+        params = {"q": fts5_query(owner_id, deck_ids, tokens, prefix)}
+        if not deck_ids:
+            # Chỉ có từ riêng: mọi hit đều thấy được, cắt trang ngay trong truy vấn FTS
+            statement += " ORDER BY rank LIMIT :limit OFFSET :offset"
+            params.update(limit=limit + 1, offset=offset)
+            query = select(VocabularyModel).where(VocabularyModel.owner_id == owner_id)
+            paged = True
+        # Có bộ từ: từ gốc đã có bản sao riêng vẫn khớp owner_key nhưng bị visible_to loại,
+        # nên cắt trang sau khi lọc
+        hits = text(statement).bindparams(**params).columns(rowid=Integer, rank=Float).subquery("hits")
+        query = query.join(hits, VocabularyModel.id == hits.c.rowid).order_by(hits.c.rank, VocabularyModel.id)
+    elif dialect_name == "mysql":
+        match = text(
+            "MATCH (vocabularies.word, vocabularies.meaning, vocabularies.example) AGAINST (:q IN BOOLEAN MODE)"
+        ).bindparams(q=boolean_query(tokens, prefix))
+        query = query.where(match).order_by(desc(match), VocabularyModel.id)
+    else:
+        for token in tokens:
+            query = query.where(or_(
+                VocabularyModel.word.ilike(f"%{token}%"),
+                VocabularyModel.meaning.ilike(f"%{token}%"),
+                VocabularyModel.example.ilike(f"%{token}%"),
+            ))
+        query = query.order_by(VocabularyModel.word, VocabularyModel.id)
+
+    if not paged:
+        query = query.limit(limit + 1).offset(offset)
+    result = await db.execute(query)
+    vocabularies = result.scalars().all()
+    next_offset = offset + limit if len(vocabularies) > limit else None
+    return vocabularies[:limit], next_offset
@@ -0,0 +1,26 @@
+import orjson
+from fastapi.responses import ORJSONResponse
+from models import Vocabulary as VocabularyModel
+
+# Đường trả danh sách từ nhanh: select đúng các cột cần (tuple, không dựng ORM object)
+# rồi encode thẳng bằng orjson, bỏ qua bước validate từng dòng qua VocabularySchema.
+# Khoá theo đúng thứ tự field của VocabularySchema để wire format không đổi.
+
+VOCABULARY_FIELDS = ("word", "meaning", "example", "category", "id", "owner_id", "created_at", "deck_id")
+VOCABULARY_COLUMNS = tuple(getattr(VocabularyModel, field) for field in VOCABULARY_FIELDS)
+
+
+def vocabulary_dicts(rows):
+    return [dict(zip(VOCABULARY_FIELDS, row)) for row in rows]
+
+
+class FastJSONResponse(ORJSONResponse):
+    # pydantic v2 ghi datetime UTC dạng "Z", orjson mặc định "+00:00"
+    def render(self, content):
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def json_response(content, response=None):
+    # response: Response do FastAPI inject (mang ETag/Cache-Control đã set)
+    headers = dict(response.headers) if response is not None else None
+    return FastJSONResponse(content, headers=headers)
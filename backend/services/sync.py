@@ -0,0 +1,183 @@
+import base64
+import datetime
+import heapq
+import json
+import os
+from sqlalchemy import bindparam, delete, func, insert, or_, select, update
+from models import Favorite as FavoriteModel
+from models import SyncTombstone
+from models import User as UserModel
+from models import Vocabulary as VocabularyModel
+from services.serialization import VOCABULARY_COLUMNS, VOCABULARY_FIELDS
+from services.visibility import select_visible
+
+# Đồng bộ tăng dần cho client offline (GET /api/vocab/sync).
+# Mỗi transaction ghi dữ liệu của user nhận một seq = users.data_version mới
+# (bump_data_version); vocabularies.sync_seq / favorites.sync_seq là seq của lần ghi gần nhất,
+# thao tác xoá để lại một dòng sync_tombstones cùng seq. Thay đổi sau seq S là ba range scan
+# (user, seq) trên chỉ mục, nên payload tỉ lệ với số thay đổi chứ không với số từ.
+#
+# Phân trang: thay đổi từ ba nguồn được trộn theo khoá (seq, nguồn, id); cursor giữ khoá của
+# phần tử cuối. Client áp dụng theo thứ tự trả về và lưu "seq" của trang cuối làm since lần sau.
+# since nhỏ hơn users.sync_floor (tombstone cần thiết đã bị dọn) hoặc không có since:
+# trả ảnh chụp đầy đủ với reset = true ở trang đầu (client xoá dữ liệu cục bộ trước khi áp dụng).
+# Từ của bộ từ dùng chung chỉ có trong ảnh chụp: đăng ký / huỷ / bộ từ đổi đều nâng sync_floor.
+
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+KIND_VOCABULARY = "vocabulary"
+KIND_FAVORITE = "favorite"
+
+# Thứ tự giữa các nguồn khi cùng seq
+RANK_VOCABULARY, RANK_FAVORITE, RANK_DELETED = 0, 1, 2
+RANK_END = 3
+
+tombstones = SyncTombstone.__table__
+users = UserModel.__table__
+
+
+async def add_tombstones(db, user_id, kind, object_ids, seq):
+    if user_id is None or not object_ids:
+        return
+    now = datetime.datetime.utcnow()
+    await db.execute(insert(tombstones), [
+        {"user_id": user_id, "kind": kind, "object_id": object_id, "seq": seq, "deleted_at": now}
+        for object_id in object_ids
+    ])
+
+
+def encode_sync_cursor(position, tombstones_after, snapshot):
+    raw = json.dumps([*position, tombstones_after, int(snapshot)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor):
+    # ValueError nếu cursor hỏng
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        seq, rank, object_id, tombstones_after, snapshot = json.loads(raw)
+        return (int(seq), int(rank), int(object_id)), int(tombstones_after), bool(snapshot)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _after(seq_column, id_column, rank, position):
+    # Khoá (seq, rank, id) của nguồn này lớn hơn position
+    after_seq, after_rank, after_id = position
+    if rank < after_rank:
+        return seq_column > after_seq
+    if rank > after_rank:
+        return seq_column >= after_seq
+    return or_(seq_column > after_seq, (seq_column == after_seq) & (id_column > after_id))
+
+
+async def _vocabulary_changes(db, user_id, position, limit, snapshot):
+    query = (
+        select(VocabularyModel.sync_seq, *VOCABULARY_COLUMNS)
+        .where(_after(VocabularyModel.sync_seq, VocabularyModel.id, RANK_VOCABULARY, position))
+    )
+    if snapshot:
+        stmt = select_visible(user_id, query, order_by=("sync_seq", "id"), limit=limit)
+    else:
+        stmt = (
+            query.where(VocabularyModel.owner_id == user_id)
+            .order_by(VocabularyModel.sync_seq, VocabularyModel.id)
+            .limit(limit)
+        )
+    rows = (await db.execute(stmt)).all()
+    return [
+        ((row.sync_seq, RANK_VOCABULARY, row.id), {
+            "op": "upsert", "type": KIND_VOCABULARY, "seq": row.sync_seq,
+            "data": dict(zip(VOCABULARY_FIELDS, row[1:])),
+        })
+        for row in rows
+    ]
+
+
+async def _favorite_changes(db, user_id, position, limit):
+    rows = (await db.execute(
+        select(FavoriteModel.sync_seq, FavoriteModel.id, FavoriteModel.vocabulary_id)
+        .where(FavoriteModel.user_id == user_id)
+        .where(_after(FavoriteModel.sync_seq, FavoriteModel.id, RANK_FAVORITE, position))
+        .order_by(FavoriteModel.sync_seq, FavoriteModel.id)
+        .limit(limit)
+    )).all()
+    return [
+        ((seq, RANK_FAVORITE, favorite_id),
+         {"op": "upsert", "type": KIND_FAVORITE, "seq": seq, "id": vocabulary_id})
+        for seq, favorite_id, vocabulary_id in rows
+    ]
+
+
+async def _deleted(db, user_id, position, tombstones_after, limit):
+    rows = (await db.execute(
+        select(tombstones.c.seq, tombstones.c.id, tombstones.c.kind, tombstones.c.object_id)
+        .where(tombstones.c.user_id == user_id, tombstones.c.seq > tombstones_after)
+        .where(_after(tombstones.c.seq, tombstones.c.id, RANK_DELETED, position))
+        .order_by(tombstones.c.seq, tombstones.c.id)
+        .limit(limit)
+    )).all()
+    return [
+        ((seq, RANK_DELETED, tombstone_id), {"op": "delete", "type": kind, "seq": seq, "id": object_id})
+        for seq, tombstone_id, kind, object_id in rows
+    ]
+
+
+async def read_changes(db, user_id, since=None, cursor=None, limit=500):
+    # Version đọc cùng session với dữ liệu (không qua cache): trên replica, version và
+    # các dòng trả về cùng một thời điểm, client không bỏ sót thay đổi
+    version, floor = (await db.execute(
+        select(users.c.data_version, users.c.sync_floor).where(users.c.id == user_id)
+    )).one()
+    snapshot = since is None or since < floor
+    position = None
+    if cursor is not None:
+        position, tombstones_after, cursor_snapshot = decode_sync_cursor(cursor)
+        if snapshot and not cursor_snapshot:
+            # Tombstone bị dọn giữa hai trang: bắt đầu lại bằng ảnh chụp đầy đủ
+            position = None
+        else:
+            snapshot = cursor_snapshot
+    reset = position is None and snapshot
+    if position is None:
+        # Ảnh chụp: mọi dòng còn sống, cộng các lần xoá xảy ra trong lúc client phân trang
+        position = (-1 if snapshot else since, RANK_END, 0)
+        tombstones_after = version if snapshot else since
+
+    sources = [
+        await _vocabulary_changes(db, user_id, position, limit + 1, snapshot),
+        await _favorite_changes(db, user_id, position, limit + 1),
+        await _deleted(db, user_id, position, tombstones_after, limit + 1),
+    ]
+    merged = list(heapq.merge(*sources, key=lambda change: change[0]))
+    page = merged[:limit]
+    next_cursor = None
+    if len(merged) > limit:
+        next_cursor = encode_sync_cursor(page[-1][0], tombstones_after, snapshot)
+    return {
+        "changes": [change for _, change in page],
+        "reset": reset,
+        "seq": version,
+        "next_cursor": next_cursor,
+    }
+
+
+async def compact_tombstones(db, older_than_days=SYNC_TOMBSTONE_RETENTION_DAYS, user_id=None):
+    # Xoá tombstone cũ; sync_floor của user nâng lên seq lớn nhất bị xoá để client có since
+    # cũ hơn được yêu cầu tải lại toàn bộ. Một transaction, caller commit.
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=older_than_days)
+    condition = tombstones.c.deleted_at < cutoff
+    if user_id is not None:
+        condition = condition & (tombstones.c.user_id == user_id)
+    floors = (await db.execute(
+        select(tombstones.c.user_id, func.max(tombstones.c.seq)).where(condition).group_by(tombstones.c.user_id)
+    )).all()
+    if not floors:
+        return 0
+    await db.execute(
+        update(users)
+        .where(users.c.id == bindparam("uid"), users.c.sync_floor < bindparam("floor"))
+        .values(sync_floor=bindparam("floor")),
+        [{"uid": uid, "floor": floor} for uid, floor in floors],
+    )
+    return (await db.execute(delete(tombstones).where(condition))).rowcount
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry TTL and per-key invalidation generations."""
+
+    # Chống ghi đè bằng dữ liệu cũ: lấy generation() trước khi đọc DB rồi truyền vào set();
+    # nếu key đó bị invalidate / bump_generation xen giữa thì set() bị từ chối. Mốc invalidate
+    # lưu theo key nên thao tác trên key khác không làm hỏng set() đang dở. Bảng mốc có giới
+    # hạn: mốc bị đẩy ra nâng _floor, set() với generation cũ hơn _floor bị từ chối (an toàn,
+    # chỉ tốn thêm một lần đọc DB).
+
+    def __init__(self, maxsize=10000, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._invalidated = OrderedDict()
+        self._counter = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self):
+        with self._lock:
+            return self._counter
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, generation=None):
+        # generation lấy trước khi query DB; nếu key đã bị invalidate xen giữa
+        # thì giá trị vừa đọc có thể đã cũ -> không ghi vào cache
+        with self._lock:
+            if generation is not None and (
+                generation < self._floor or self._invalidated.get(key, -1) > generation
+            ):
+                return False
+            self._data[key] = (value, self._clock() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def _mark(self, key):
+        self._counter += 1
+        self._invalidated[key] = self._counter
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.maxsize:
+            _, stamp = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, stamp)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._mark(key)
+            self.invalidations += 1
+            self._data.pop(key, None)
+
+    def bump_generation(self, key):
+        # Entry của key đã được cập nhật tại chỗ: chặn các set() đang dở dùng dữ liệu đọc trước đó
+        with self._lock:
+            self._mark(key)
+
+    def clear(self):
+        with self._lock:
+            self._counter += 1
+            self._floor = self._counter
+            self._invalidated.clear()
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,46 @@
+import importlib
+
+# INSERT ... ON CONFLICT/ON DUPLICATE KEY theo dialect của session.
+# Module dialect import khi dùng lần đầu (dialect postgresql tốn ~45 ms lúc khởi động worker)
+_INSERT_MODULES = {
+    "mysql": "sqlalchemy.dialects.mysql",
+    "mariadb": "sqlalchemy.dialects.mysql",
+    "postgresql": "sqlalchemy.dialects.postgresql",
+    "sqlite": "sqlalchemy.dialects.sqlite",
+}
+
+
+def dialect_insert(db, table):
+    name = db.bind.dialect.name
+    if name not in _INSERT_MODULES:
+        raise NotImplementedError(f"Upsert is not supported on {name}")
+    return importlib.import_module(_INSERT_MODULES[name]).insert(table)
+
+
+async def upsert_increment(db, table, keys, rows, counters):
+    # Cộng dồn các cột counters vào dòng có cùng khoá keys (tạo mới nếu chưa có).
+    # Một câu lệnh, nguyên tử theo từng dòng nên an toàn khi ghi đồng thời.
+    if not rows:
+        return
+    stmt = dialect_insert(db, table).values(rows)
+    if db.bind.dialect.name in ("mysql", "mariadb"):
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in counters})
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys,
+            set_={c: table.c[c] + stmt.excluded[c] for c in counters},
+        )
+    await db.execute(stmt)
+
+
+async def insert_ignore(db, table, keys, rows):
+    # INSERT nhiều dòng, bỏ qua dòng trùng unique keys (dòng đã có hoặc do request khác vừa thêm)
+    if not rows:
+        return
+    stmt = dialect_insert(db, table).values(rows)
+    if db.bind.dialect.name in ("mysql", "mariadb"):
+        # Không dùng INSERT IGNORE: nó nuốt cả lỗi khác (FK, cắt chuỗi)
+        stmt = stmt.on_duplicate_key_update({keys[0]: stmt.inserted[keys[0]]})
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=keys)
+    await db.execute(stmt)
@@ -0,0 +1,43 @@
+from sqlalchemy import and_, exists, or_, select, union_all
+from sqlalchemy.orm import aliased
+from models import DeckSubscription
+from models import Vocabulary as VocabularyModel
+
+# Từ user thấy = từ riêng ∪ từ của các bộ từ đã đăng ký chưa có bản sao riêng (services/decks.py).
+# Tách khỏi decks.py để quiz/sync/batch dùng được mà không import vòng.
+
+
+def subscribed_deck_ids(user_id):
+    return select(DeckSubscription.deck_id).where(DeckSubscription.user_id == user_id)
+
+
+def deck_words_visible_to(user_id, vocabulary=VocabularyModel):
+    copy = aliased(VocabularyModel)
+    return and_(
+        vocabulary.deck_id.in_(subscribed_deck_ids(user_id)),
+        ~exists().where(copy.owner_id == user_id, copy.copied_from_id == vocabulary.id),
+    )
+
+
+def visible_to(user_id, vocabulary=VocabularyModel):
+    # Cho truy vấn theo id (IN / khoá chính); danh sách dài dùng select_visible
+    return or_(vocabulary.owner_id == user_id, deck_words_visible_to(user_id, vocabulary))
+
+
+def select_visible(user_id, query, order_by=("created_at", "id"), limit=None, offset=0):
+    # query: select các cột của VocabularyModel (phải gồm cột order_by) với filter/cursor
+    # riêng, chưa lọc theo user. Mỗi nhánh tự sắp xếp và cắt limit + offset dòng.
+    order = [getattr(VocabularyModel, column) for column in order_by]
+    branches = []
+    for condition in (VocabularyModel.owner_id == user_id, deck_words_visible_to(user_id)):
+        branch = query.where(condition).order_by(*order)
+        if limit is not None:
+            branch = branch.limit(limit + offset)
+        branches.append(select(branch.subquery()))
+    merged = union_all(*branches).subquery()
+    stmt = select(merged).order_by(*(merged.c[column] for column in order_by))
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
@@ -0,0 +1,172 @@
+from collections import Counter
+from sqlalchemy import and_, delete, func, insert, select, update
+from models import Favorite as FavoriteModel
+from models import ReviewState
+from models import Vocabulary as VocabularyModel
+from services.category_counts import adjust_category_counts
+from services.data_version import bump_data_version
+from services.progress import forget_words, recategorize, record_activity
+from services.quiz import record_added, record_removed, record_reset
+from services.review import add_missing_review_states, delete_review_states, new_review_state
+from services.sync import KIND_FAVORITE, KIND_VOCABULARY, add_tombstones
+from services.upsert import insert_ignore
+
+# Mọi thao tác ghi vào vocabularies và favorites đi qua đây để các bảng phụ (rollup, review_state,
+# users.data_version, seq/tombstone đồng bộ, ...) được cập nhật trong cùng transaction.
+# Caller chịu trách nhiệm commit. bump_data_version chạy trước để lấy seq của transaction.
+
+
+async def create_vocabulary(db, owner_id, data):
+    seq = await bump_data_version(db, owner_id)
+    vocabulary = VocabularyModel(**data, owner_id=owner_id, sync_seq=seq or 0)
+    db.add(vocabulary)
+    await db.flush()
+    await adjust_category_counts(db, owner_id, {vocabulary.category: 1})
+    if owner_id is not None:
+        db.add(new_review_state(owner_id, vocabulary))
+        await record_activity(db, owner_id, words_added=1)
+    record_added(db, owner_id, vocabulary.id, vocabulary.category)
+    return vocabulary
+
+
+async def update_vocabulary(db, user_id, vocabulary, data):
+    # vocabulary: từ user thấy (đã kiểm tra bằng decks.visible_to). Từ riêng sửa tại chỗ;
+    # từ của bộ từ dùng chung thì tạo bản sao riêng (copy-on-write) giữ nguyên created_at,
+    # chuyển yêu thích / lịch ôn sang bản sao, từ gốc ẩn với user này. Trả về dòng sau khi sửa.
+    seq = await bump_data_version(db, user_id)
+    await recategorize(db, user_id, vocabulary.id, vocabulary.category, data.get("category", vocabulary.category))
+    deltas = Counter({vocabulary.category: -1})
+    if vocabulary.owner_id == user_id:
+        for field, value in data.items():
+            setattr(vocabulary, field, value)
+        vocabulary.sync_seq = seq
+        await db.flush()
+        deltas[vocabulary.category] += 1
+        await adjust_category_counts(db, user_id, deltas)
+        record_added(db, user_id, vocabulary.id, vocabulary.category)
+        return vocabulary
+
+    copy = VocabularyModel(
+        **data, owner_id=user_id, copied_from_id=vocabulary.id, created_at=vocabulary.created_at, sync_seq=seq,
+    )
+    db.add(copy)
+    await db.flush()
+    deltas[copy.category] += 1
+    await adjust_category_counts(db, user_id, deltas)
+    await db.execute(
+        update(FavoriteModel)
+        .where(FavoriteModel.user_id == user_id, FavoriteModel.vocabulary_id == vocabulary.id)
+        .values(vocabulary_id=copy.id, sync_seq=seq)
+    )
+    moved = (await db.execute(
+        update(ReviewState)
+        .where(ReviewState.user_id == user_id, ReviewState.vocabulary_id == vocabulary.id)
+        .values(vocabulary_id=copy.id)
+    )).rowcount
+    if not moved:
+        db.add(new_review_state(user_id, copy))
+    record_removed(db, user_id, vocabulary.id)
+    record_added(db, user_id, copy.id, copy.category)
+    # Client xoá từ gốc (và yêu thích của nó) khi nhận tombstone, rồi nhận bản sao cùng seq
+    await add_tombstones(db, user_id, KIND_VOCABULARY, [vocabulary.id], seq)
+    return copy
+
+
+async def insert_vocabularies(db, owner_id, rows, deck_id=None):
+    # rows: list dict đã validate; insert bằng executemany (deck_id: từ của bộ từ dùng chung, owner_id None).
+    # Trả về mốc id: các từ vừa thêm là từ của owner có id lớn hơn mốc (theo thứ tự rows),
+    # vì bump_data_version đã khoá dòng users nên không có insert nào khác của owner chen vào.
+    if not rows:
+        return None
+    seq = await bump_data_version(db, owner_id)
+    # executemany không trả về id (MySQL không có RETURNING): lấy mốc id trước khi insert
+    # để tạo review_state cho phần vừa thêm bằng một INSERT ... SELECT
+    watermark = (await db.execute(select(func.max(VocabularyModel.id)))).scalar() or 0
+    await db.execute(insert(VocabularyModel.__table__), [
+        {**row, "owner_id": owner_id, "deck_id": deck_id, "sync_seq": seq or 0} for row in rows
+    ])
+    await adjust_category_counts(db, owner_id, Counter(row["category"] for row in rows))
+    if owner_id is not None:
+        await add_missing_review_states(db, owner_id, watermark)
+        await record_activity(db, owner_id, words_added=len(rows))
+    record_reset(db, owner_id)
+    return watermark
+
+
+async def delete_vocabulary(db, vocabulary):
+    await delete_vocabularies(db, vocabulary.owner_id, [vocabulary])
+
+
+async def delete_vocabularies(db, owner_id, vocabularies):
+    # vocabularies: các dòng có .id và .category, đã kiểm tra thuộc owner.
+    # Mục yêu thích của từ bị xoá theo (client bỏ yêu thích khi nhận tombstone của từ).
+    if not vocabularies:
+        return
+    seq = await bump_data_version(db, owner_id)
+    ids = [vocabulary.id for vocabulary in vocabularies]
+    await forget_words(db, owner_id, VocabularyModel.id.in_(ids))
+    await delete_review_states(db, ids)
+    await db.execute(delete(FavoriteModel).where(FavoriteModel.vocabulary_id.in_(ids)))
+    await db.execute(delete(VocabularyModel).where(VocabularyModel.id.in_(ids)))
+    removed = Counter(vocabulary.category for vocabulary in vocabularies)
+    await adjust_category_counts(db, owner_id, {category: -n for category, n in removed.items()})
+    for vocab_id in ids:
+        record_removed(db, owner_id, vocab_id)
+    await add_tombstones(db, owner_id, KIND_VOCABULARY, ids, seq)
+
+
+async def _favorite_categories(db, user_id, vocabulary_ids, favorited):
+    # Category của các từ trong vocabulary_ids đang (favorited=True) / chưa được user yêu thích.
+    # Đọc sau bump_data_version: khoá dòng users chặn ghi yêu thích đồng thời của cùng user.
+    rows = await db.execute(
+        select(VocabularyModel.id, VocabularyModel.category)
+        .outerjoin(FavoriteModel, and_(
+            FavoriteModel.vocabulary_id == VocabularyModel.id, FavoriteModel.user_id == user_id
+        ))
+        .where(VocabularyModel.id.in_(vocabulary_ids))
+        .where(FavoriteModel.id.isnot(None) if favorited else FavoriteModel.id.is_(None))
+    )
+    return dict(rows.all())
+
+
+async def add_favorite(db, user_id, vocabulary_id):
+    seq = await bump_data_version(db, user_id)
+    favorite = FavoriteModel(user_id=user_id, vocabulary_id=vocabulary_id, sync_seq=seq or 0)
+    db.add(favorite)
+    category = (await db.execute(
+        select(VocabularyModel.category).where(VocabularyModel.id == vocabulary_id)
+    )).scalar_one()
+    await adjust_category_counts(db, user_id, {category: 1}, "favorite_count")
+    await record_activity(db, user_id, favorites_added=1)
+    return favorite
+
+
+async def add_favorites(db, user_id, vocabulary_ids):
+    # Insert-or-ignore trên unique (user_id, vocabulary_id): không lỗi nếu request khác vừa thêm
+    if not vocabulary_ids:
+        return
+    seq = await bump_data_version(db, user_id)
+    added = await _favorite_categories(db, user_id, vocabulary_ids, favorited=False)
+    await insert_ignore(db, FavoriteModel.__table__, ["user_id", "vocabulary_id"], [
+        {"user_id": user_id, "vocabulary_id": vocab_id, "sync_seq": seq or 0} for vocab_id in added
+    ])
+    await adjust_category_counts(db, user_id, Counter(added.values()), "favorite_count")
+    await record_activity(db, user_id, favorites_added=len(added))
+
+
+async def remove_favorite(db, favorite):
+    await remove_favorites(db, favorite.user_id, [favorite.vocabulary_id])
+
+
+async def remove_favorites(db, user_id, vocabulary_ids):
+    if not vocabulary_ids:
+        return
+    seq = await bump_data_version(db, user_id)
+    removed = await _favorite_categories(db, user_id, vocabulary_ids, favorited=True)
+    await db.execute(delete(FavoriteModel).where(
+        FavoriteModel.user_id == user_id, FavoriteModel.vocabulary_id.in_(vocabulary_ids)
+    ))
+    await adjust_category_counts(
+        db, user_id, {category: -n for category, n in Counter(removed.values()).items()}, "favorite_count"
+    )
+    await add_tombstones(db, user_id, KIND_FAVORITE, vocabulary_ids, seq)
@@ -0,0 +1,39 @@
+import os
+import sys
+import pytest
+
+# Test chạy trên SQLite (sync: pysqlite, async: aiosqlite), không cần MySQL
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Bảng bị drop/create lại giữa các test nên id/email có thể trùng lặp
+    from api.auth import principal_cache
+    from services.data_version import data_version_cache
+    from services.rate_limit import rate_limiter
+    from database.routing import session_router
+    from services.quiz import quiz_pools
+    principal_cache.clear()
+    data_version_cache.clear()
+    rate_limiter.backend.clear()
+    session_router.pins.clear()
+    quiz_pools.clear()
+    yield
+
+
+@pytest.fixture
+def auth_headers():
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+
+    def login(email="test@example.com", password="testpassword"):
+        client.post("/api/auth/register", json={"email": email, "password": password})
+        response = client.post("/api/auth/token", data={"username": email, "password": password})
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return login
@@ -2,7 +2,6 @@ from fastapi.testclient import TestClient
 from main import app
 import pytest
 from database.database import Base, engine
-from models import models
 
 client = TestClient(app)
 
@@ -0,0 +1,111 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import event
+from database.database import Base, async_engine, engine
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+def add_word(headers, word, category="TOEIC"):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    ).json()
+
+def batch(headers, ops):
+    response = client.post("/api/vocab/batch", headers=headers, json={"ops": ops})
+    assert response.status_code == 200, response.text
+    return response.json()["results"]
+
+def favorite_ids(headers):
+    return client.get("/api/vocab/session", headers=headers).json()["favorite_ids"]
+
+def test_batch_applies_ops_in_order_with_per_op_results(auth_headers):
+    headers = auth_headers()
+    apple, banana, cat = (add_word(headers, w) for w in ("apple", "banana", "cat"))
+    client.post(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    results = batch(headers, [
+        {"op": "create", "data": {"word": "dog", "meaning": "chó", "example": "e", "category": "IELTS"}},
+        {"op": "favorite", "id": apple["id"]},
+        {"op": "favorite", "id": apple["id"]},
+        {"op": "unfavorite", "id": banana["id"]},
+        {"op": "unfavorite", "id": cat["id"]},
+        {"op": "delete", "id": cat["id"]},
+        {"op": "delete", "id": cat["id"]},
+        {"op": "favorite", "id": 999},
+        {"op": "create", "data": {"word": "egg", "meaning": "trứng", "example": "e", "category": "IELTS"}},
+        {"op": "delete"},
+    ])
+    assert [r["status"] for r in results] == [200, 200, 400, 200, 404, 200, 404, 404, 200, 400]
+    assert results[0]["vocabulary"]["word"] == "dog"
+    assert results[8]["vocabulary"]["word"] == "egg"
+    assert results[8]["vocabulary"]["id"] > results[0]["vocabulary"]["id"]
+    words = [v["word"] for v in client.get("/api/vocab/vocabularies", headers=headers).json()]
+    assert words == ["apple", "banana", "dog", "egg"]
+    assert favorite_ids(headers) == [apple["id"]]
+    assert client.get("/api/vocab/categories?with_counts=true", headers=headers).json() == [
+        {"category": "IELTS", "word_count": 2}, {"category": "TOEIC", "word_count": 2},
+    ]
+
+def test_batch_respects_ownership_and_nets_out_toggles(auth_headers):
+    alice = auth_headers("alice@example.com")
+    bob = auth_headers("bob@example.com")
+    word = add_word(alice, "apple")
+    assert [r["status"] for r in batch(bob, [
+        {"op": "favorite", "id": word["id"]}, {"op": "delete", "id": word["id"]},
+    ])] == [404, 404]
+    assert [r["status"] for r in batch(alice, [
+        {"op": "favorite", "id": word["id"]}, {"op": "unfavorite", "id": word["id"]},
+        {"op": "favorite", "id": word["id"]},
+    ])] == [200, 200, 200]
+    assert favorite_ids(alice) == [word["id"]]
+    # Xoá từ đang được yêu thích: mục yêu thích đi theo
+    assert batch(alice, [{"op": "delete", "id": word["id"]}])[0]["status"] == 200
+    assert favorite_ids(alice) == []
+
+def test_batch_of_100_ops_uses_a_handful_of_queries(auth_headers, count_queries):
+    headers = auth_headers()
+    body = "\n".join(
+        f'{{"word": "w{i}", "meaning": "m", "example": "", "category": "C{i % 3}"}}' for i in range(60)
+    )
+    client.post("/api/vocab/vocabularies/bulk", headers=headers, content=body)
+    client.get("/api/vocab/categories", headers=headers)
+    ops = (
+        [{"op": "favorite", "id": i} for i in range(1, 41)]
+        + [{"op": "delete", "id": i} for i in range(41, 61)]
+        + [{"op": "create", "data": {"word": f"n{i}", "meaning": "m", "example": "", "category": "C0"}}
+           for i in range(40)]
+    )
+    count_queries.clear()
+    results = batch(headers, ops)
+    assert all(r["status"] == 200 for r in results)
+    assert len(count_queries) <= 20
+    assert len(favorite_ids(headers)) == 40
+
+def test_batch_validation(auth_headers):
+    headers = auth_headers()
+    too_many = [{"op": "delete", "id": 1}] * 501
+    assert client.post("/api/vocab/batch", headers=headers, json={"ops": too_many}).status_code == 400
+    assert client.post("/api/vocab/batch", headers=headers, json={"ops": [{"op": "rename", "id": 1}]}).status_code == 422
+    assert client.post("/api/vocab/batch", headers=headers, json={"ops": [{"op": "create"}]}).json()["results"] == [
+        {"status": 400, "detail": "data is required"}
+    ]
+    assert client.post("/api/vocab/batch", json={"ops": []}).status_code == 401
@@ -0,0 +1,95 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import json
+import pytest
+from database.database import Base, engine
+from api import vocab
+from services.bulk_import import iter_csv_rows, iter_jsonl_rows
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def collect(rows):
+    async def run():
+        return [row async for row in rows]
+    return asyncio.run(run())
+
+async def chunked(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def test_jsonl_lines_split_across_chunks():
+    data = "\n".join(json.dumps({"word": f"w{i}", "meaning": "nghĩa"}, ensure_ascii=False) for i in range(3))
+    rows = collect(iter_jsonl_rows(chunked(data.encode(), 7)))
+    assert [row["word"] for _, row in rows] == ["w0", "w1", "w2"]
+
+def test_csv_quoted_multiline_field():
+    data = 'word,meaning,example,category\nrun,chạy,"Line one\nline two",TOEIC\n'
+    rows = collect(iter_csv_rows(chunked(data.encode(), 5)))
+    assert rows == [(2, {"word": "run", "meaning": "chạy", "example": "Line one\nline two", "category": "TOEIC"})]
+
+def test_csv_stray_quote_fails_only_its_row():
+    data = 'word,meaning\nab"c,x\nbad"quote,y,extra\nok,z\n"open,never closed\nafter,w\n'
+    rows = collect(iter_csv_rows(chunked(data.encode(), 4)))
+    assert rows[0] == (2, {"word": 'ab"c', "meaning": "x"})
+    assert rows[1][0] == 3 and "Expected 2 columns" in str(rows[1][1])
+    assert rows[2] == (4, {"word": "ok", "meaning": "z"})
+    # Ngoặc kép không đóng tới hết file: chỉ dòng mở ngoặc lỗi, dòng sau vẫn đọc được
+    assert rows[3][0] == 5 and str(rows[3][1]) == "Unterminated quoted field"
+    assert rows[4] == (6, {"word": "after", "meaning": "w"})
+
+def test_csv_record_size_is_bounded():
+    data = 'word,meaning\n"open\n' + "filler\n" * 50 + "last,one\n"
+    rows = collect(iter_csv_rows(chunked(data.encode(), 16), max_record_bytes=100))
+    assert rows[0][0] == 2 and str(rows[0][1]) == "Unterminated quoted field"
+    assert rows[-1] == (53, {"word": "last", "meaning": "one"})
+
+def test_bulk_import_jsonl_reports_row_errors(auth_headers):
+    headers = auth_headers()
+    body = "\n".join([
+        json.dumps({"word": "one", "meaning": "một", "example": "One.", "category": "TOEIC"}),
+        "{not json",
+        json.dumps({"word": "two", "meaning": "hai", "category": "TOEIC"}),
+        json.dumps({"word": "three", "meaning": "ba", "example": "Three.", "category": "IELTS"}),
+    ])
+    response = client.post(
+        "/api/vocab/vocabularies/bulk",
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+        content=body.encode()
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["inserted"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 3]
+    words = client.get("/api/vocab/vocabularies", headers=headers).json()
+    assert [w["word"] for w in words] == ["one", "three"]
+
+def test_bulk_import_csv(auth_headers):
+    headers = auth_headers()
+    body = "word,meaning,example,category\n" + "".join(f"w{i},nghĩa {i},Ex {i},TOEIC\n" for i in range(25))
+    response = client.post(
+        "/api/vocab/vocabularies/bulk",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=body.encode()
+    )
+    assert response.json()["inserted"] == 25
+    words = client.get("/api/vocab/vocabularies?limit=100", headers=headers).json()
+    assert len(words) == 25
+
+def test_bulk_import_row_limit(auth_headers, monkeypatch):
+    headers = auth_headers()
+    monkeypatch.setattr(vocab, "MAX_IMPORT_ROWS", 10)
+    body = "word,meaning,example,category\n" + "".join(f"w{i},m,e,TOEIC\n" for i in range(11))
+    response = client.post(
+        "/api/vocab/vocabularies/bulk",
+        headers={**headers, "Content-Type": "text/csv"},
+        content=body.encode()
+    )
+    assert response.status_code == 413
+    assert client.get("/api/vocab/vocabularies", headers=headers).json() == []
@@ -0,0 +1,69 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import pytest
+from database.database import AsyncSessionLocal, Base, engine
+from services.category_counts import check_category_counts, rebuild_category_counts
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word, category):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    ).json()
+
+def run(fn, *args):
+    async def inner():
+        async with AsyncSessionLocal() as db:
+            result = await fn(db, *args)
+            await db.commit()
+            return result
+    return asyncio.run(inner())
+
+def test_categories_with_counts(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "a", "TOEIC")
+    add_word(headers, "b", "TOEIC")
+    add_word(headers, "c", "IELTS")
+    assert client.get("/api/vocab/categories", headers=headers).json() == ["IELTS", "TOEIC"]
+    response = client.get("/api/vocab/categories?with_counts=true", headers=headers)
+    assert response.json() == [
+        {"category": "IELTS", "word_count": 1},
+        {"category": "TOEIC", "word_count": 2},
+    ]
+
+def test_delete_updates_rollup(auth_headers):
+    headers = auth_headers()
+    word = add_word(headers, "a", "TOEIC")
+    add_word(headers, "b", "IELTS")
+    response = client.delete(f"/api/vocab/{word['id']}", headers=headers)
+    assert response.json()["categories"] == ["IELTS"]
+    assert client.get("/api/vocab/categories", headers=headers).json() == ["IELTS"]
+
+def test_bulk_import_updates_rollup(auth_headers):
+    headers = auth_headers()
+    body = "word,meaning,example,category\n" + "".join(f"w{i},m,e,{'TOEIC' if i % 2 else 'IELTS'}\n" for i in range(10))
+    client.post("/api/vocab/vocabularies/bulk", headers={**headers, "Content-Type": "text/csv"}, content=body.encode())
+    response = client.get("/api/vocab/categories?with_counts=true", headers=headers)
+    assert response.json() == [
+        {"category": "IELTS", "word_count": 5},
+        {"category": "TOEIC", "word_count": 5},
+    ]
+    assert run(check_category_counts) == []
+
+def test_rebuild_repairs_drift(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "a", "TOEIC")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE user_categories SET word_count = 7")
+    assert run(check_category_counts)[0]["stored"] == 7
+    run(rebuild_category_counts)
+    assert run(check_category_counts) == []
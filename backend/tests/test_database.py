@@ -0,0 +1,26 @@
+from database.database import (
+    DB_MAX_OVERFLOW, DB_POOL_SIZE, DB_POOL_TIMEOUT, TimedAsyncQueuePool, async_engine_options, to_async_url,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+def test_async_url_for_mysql():
+    url = to_async_url("mysql+pymysql://vocabuser:admin@db:3306/vocabdb?charset=utf8mb4")
+    assert url.drivername == "mysql+aiomysql"
+    assert url.query["charset"] == "utf8mb4"
+
+def test_async_url_for_sqlite():
+    assert to_async_url("sqlite:///./vocab.db").drivername == "sqlite+aiosqlite"
+
+def test_file_sqlite_uses_queue_pool():
+    assert issubclass(async_engine_options("sqlite+aiosqlite:///./vocab.db")["poolclass"], AsyncAdaptedQueuePool)
+    assert async_engine_options("mysql+aiomysql://u:p@db/vocabdb")["poolclass"] is TimedAsyncQueuePool
+    assert "poolclass" not in async_engine_options("sqlite+aiosqlite://")
+
+def test_pool_sizing_without_pre_ping():
+    options = async_engine_options("mysql+aiomysql://u:p@db/vocabdb")
+    assert "pool_pre_ping" not in options
+    assert options["pool_size"] == DB_POOL_SIZE
+    assert options["max_overflow"] == DB_MAX_OVERFLOW
+    assert options["pool_timeout"] == DB_POOL_TIMEOUT
+    assert async_engine_options("sqlite+aiosqlite://") == {}
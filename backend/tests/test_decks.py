@@ -0,0 +1,222 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import pytest
+from database.database import AsyncSessionLocal, Base, engine
+from api.vocab import VocabularyCreate
+from services.bulk_import import import_vocabularies, iter_list_rows
+from services.category_counts import check_category_counts
+from services.decks import apply_deck_growth, deck_category_counts, get_or_create_deck
+import manage
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def import_deck(words, slug="toeic", category="TOEIC"):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            deck = await get_or_create_deck(db, slug, slug.upper())
+            before = await deck_category_counts(db, deck.id)
+            rows = [{"word": w, "meaning": f"nghĩa {w}", "example": "Example", "category": category} for w in words]
+            await import_vocabularies(db, iter_list_rows(rows), owner_id=None, schema=VocabularyCreate, deck_id=deck.id)
+            await apply_deck_growth(db, deck, before)
+            await db.commit()
+            return deck.id
+    return asyncio.run(run())
+
+def rollup_mismatches():
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await check_category_counts(db)
+    return asyncio.run(run())
+
+def add_word(headers, word, category="Personal"):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    ).json()
+
+def words(headers, **params):
+    response = client.get("/api/vocab/vocabularies", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return [v["word"] for v in (body["items"] if isinstance(body, dict) else body)]
+
+def subscribe(headers, deck_id):
+    response = client.post(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    assert response.status_code == 200, response.text
+
+def test_subscribed_deck_words_are_merged_with_personal_words(auth_headers):
+    deck_id = import_deck(["apple", "banana"])
+    headers = auth_headers()
+    add_word(headers, "zebra")
+    assert words(headers) == ["zebra"]
+
+    subscribe(headers, deck_id)
+    assert client.post(f"/api/decks/{deck_id}/subscribe", headers=headers).status_code == 400
+    decks = client.get("/api/decks", headers=headers).json()
+    assert [(d["slug"], d["word_count"], d["subscribed"]) for d in decks] == [("toeic", 2, True)]
+    assert words(headers) == ["apple", "banana", "zebra"]
+    assert words(headers, after="", limit=2) == ["apple", "banana"]
+    assert words(headers, skip=1, limit=1) == ["banana"]
+    assert words(headers, category="TOEIC") == ["apple", "banana"]
+    categories = client.get("/api/vocab/categories", headers=headers, params={"with_counts": True}).json()
+    assert categories == [{"category": "Personal", "word_count": 1}, {"category": "TOEIC", "word_count": 2}]
+
+    apple = client.get("/api/vocab/vocabularies", headers=headers).json()[0]
+    assert apple["owner_id"] is None and apple["deck_id"] == deck_id
+    assert client.post(f"/api/vocab/favorites/{apple['id']}", headers=headers).status_code == 200
+    assert [v["word"] for v in client.get("/api/vocab/favorites", headers=headers).json()] == ["apple"]
+    # Từ của bộ từ không xoá được, kể cả qua batch
+    assert client.delete(f"/api/vocab/{apple['id']}", headers=headers).status_code == 404
+    results = client.post("/api/vocab/batch", headers=headers, json={"ops": [
+        {"op": "delete", "id": apple["id"]}, {"op": "unfavorite", "id": apple["id"]}, {"op": "favorite", "id": apple["id"]},
+    ]}).json()["results"]
+    assert [r["status"] for r in results] == [404, 200, 200]
+
+    # User khác chưa đăng ký thì không thấy
+    other = auth_headers("other@example.com")
+    assert words(other) == []
+    assert client.post(f"/api/vocab/favorites/{apple['id']}", headers=other).status_code == 404
+    assert rollup_mismatches() == []
+
+def test_editing_a_deck_word_creates_a_personal_copy(auth_headers):
+    deck_id = import_deck(["apple", "banana"])
+    headers, other = auth_headers(), auth_headers("other@example.com")
+    subscribe(headers, deck_id)
+    subscribe(other, deck_id)
+    apple = client.get("/api/vocab/vocabularies", headers=headers).json()[0]
+    client.post(f"/api/vocab/favorites/{apple['id']}", headers=headers)
+
+    response = client.put(
+        f"/api/vocab/{apple['id']}", headers=headers,
+        json={"word": "apple", "meaning": "táo", "example": "An apple", "category": "Food"},
+    )
+    assert response.status_code == 200, response.text
+    copy = response.json()
+    assert copy["id"] != apple["id"] and copy["owner_id"] is not None and copy["meaning"] == "táo"
+
+    mine = client.get("/api/vocab/vocabularies", headers=headers).json()
+    assert [(v["id"], v["meaning"]) for v in mine] == [(copy["id"], "táo"), (mine[1]["id"], "nghĩa banana")]
+    assert [v["id"] for v in client.get("/api/vocab/favorites", headers=headers).json()] == [copy["id"]]
+    categories = client.get("/api/vocab/categories", headers=headers, params={"with_counts": True}).json()
+    assert categories == [{"category": "Food", "word_count": 1}, {"category": "TOEIC", "word_count": 1}]
+    # Bộ từ gốc không đổi với người khác
+    assert [v["meaning"] for v in client.get("/api/vocab/vocabularies", headers=other).json()] == [
+        "nghĩa apple", "nghĩa banana",
+    ]
+
+    # Sửa lần nữa: sửa tại chỗ bản sao
+    again = client.put(
+        f"/api/vocab/{copy['id']}", headers=headers,
+        json={"word": "apple", "meaning": "quả táo", "example": "An apple", "category": "Food"},
+    ).json()
+    assert again["id"] == copy["id"]
+    assert client.put(
+        f"/api/vocab/{apple['id']}", headers=headers,
+        json={"word": "x", "meaning": "x", "example": "x", "category": "x"},
+    ).status_code == 404
+    assert rollup_mismatches() == []
+
+def test_unsubscribe_keeps_personal_copies(auth_headers):
+    deck_id = import_deck(["apple", "banana", "cat"])
+    headers = auth_headers()
+    subscribe(headers, deck_id)
+    apple, banana, _ = client.get("/api/vocab/vocabularies", headers=headers).json()
+    client.post(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    client.put(
+        f"/api/vocab/{apple['id']}", headers=headers,
+        json={"word": "apple", "meaning": "táo", "example": "e", "category": "TOEIC"},
+    )
+
+    response = client.delete(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    assert response.status_code == 200
+    assert client.delete(f"/api/decks/{deck_id}/subscribe", headers=headers).status_code == 404
+    assert words(headers) == ["apple"]
+    assert client.get("/api/vocab/favorites", headers=headers).json() == []
+    assert client.get("/api/vocab/categories", headers=headers, params={"with_counts": True}).json() == [
+        {"category": "TOEIC", "word_count": 1},
+    ]
+    assert rollup_mismatches() == []
+
+def due_words(headers):
+    response = client.get("/api/vocab/review/due", headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(card["vocabulary"]["word"] for card in response.json())
+
+def test_deck_words_are_reviewable(auth_headers):
+    deck_id = import_deck(["apple", "banana"])
+    headers, other = auth_headers(), auth_headers("other@example.com")
+    add_word(headers, "zebra")
+    subscribe(headers, deck_id)
+    assert due_words(headers) == ["apple", "banana", "zebra"]
+    assert due_words(other) == []
+
+    apple, banana, _ = client.get("/api/vocab/vocabularies", headers=headers).json()
+    response = client.post(f"/api/vocab/review/{apple['id']}", headers=headers, json={"grade": 5})
+    assert response.status_code == 200, response.text
+    assert response.json()["repetitions"] == 1
+    assert client.post(f"/api/vocab/review/{apple['id']}", headers=other, json={"grade": 5}).status_code == 404
+
+    # Từ mới của bộ từ có lịch ôn cho người đăng ký; sửa từ thì lịch ôn theo bản sao
+    import_deck(["cat"])
+    assert due_words(headers) == ["banana", "cat", "zebra"]
+    copy = client.put(
+        f"/api/vocab/{banana['id']}", headers=headers,
+        json={"word": "banana", "meaning": "chuối", "example": "e", "category": "TOEIC"},
+    ).json()
+    due = client.get("/api/vocab/review/due", headers=headers).json()
+    assert copy["id"] in [card["vocabulary"]["id"] for card in due]
+    assert banana["id"] not in [card["vocabulary"]["id"] for card in due]
+
+    # Huỷ rồi đăng ký lại: không tạo lịch ôn cho từ gốc đã có bản sao
+    client.delete(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    assert due_words(headers) == ["banana", "zebra"]
+    subscribe(headers, deck_id)
+    assert due_words(headers) == ["apple", "banana", "cat", "zebra"]
+
+    # Người đăng ký từ trước khi có lịch ôn cho bộ từ: backfill-reviews tạo bù
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM review_state")
+    assert manage.main(["backfill-reviews"]) == 0
+    assert due_words(headers) == ["apple", "banana", "cat", "zebra"]
+
+def test_deck_changes_reset_sync_and_quiz(auth_headers):
+    deck_id = import_deck(["apple", "banana"])
+    headers = auth_headers()
+    add_word(headers, "zebra")
+    first = client.get("/api/vocab/sync", headers=headers).json()
+    assert [c["data"]["word"] for c in first["changes"]] == ["zebra"]
+    assert client.get("/api/vocab/quiz", headers=headers).status_code == 400
+
+    subscribe(headers, deck_id)
+    after_subscribe = client.get("/api/vocab/sync", headers=headers, params={"since": first["seq"]}).json()
+    assert after_subscribe["reset"] is True
+    assert sorted(c["data"]["word"] for c in after_subscribe["changes"]) == ["apple", "banana", "zebra"]
+    quiz = client.get("/api/vocab/quiz", headers=headers, params={"n": 3}).json()
+    assert len(quiz["questions"]) == 3
+
+    # Thêm từ vào bộ từ: người đăng ký thấy ngay, rollup và sync được cập nhật
+    import_deck(["cat"])
+    assert words(headers) == ["apple", "banana", "zebra", "cat"]
+    grown = client.get("/api/vocab/sync", headers=headers, params={"since": after_subscribe["seq"]}).json()
+    assert grown["reset"] is True and len(grown["changes"]) == 4
+    assert rollup_mismatches() == []
+
+    # Sửa từ của bộ từ: delta gồm bản sao và tombstone của từ gốc
+    apple = client.get("/api/vocab/vocabularies", headers=headers).json()[0]
+    copy = client.put(
+        f"/api/vocab/{apple['id']}", headers=headers,
+        json={"word": "apple", "meaning": "táo", "example": "e", "category": "TOEIC"},
+    ).json()
+    delta = client.get("/api/vocab/sync", headers=headers, params={"since": grown["seq"]}).json()
+    assert delta["reset"] is False
+    assert [(c["op"], c.get("id") or c["data"]["id"]) for c in delta["changes"]] == [
+        ("upsert", copy["id"]), ("delete", apple["id"]),
+    ]
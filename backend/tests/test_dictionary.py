@@ -0,0 +1,81 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from database.database import Base, engine
+from services import dictionary
+from services.dictionary import Dictionary, build_index
+
+client = TestClient(app)
+
+SOURCE = """# word\tmeaning\texample
+run\tchạy\tI run every morning.
+Run\tđiều hành (công ty)
+apple\tquả táo\tAn apple a day.
+apply\tnộp đơn; áp dụng
+application\tứng dụng
+apple pie\tbánh táo
+no meaning
+Đà Lạt\tthành phố Đà Lạt
+"""
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def index_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "dictionary.idx")
+    result = build_index(SOURCE.splitlines(True), path)
+    assert result["entries"] == 7 and result["skipped"] == 1
+    monkeypatch.setattr(dictionary, "DICTIONARY_PATH", path)
+    yield path
+    opened = dictionary._opened.pop(path, None)
+    if opened is not None:
+        opened.close()
+
+def test_lookup_and_complete(index_path):
+    index = Dictionary(index_path)
+    assert len(index) == 7
+    assert index.lookup("  RUN ") == [
+        {"word": "run", "meaning": "chạy", "example": "I run every morning."},
+        {"word": "Run", "meaning": "điều hành (công ty)", "example": None},
+    ]
+    assert index.lookup("apple  pie") == [{"word": "apple pie", "meaning": "bánh táo", "example": None}]
+    assert index.lookup("đà lạt")[0]["word"] == "Đà Lạt"
+    assert index.lookup("appl") == [] and index.lookup("zzz") == [] and index.lookup("") == []
+    assert [s["word"] for s in index.complete("app")] == ["apple", "apple pie", "application", "apply"]
+    assert [s["word"] for s in index.complete("app", limit=2)] == ["apple", "apple pie"]
+    assert [s["word"] for s in index.complete("r")] == ["run"]
+    assert index.complete("b") == []
+    index.close()
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "empty.idx")
+    build_index([], path)
+    index = Dictionary(path)
+    assert index.lookup("run") == [] and index.complete("r") == []
+    index.close()
+
+def test_lookup_endpoints(index_path, auth_headers):
+    headers = auth_headers()
+    response = client.get("/api/vocab/lookup", params={"word": "Apple"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "word": "apple", "entries": [{"word": "apple", "meaning": "quả táo", "example": "An apple a day."}],
+    }
+    assert client.get("/api/vocab/lookup", params={"word": "nope"}, headers=headers).status_code == 404
+    response = client.get("/api/vocab/lookup/autocomplete", params={"prefix": "ap", "limit": 3}, headers=headers)
+    assert response.json() == {"suggestions": [
+        {"word": "apple", "meaning": "quả táo"},
+        {"word": "apple pie", "meaning": "bánh táo"},
+        {"word": "application", "meaning": "ứng dụng"},
+    ]}
+    assert client.get("/api/vocab/lookup/autocomplete", params={"prefix": "ap", "limit": 0}, headers=headers).status_code == 400
+    assert client.get("/api/vocab/lookup", params={"word": "apple"}).status_code == 401
+
+def test_lookup_without_index(tmp_path, monkeypatch, auth_headers):
+    monkeypatch.setattr(dictionary, "DICTIONARY_PATH", str(tmp_path / "missing.idx"))
+    response = client.get("/api/vocab/lookup", params={"word": "apple"}, headers=auth_headers())
+    assert response.status_code == 503
@@ -0,0 +1,92 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import event
+from database.database import Base, async_engine, engine
+from services.data_version import etag_matches
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": "TOEIC"}
+    ).json()
+
+@pytest.mark.parametrize("path", [
+    "/api/vocab/vocabularies", "/api/vocab/categories", "/api/vocab/favorites", "/api/vocab/session",
+])
+def test_if_none_match_returns_304(auth_headers, path):
+    headers = auth_headers()
+    add_word(headers, "apple")
+    response = client.get(path, headers=headers)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200
+    response = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+def test_every_write_changes_the_etag(auth_headers):
+    headers = auth_headers()
+    etags = [client.get("/api/vocab/vocabularies", headers=headers).headers["ETag"]]
+    word = add_word(headers, "apple")
+    etags.append(client.get("/api/vocab/vocabularies", headers=headers).headers["ETag"])
+    client.post(f"/api/vocab/favorites/{word['id']}", headers=headers)
+    etags.append(client.get("/api/vocab/favorites", headers=headers).headers["ETag"])
+    client.delete(f"/api/vocab/favorites/{word['id']}", headers=headers)
+    etags.append(client.get("/api/vocab/favorites", headers=headers).headers["ETag"])
+    client.delete(f"/api/vocab/{word['id']}", headers=headers)
+    etags.append(client.get("/api/vocab/vocabularies", headers=headers).headers["ETag"])
+    assert len(set(etags)) == len(etags)
+    response = client.get("/api/vocab/vocabularies", headers={**headers, "If-None-Match": etags[0]})
+    assert response.status_code == 200
+
+def test_etags_are_per_user(auth_headers):
+    alice = auth_headers("alice@example.com")
+    bob = auth_headers("bob@example.com")
+    etag = client.get("/api/vocab/categories", headers=alice).headers["ETag"]
+    assert client.get("/api/vocab/categories", headers={**bob, "If-None-Match": etag}).status_code == 200
+
+def test_304_reads_only_the_data_version(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "apple")
+    etag = client.get("/api/vocab/vocabularies", headers=headers).headers["ETag"]
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get("/api/vocab/vocabularies", headers={**headers, "If-None-Match": etag})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 304
+    # Không đọc vocabularies, chỉ tra data_version theo khoá chính
+    assert len(statements) == 1 and "data_version" in statements[0]
+
+def test_if_none_match_skips_the_version_cache(auth_headers):
+    # Worker khác ghi: cache của process này còn version cũ nhưng không được trả 304
+    headers = auth_headers()
+    add_word(headers, "apple")
+    etag = client.get("/api/vocab/vocabularies", headers=headers).headers["ETag"]
+    with engine.begin() as conn:
+        conn.exec_driver_sql("UPDATE users SET data_version = data_version + 1")
+    response = client.get("/api/vocab/vocabularies", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_etag_matching():
+    assert etag_matches('"1.2"', '"1.2"')
+    assert etag_matches('"1.1", W/"1.2"', '"1.2"')
+    assert etag_matches("*", '"1.2"')
+    assert not etag_matches('"1.20"', '"1.2"')
+    assert not etag_matches(None, '"1.2"')
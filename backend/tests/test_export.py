@@ -0,0 +1,141 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import csv
+import io
+import json
+import os
+import sqlite3
+import pytest
+from database.database import Base, engine
+from api.auth import create_access_token
+
+client = TestClient(app)
+
+# Số dòng N của phép so N / 4N dòng; chạy lớn hơn: EXPORT_RSS_ROWS=250000 pytest tests/test_export.py
+EXPORT_RSS_ROWS = int(os.getenv("EXPORT_RSS_ROWS", "20000"))
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    # drop trước: lần chạy bị ngắt giữa chừng có thể để lại dữ liệu trong test.db
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_words(headers, count):
+    for i in range(count):
+        client.post(
+            "/api/vocab/vocabularies",
+            headers=headers,
+            json={"word": f"w{i}", "meaning": f"nghĩa {i}", "example": f"Ex, {i}", "category": "TOEIC"}
+        )
+
+def test_export_ndjson(auth_headers):
+    headers = auth_headers()
+    add_words(headers, 3)
+    response = client.get("/api/vocab/export?format=ndjson", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["word"] for row in rows] == ["w0", "w1", "w2"]
+    assert rows[0]["meaning"] == "nghĩa 0"
+
+def test_export_csv(auth_headers):
+    headers = auth_headers()
+    add_words(headers, 2)
+    response = client.get("/api/vocab/export?format=csv", headers=headers)
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["example"] for row in rows] == ["Ex, 0", "Ex, 1"]
+
+def test_export_only_own_words(auth_headers):
+    add_words(auth_headers("other@example.com"), 2)
+    response = client.get("/api/vocab/export", headers=auth_headers())
+    assert response.text == ""
+
+def test_export_includes_subscribed_deck_words(auth_headers):
+    headers = auth_headers()
+    add_words(headers, 1)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO decks (id, slug, name, word_count) VALUES (1, 'toeic', 'TOEIC', 1)")
+        conn.exec_driver_sql(
+            "INSERT INTO vocabularies (word, meaning, example, category, deck_id, created_at) "
+            "VALUES ('deckword', 'm', 'e', 'TOEIC', 1, '2000-01-01 00:00:00')"
+        )
+    assert client.post("/api/decks/1/subscribe", headers=headers).status_code == 200
+    response = client.get("/api/vocab/export", headers=headers)
+    assert [json.loads(line)["word"] for line in response.text.splitlines()] == ["deckword", "w0"]
+    assert client.get("/api/vocab/export", headers=auth_headers("other@example.com")).text == ""
+
+def current_rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+def seed_rows(rows, start=0):
+    # Ghi thẳng bằng sqlite3 để fixture không chiếm bộ nhớ của ORM
+    conn = sqlite3.connect(engine.url.database)
+    if start == 0:
+        conn.execute("INSERT INTO users (id, email, hashed_password, is_active) VALUES (1, 'big@example.com', 'x', 1)")
+    conn.executemany(
+        "INSERT INTO vocabularies (word, meaning, example, category, created_at, owner_id) "
+        "VALUES (?, ?, ?, ?, '2024-01-01 00:00:00.000000', 1)",
+        ((f"word{i}", f"nghĩa của từ {i}", f"Example sentence number {i}.", "TOEIC") for i in range(start, start + rows)),
+    )
+    conn.commit()
+    conn.close()
+
+def export_peak_kb():
+    # Chạy GET /api/vocab/export trực tiếp qua ASGI; trả về (số dòng nhận được, RSS đỉnh KB)
+    token = create_access_token({"sub": "big@example.com"})
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/vocab/export", "raw_path": b"/api/vocab/export", "root_path": "",
+        "query_string": b"format=ndjson", "server": ("test", 80), "client": ("test", 1),
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    }
+    stats = {"bytes": 0, "lines": 0, "peak_kb": 0}
+    requested = False
+    finished = asyncio.Event()
+
+    async def receive():
+        # Body request trả về một lần; sau đó chờ như client còn kết nối
+        # (StreamingResponse lắng nghe http.disconnect song song với việc gửi body)
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # Đọc body theo từng chunk rồi bỏ đi, như một client tải file
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            stats["bytes"] += len(body)
+            stats["lines"] += body.count(b"\n")
+            stats["peak_kb"] = max(stats["peak_kb"], current_rss_kb())
+            if not message.get("more_body", False):
+                finished.set()
+
+    asyncio.run(app(scope, receive, send))
+    return stats["lines"], stats["peak_kb"]
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_export_memory_does_not_grow_with_rows():
+    # So RSS đỉnh khi xuất N và 4N dòng: stream chỉ giữ một batch nên đỉnh gần như không đổi;
+    # gom cả kết quả vào bộ nhớ thì phần tăng tỉ lệ với số dòng (~4 lần) và bị bắt ở đây
+    seed_rows(EXPORT_RSS_ROWS)
+    baseline_kb = current_rss_kb()
+    lines, small_peak_kb = export_peak_kb()
+    assert lines == EXPORT_RSS_ROWS
+    seed_rows(3 * EXPORT_RSS_ROWS, start=EXPORT_RSS_ROWS)
+    lines, large_peak_kb = export_peak_kb()
+    assert lines == 4 * EXPORT_RSS_ROWS
+    small_growth_kb = max(small_peak_kb - baseline_kb, 0)
+    large_growth_kb = max(large_peak_kb - baseline_kb, 0)
+    # 3N dòng thêm chỉ được tăng đỉnh chưa tới ~100 byte mỗi dòng (một dòng NDJSON ~150 byte)
+    assert large_growth_kb - small_growth_kb < 3 * EXPORT_RSS_ROWS * 100 // 1024, (small_growth_kb, large_growth_kb)
@@ -0,0 +1,29 @@
+import asyncio
+import threading
+import pytest
+from services.hashing import HashingPool, HashingPoolFull, check_password, hash_password
+
+
+def test_hash_and_verify_in_pool():
+    pool = HashingPool(kind="thread", workers=1, max_pending=1)
+
+    async def run():
+        hashed = await pool.run(hash_password, "secret")
+        return await pool.run(check_password, "secret", hashed)
+
+    assert asyncio.run(run()) is True
+    assert pool.stats()["pending"] == 0
+    pool.shutdown()
+
+def test_rejects_when_queue_is_full():
+    pool = HashingPool(kind="thread", workers=1, max_pending=1)
+    release = threading.Event()
+    running = pool.submit(release.wait)
+    queued = pool.submit(release.wait)
+    with pytest.raises(HashingPoolFull):
+        pool.submit(release.wait)
+    assert pool.stats()["rejected"] == 1
+    release.set()
+    running.result()
+    queued.result()
+    pool.shutdown()
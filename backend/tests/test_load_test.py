@@ -0,0 +1,52 @@
+import asyncio
+from main import app
+import pytest
+from database.database import Base, async_engine, engine
+from benchmarks.datagen import CATEGORIES, generate, generate_rows
+from benchmarks.load_test import SCENARIOS, compare, run
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def test_generator_is_seeded_and_skewed():
+    first = generate_rows(users=3, words=200, seed=1)
+    assert first == generate_rows(users=3, words=200, seed=1)
+    assert first != generate_rows(users=3, words=200, seed=2)
+    assert len(first["vocabularies"]) == 600
+    counts = sorted((r["word_count"] for r in first["user_categories"] if r["user_id"] == 1), reverse=True)
+    assert sum(counts) == 200
+    assert len(counts) <= len(CATEGORIES)
+    assert counts[0] > 4 * counts[-1]
+
+def test_scenarios_run_without_errors():
+    generate(engine, users=2, words=120, favorite_ratio=0.2, seed=3)
+
+    async def run_once():
+        # concurrency=1: hai bulk import song song trên SQLite có thể chờ lock quá timeout khi máy chậm.
+        # Đóng connection của pool async trong chính event loop này trước khi loop bị đóng.
+        try:
+            return await run(app, list(SCENARIOS), users=2, words=120, seed=3, concurrency=1, iterations=1)
+        finally:
+            await async_engine.dispose()
+
+    # Mọi kịch bản đều gọi đúng endpoint đang có (lỗi thì nằm trong "errors")
+    report = asyncio.run(run_once())
+    for name, scenario in report.items():
+        assert scenario["errors"] == {}, name
+        assert scenario["requests"] > 0
+        for stats in scenario["endpoints"].values():
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+            assert stats["rps"] > 0
+
+def test_compare_flags_p95_regressions():
+    baseline = {"scenarios": {"favorites": {"endpoints": {
+        "GET /api/vocab/favorites": {"p95_ms": 10.0}, "POST /api/vocab/favorites/{vocabulary_id}": {"p95_ms": 10.0},
+    }}}}
+    report = {"favorites": {"endpoints": {
+        "GET /api/vocab/favorites": {"p95_ms": 11.0}, "POST /api/vocab/favorites/{vocabulary_id}": {"p95_ms": 15.0},
+    }}}
+    regressions = compare(report, baseline, threshold=0.2)
+    assert [r["endpoint"] for r in regressions] == ["POST /api/vocab/favorites/{vocabulary_id}"]
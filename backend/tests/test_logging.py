@@ -0,0 +1,64 @@
+import io
+import json
+import logging
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from database.database import Base, engine
+from services.log import configure_logging, stop_logging
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def log_output():
+    stream = io.StringIO()
+    configure_logging(level="DEBUG", stream=stream)
+
+    def lines():
+        stop_logging()  # chờ thread nền ghi hết hàng đợi
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield lines
+    configure_logging()
+
+def test_request_id_and_redaction(log_output):
+    client.post("/api/auth/register", json={"email": "log@example.com", "password": "s3cret-pass"})
+    response = client.post(
+        "/api/auth/token", data={"username": "log@example.com", "password": "wrong-pass"},
+        headers={"X-Request-ID": "req-123"},
+    )
+    assert response.status_code == 401
+    assert response.headers["x-request-id"] == "req-123"
+    logging.getLogger("vocab.test").info("credentials", extra={"password": "p", "payload": {"access_token": "t"}})
+
+    entries = log_output()
+    text = json.dumps(entries)
+    assert "s3cret-pass" not in text and "wrong-pass" not in text
+    failed = [e for e in entries if e["message"] == "login failed"]
+    assert failed and failed[0]["request_id"] == "req-123" and failed[0]["level"] == "INFO"
+    credentials = [e for e in entries if e["message"] == "credentials"][0]
+    assert credentials["password"] == "[REDACTED]"
+    assert credentials["payload"] == {"access_token": "[REDACTED]"}
+
+def test_generated_request_id_is_returned():
+    response = client.get("/")
+    assert len(response.headers["x-request-id"]) == 32
+
+def test_disabled_level_skips_formatting():
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return "expensive"
+
+    logger = logging.getLogger("vocab.test")
+    assert not logger.isEnabledFor(logging.DEBUG)
+    logger.debug("ids %s", Expensive())
+    assert Expensive.formatted == 0
@@ -0,0 +1,70 @@
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import create_engine, text
+from database.database import AsyncSessionLocal, Base, engine
+from services.metrics import (
+    Histogram, MetricsMiddleware, db_queries, db_query_time, http_requests, instrument_engine, request_queries,
+)
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def test_histogram_render():
+    histogram = Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, ("/a",))
+    histogram.observe(0.5, ("/a",))
+    histogram.observe(5, ("/a",))
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+def test_route_template_and_status_are_recorded(auth_headers):
+    headers = auth_headers()
+    key = ("GET", "/api/vocab/{vocab_id}", 404)
+    before = http_requests.values.get(key, 0)
+    client.get("/api/vocab/123456", headers=headers)
+    assert http_requests.values[key] == before + 1
+
+    client.get("/api/vocab/vocabularies", headers=headers)
+    body = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/api/vocab/{vocab_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/api/vocab/vocabularies",le="+Inf"}' in body
+    assert 'http_request_db_queries_count{route="/api/vocab/vocabularies"}' in body
+    assert 'db_pool{engine="async",state="capacity"}' in body
+    assert 'db_pool_checkout_wait_seconds_count{engine="async"}' in body
+
+def test_query_budget_warning(caplog):
+    demo = FastAPI()
+    demo.add_middleware(MetricsMiddleware, query_budget=2)
+
+    @demo.get("/n-plus-one")
+    async def n_plus_one():
+        async with AsyncSessionLocal() as db:
+            for _ in range(3):
+                await db.execute(text("SELECT 1"))
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger="vocab.metrics"):
+        TestClient(demo).get("/n-plus-one")
+    assert "/n-plus-one issued 3 SQL statements (budget 2" in caplog.text
+    counts, _, count = request_queries.values[("/n-plus-one",)]
+    assert count >= 1
+
+def test_sql_timing_is_sampled():
+    sampled = create_engine("sqlite://")
+    instrument_engine(sampled, "sampled", timing_every=2)
+    with sampled.connect() as conn:
+        for _ in range(4):
+            conn.execute(text("SELECT 1"))
+    assert db_queries.values[("sampled",)] == 4
+    assert db_query_time.values[("sampled",)][2] == 2
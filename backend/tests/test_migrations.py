@@ -0,0 +1,94 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from database.database import Base
+from database.migrations import (
+    SchemaVersionError, check_schema_version, current_version, latest_version, run_migrations,
+)
+import models  # noqa: F401
+
+@pytest.fixture
+def make_engine(tmp_path):
+    engines = []
+
+    def make(name="migrate.db"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+def describe(engine):
+    inspector = inspect(engine)
+    tables = {}
+    for table in inspector.get_table_names():
+        if table == "schema_version" or table.startswith("vocabularies_fts"):
+            continue
+        tables[table] = (
+            sorted(c["name"] for c in inspector.get_columns(table)),
+            sorted(i["name"] for i in inspector.get_indexes(table)),
+        )
+    return tables
+
+def test_migrations_build_the_model_schema(make_engine):
+    migrated = make_engine("migrated.db")
+    assert run_migrations(migrated, log=lambda _: None) == list(range(1, latest_version() + 1))
+    created = make_engine("created.db")
+    Base.metadata.create_all(bind=created)
+    assert describe(migrated) == describe(created)
+    with migrated.connect() as conn:
+        assert check_schema_version(conn) == latest_version()
+
+def test_upgrade_backfills_existing_data(make_engine):
+    engine = make_engine()
+    run_migrations(engine, target=1, log=lambda _: None)
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO users (id, email, hashed_password, is_active) VALUES (1, 'a@example.com', 'x', 1)"))
+        conn.execute(text(
+            "INSERT INTO vocabularies (word, meaning, example, category, owner_id) VALUES "
+            "('road', 'đường đi', 'e', 'TOEIC', 1), ('apple', 'quả táo', 'e', 'TOEIC', 1), ('cat', 'mèo', 'e', 'IELTS', 1)"
+        ))
+        conn.execute(text("INSERT INTO favorites (user_id, vocabulary_id) VALUES (1, 1), (1, 1), (1, 2)"))
+        # Dữ liệu mẫu cũ không có owner
+        conn.execute(text(
+            "INSERT INTO vocabularies (word, meaning, example, category) VALUES ('hello', 'xin chào', 'e', 'Basic')"
+        ))
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError):
+            check_schema_version(conn)
+
+    run_migrations(engine, log=lambda _: None)
+    with engine.connect() as conn:
+        counts = conn.execute(text("SELECT category, word_count FROM user_categories ORDER BY category")).all()
+        assert [tuple(r) for r in counts] == [("IELTS", 1), ("TOEIC", 2)]
+        assert conn.execute(text("SELECT COUNT(*) FROM review_state")).scalar() == 3
+        assert conn.execute(text("SELECT data_version FROM users")).scalar() == 0
+        assert conn.execute(text("SELECT DISTINCT sync_seq FROM vocabularies")).scalars().all() == [0]
+        favorites = conn.execute(text("SELECT user_id, vocabulary_id FROM favorites ORDER BY id")).all()
+        assert [tuple(f) for f in favorites] == [(1, 1), (1, 2)]
+        deck = conn.execute(text("SELECT id, word_count FROM decks WHERE slug = 'sample'")).one()
+        assert deck.word_count == 1
+        assert conn.execute(text("SELECT deck_id FROM vocabularies WHERE word = 'hello'")).scalar() == deck.id
+        hits = conn.execute(text("SELECT rowid FROM vocabularies_fts WHERE vocabularies_fts MATCH 'duong'")).all()
+        assert len(hits) == 1
+        # Từ của bộ từ được đánh chỉ mục theo bộ từ
+        hits = conn.execute(
+            text("SELECT rowid FROM vocabularies_fts WHERE vocabularies_fts MATCH :q"),
+            {"q": f"owner_key : d{deck.id} AND hello"},
+        ).all()
+        assert len(hits) == 1
+
+def test_migrate_adopts_database_created_by_create_all(make_engine):
+    engine = make_engine()
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine, log=lambda _: None)
+    assert run_migrations(engine, log=lambda _: None) == []
+    with engine.connect() as conn:
+        assert current_version(conn) == latest_version()
+
+def test_check_fails_without_migrations(make_engine):
+    engine = make_engine()
+    with engine.connect() as conn:
+        with pytest.raises(SchemaVersionError):
+            check_schema_version(conn)
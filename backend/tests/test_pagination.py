@@ -0,0 +1,76 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from database.database import Base, engine
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def create_words(headers, count, category="TOEIC"):
+    for i in range(count):
+        client.post(
+            "/api/vocab/vocabularies",
+            headers=headers,
+            json={"word": f"{category}-{i}", "meaning": f"nghĩa {i}", "example": "Example", "category": category}
+        )
+
+def test_cursor_pages_cover_all_rows_once(auth_headers):
+    headers = auth_headers()
+    create_words(headers, 7)
+    seen = []
+    cursor = ""
+    while True:
+        response = client.get(f"/api/vocab/vocabularies?after={cursor}&limit=3", headers=headers)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(item["word"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"TOEIC-{i}" for i in range(7)]
+
+def test_cursor_with_category_filter(auth_headers):
+    headers = auth_headers()
+    create_words(headers, 3, "TOEIC")
+    create_words(headers, 2, "IELTS")
+    first = client.get("/api/vocab/vocabularies?category=IELTS&after=&limit=1", headers=headers).json()
+    assert [item["word"] for item in first["items"]] == ["IELTS-0"]
+    second = client.get(
+        f"/api/vocab/vocabularies?category=IELTS&after={first['next_cursor']}&limit=1", headers=headers
+    ).json()
+    assert [item["word"] for item in second["items"]] == ["IELTS-1"]
+    assert second["next_cursor"] is None
+
+def test_offset_mode_still_returns_list(auth_headers):
+    headers = auth_headers()
+    create_words(headers, 3)
+    response = client.get("/api/vocab/vocabularies?skip=1&limit=1", headers=headers)
+    assert [item["word"] for item in response.json()] == ["TOEIC-1"]
+
+def test_invalid_cursor(auth_headers):
+    headers = auth_headers()
+    response = client.get("/api/vocab/vocabularies?after=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+def test_cursor_with_server_default_timestamps(auth_headers):
+    headers = auth_headers()
+    # Dòng cũ ghi bằng CURRENT_TIMESTAMP: cùng một giây, không có micro giây
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO vocabularies (word, meaning, example, category, created_at, owner_id) "
+            "VALUES ('a', 'm', 'e', 'TOEIC', '2024-01-01 10:00:00', 1), "
+            "('b', 'm', 'e', 'TOEIC', '2024-01-01 10:00:00', 1), "
+            "('c', 'm', 'e', 'TOEIC', '2024-01-01 10:00:00', 1)"
+        )
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        page = client.get(f"/api/vocab/vocabularies?after={cursor}&limit=1", headers=headers).json()
+        seen.extend(item["word"] for item in page["items"])
+        cursor = page["next_cursor"]
+    assert seen == ["a", "b", "c"]
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from database.database import TimedAsyncQueuePool
+from database.pool import PoolSweeper
+from main import pool_timeout_handler
+from services.metrics import pool_stats, pool_swept_dead, pool_timeouts
+
+@pytest.fixture
+def make_engine(tmp_path):
+    def make(**options):
+        return create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=TimedAsyncQueuePool, **options
+        )
+    return make
+
+def test_checkout_times_out_fast(make_engine):
+    engine = make_engine(pool_size=1, max_overflow=0, pool_timeout=0.2)
+    before = pool_timeouts.values.get(("async",), 0)
+
+    async def exhaust():
+        async with engine.connect():
+            start = time.perf_counter()
+            with pytest.raises(exc.TimeoutError):
+                await engine.connect()
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(exhaust())
+    asyncio.run(engine.dispose())
+    assert elapsed < 1
+    assert pool_timeouts.values[("async",)] == before + 1
+
+def test_pool_timeout_maps_to_503():
+    demo = FastAPI()
+    demo.add_exception_handler(exc.TimeoutError, pool_timeout_handler)
+
+    @demo.get("/busy")
+    async def busy():
+        raise exc.TimeoutError("QueuePool limit reached")
+
+    response = TestClient(demo).get("/busy")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+def test_sweeper_invalidates_dead_idle_connections(make_engine):
+    engine = make_engine(pool_size=2, max_overflow=0)
+    sweeper = PoolSweeper({"test": engine})
+
+    async def scenario():
+        first, second = await engine.connect(), await engine.connect()
+        await first.close()
+        await second.close()
+        assert pool_stats(engine.sync_engine.pool)["checked_in"] == 2
+        # Giả lập DB cắt kết nối của một connection đang rảnh trong pool
+        idle = engine.sync_engine.pool._pool._queue._queue[0]  # asyncio.Queue bên trong pool
+        await idle.dbapi_connection._connection.close()
+
+        dead = await sweeper.sweep()
+        async with engine.connect() as conn:
+            value = (await conn.exec_driver_sql("SELECT 1")).scalar()
+        await engine.dispose()
+        return dead, value
+
+    before = pool_swept_dead.values.get(("test",), 0)
+    dead, value = asyncio.run(scenario())
+    assert dead == 1
+    assert value == 1
+    assert pool_swept_dead.values[("test",)] == before + 1
+
+def test_sweeper_holds_one_connection_at_a_time(make_engine):
+    engine = make_engine(pool_size=3, max_overflow=0)
+    sweeper = PoolSweeper({"test": engine})
+    pool = engine.sync_engine.pool
+    checked_out, pinged = [], set()
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, record, proxy):
+        checked_out.append(pool.checkedout())
+        pinged.add(id(dbapi_connection))
+
+    async def scenario():
+        connections = [await engine.connect() for _ in range(3)]
+        for conn in connections:
+            await conn.close()
+        checked_out.clear()
+        pinged.clear()
+        dead = await sweeper.sweep()
+        await engine.dispose()
+        return dead
+
+    assert asyncio.run(scenario()) == 0
+    assert checked_out == [1, 1, 1]
+    # Mỗi connection rảnh được ping đúng một lần
+    assert len(pinged) == 3
+
+def test_sweeper_runs_in_background(make_engine):
+    engine = make_engine(pool_size=1, max_overflow=0)
+    sweeper = PoolSweeper({"test": engine}, interval=0.01)
+
+    async def scenario():
+        calls = []
+        original = sweeper.sweep
+
+        async def counting_sweep():
+            calls.append(1)
+            return await original()
+
+        sweeper.sweep = counting_sweep
+        sweeper.start()
+        await asyncio.sleep(0.1)
+        await sweeper.stop()
+        await engine.dispose()
+        return len(calls)
+
+    assert asyncio.run(scenario()) >= 2
@@ -0,0 +1,101 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from database.database import Base
+from models import User
+from api.auth import create_access_token, get_current_user, principal_cache
+from services.principal_cache import Principal
+from services.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_and_miss_counters():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a@example.com") is None
+    cache.set("a@example.com", Principal(1, "a@example.com", True))
+    assert cache.get("a@example.com").id == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", Principal(1, "a", True))
+    cache.set("b", Principal(2, "b", True))
+    cache.get("a")
+    cache.set("c", Principal(3, "c", True))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=30, clock=clock)
+    cache.set("a", Principal(1, "a", True))
+    clock.now = 29
+    assert cache.get("a") is not None
+    clock.now = 31
+    assert cache.get("a") is None
+
+def test_stale_set_is_rejected_after_invalidation():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    cache.invalidate("a")
+    assert cache.set("a", Principal(1, "a", True), generation=generation) is False
+    assert cache.get("a") is None
+
+def test_generations_are_per_key():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation()
+    cache.invalidate("b")
+    cache.bump_generation("c")
+    assert cache.set("a", 1, generation=generation) is True
+    assert cache.set("b", 2, generation=generation) is False
+    assert cache.set("c", 3, generation=generation) is False
+    assert cache.set("b", 2, generation=cache.generation()) is True
+
+def test_evicted_invalidation_marks_stay_conservative():
+    cache = TTLCache(maxsize=2, ttl=60)
+    generation = cache.generation()
+    for key in ("a", "b", "c"):
+        cache.invalidate(key)
+    # Mốc của "a" đã bị đẩy ra: set() dùng generation cũ vẫn bị từ chối
+    assert cache.set("a", 1, generation=generation) is False
+    assert cache.set("z", 1, generation=generation) is False
+    assert cache.set("z", 1, generation=cache.generation()) is True
+
+def test_orm_update_invalidates_principal():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    user = User(email="cache@example.com", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    principal_cache.set("cache@example.com", Principal.from_user(user))
+
+    user.is_active = False
+    db.commit()
+    assert principal_cache.get("cache@example.com") is None
+
+    principal_cache.set("cache@example.com", Principal.from_user(user))
+    user.email = "renamed@example.com"
+    db.commit()
+    assert principal_cache.get("cache@example.com") is None
+    db.close()
+
+def test_inactive_principal_is_rejected():
+    principal_cache.set("inactive@example.com", Principal(7, "inactive@example.com", False))
+    token = create_access_token({"sub": "inactive@example.com"})
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user(token=token, db=None))
+    assert exc.value.status_code == 401
@@ -0,0 +1,182 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import datetime
+import pytest
+import re
+from sqlalchemy import event
+from database.database import AsyncSessionLocal, Base, async_engine, engine
+from api.vocab import VocabularyCreate
+from services import progress
+from services.bulk_import import import_vocabularies, iter_list_rows
+from services.decks import apply_deck_growth, deck_category_counts, get_or_create_deck
+import manage
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word, category="TOEIC"):
+    response = client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def stats(headers, **params):
+    response = client.get("/api/progress/stats", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def categories(body):
+    return {c["category"]: (c["word_count"], c["favorite_count"], c["mastered_count"]) for c in body["categories"]}
+
+def master(headers, vocabulary_id):
+    # Đưa thẻ tới sát ngưỡng rồi ôn đúng để khoảng ôn vượt MASTERED_INTERVAL_DAYS
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "UPDATE review_state SET interval = 20, repetitions = 3 WHERE vocabulary_id = ?", (vocabulary_id,)
+        )
+    response = client.post(f"/api/vocab/review/{vocabulary_id}", headers=headers, json={"grade": 5})
+    assert response.json()["interval"] >= progress.MASTERED_INTERVAL_DAYS
+
+def test_stats_follow_writes(auth_headers):
+    headers = auth_headers()
+    apple, banana, cat = (add_word(headers, w) for w in ("apple", "banana", "cat"))
+    dog = add_word(headers, "dog", "IELTS")
+    client.post(f"/api/vocab/favorites/{apple['id']}", headers=headers)
+    client.post("/api/vocab/batch", headers=headers, json={"ops": [
+        {"op": "favorite", "id": banana["id"]}, {"op": "favorite", "id": dog["id"]},
+        {"op": "unfavorite", "id": dog["id"]}, {"op": "favorite", "id": apple["id"]},
+    ]})
+    master(headers, cat["id"])
+    client.post(f"/api/vocab/review/{dog['id']}", headers=headers, json={"grade": 1})
+
+    body = stats(headers, days=7)
+    assert (body["total_words"], body["favorite_count"], body["mastered_count"]) == (4, 2, 1)
+    assert categories(body) == {"IELTS": (1, 0, 0), "TOEIC": (3, 2, 1)}
+    assert body["categories"][1]["mastery"] == pytest.approx(1 / 3, abs=1e-4)
+    assert len(body["daily"]) == 7 and body["daily"][-1]["day"] == body["date"]
+    assert body["daily"][-1] == {
+        "day": body["date"], "words_added": 4, "reviews": 2, "reviews_correct": 1, "favorites_added": 2,
+    }
+    assert all(d["words_added"] == 0 for d in body["daily"][:-1])
+    assert body["current_streak"] == 1
+
+    # Xoá từ / bỏ yêu thích / quên từ: trừ khỏi rollup, lịch sử theo ngày giữ nguyên
+    client.delete(f"/api/vocab/{apple['id']}", headers=headers)
+    client.delete(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    client.post(f"/api/vocab/review/{cat['id']}", headers=headers, json={"grade": 0})
+    body = stats(headers, days=1)
+    assert categories(body) == {"IELTS": (1, 0, 0), "TOEIC": (2, 0, 0)}
+    assert body["daily"][0]["words_added"] == 4 and body["daily"][0]["reviews"] == 3
+
+    assert client.get("/api/progress/stats", headers=headers, params={"days": 0}).status_code == 400
+    assert client.get("/api/progress/stats", headers=headers, params={"days": 366}).status_code == 400
+    assert client.get("/api/progress/stats").status_code == 401
+
+def test_current_streak(auth_headers, monkeypatch):
+    headers = auth_headers()
+    assert stats(headers)["current_streak"] == 0
+    today = datetime.datetime.utcnow().date()
+    with engine.begin() as conn:
+        user_id = conn.exec_driver_sql("SELECT id FROM users").scalar()
+        for offset, words, reviews in ((1, 2, 0), (2, 0, 3), (3, 1, 1), (5, 4, 0), (6, 0, 0)):
+            conn.exec_driver_sql(
+                "INSERT INTO user_daily_stats (user_id, day, words_added, reviews, reviews_correct, favorites_added) "
+                "VALUES (?, ?, ?, ?, 0, 1)",
+                (user_id, (today - datetime.timedelta(days=offset)).isoformat(), words, reviews),
+            )
+    # Hôm nay chưa học: chuỗi tính đến hôm qua; đọc nhiều trang vẫn dừng đúng ngày đứt chuỗi
+    monkeypatch.setattr(progress, "STREAK_PAGE_SIZE", 2)
+    assert stats(headers)["current_streak"] == 3
+    add_word(headers, "apple")
+    body = stats(headers, days=3)
+    assert body["current_streak"] == 4
+    assert [d["words_added"] for d in body["daily"]] == [0, 2, 1]
+
+def test_deck_words_in_stats(auth_headers):
+    async def import_deck():
+        async with AsyncSessionLocal() as db:
+            deck = await get_or_create_deck(db, "toeic", "TOEIC")
+            before = await deck_category_counts(db, deck.id)
+            rows = [{"word": w, "meaning": "m", "example": "e", "category": "TOEIC"} for w in ("apple", "banana")]
+            await import_vocabularies(db, iter_list_rows(rows), owner_id=None, schema=VocabularyCreate, deck_id=deck.id)
+            await apply_deck_growth(db, deck, before)
+            await db.commit()
+            return deck.id
+    deck_id = asyncio.run(import_deck())
+    headers = auth_headers()
+    client.post(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    apple, banana = client.get("/api/vocab/vocabularies", headers=headers).json()
+    client.post(f"/api/vocab/favorites/{apple['id']}", headers=headers)
+    client.post(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    # Từ của bộ từ có lịch ôn riêng của người đăng ký nên cũng tính là đã thuộc được
+    master(headers, apple["id"])
+    master(headers, banana["id"])
+    assert categories(stats(headers)) == {"TOEIC": (2, 2, 2)}
+
+    # Sửa từ của bộ từ sang category khác: cờ yêu thích / đã thuộc đi theo bản sao
+    copy = client.put(
+        f"/api/vocab/{banana['id']}", headers=headers,
+        json={"word": "banana", "meaning": "chuối", "example": "e", "category": "Food"},
+    ).json()
+    assert categories(stats(headers)) == {"Food": (1, 1, 1), "TOEIC": (1, 1, 1)}
+    assert stats(headers)["daily"][-1]["words_added"] == 0
+
+    # Sửa tiếp bản sao (từ riêng)
+    client.put(
+        f"/api/vocab/{copy['id']}", headers=headers,
+        json={"word": "banana", "meaning": "chuối", "example": "e", "category": "Fruit"},
+    )
+    assert categories(stats(headers)) == {"Fruit": (1, 1, 1), "TOEIC": (1, 1, 1)}
+
+    client.delete(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    assert categories(stats(headers)) == {"Fruit": (1, 1, 1)}
+
+def test_backfill_matches_incremental(auth_headers):
+    headers, other = auth_headers(), auth_headers("other@example.com")
+    words = [add_word(headers, f"w{i}", "TOEIC" if i % 2 else "IELTS") for i in range(6)]
+    add_word(other, "x")
+    for word in words[:3]:
+        client.post(f"/api/vocab/favorites/{word['id']}", headers=headers)
+    master(headers, words[4]["id"])
+    client.post(f"/api/vocab/review/{words[5]['id']}", headers=headers, json={"grade": 2})
+    expected = stats(headers), stats(other)
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DELETE FROM user_daily_stats")
+        conn.exec_driver_sql("UPDATE user_categories SET favorite_count = 0, mastered_count = 0")
+    assert stats(headers)["favorite_count"] == 0
+    assert manage.main(["backfill-progress", "--batch-size", "1"]) == 0
+    assert (stats(headers), stats(other)) == expected
+
+def test_stats_cost_does_not_grow_with_words(auth_headers):
+    headers = auth_headers()
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    def measure():
+        statements.clear()
+        event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+        try:
+            stats(headers)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+        return len(statements)
+
+    add_word(headers, "first")
+    small = measure()
+    body = "word,meaning,example,category\n" + "".join(f"w{i},m,e,C{i % 3}\n" for i in range(300))
+    client.post("/api/vocab/vocabularies/bulk", headers={**headers, "Content-Type": "text/csv"}, content=body.encode())
+    assert measure() == small
+    # Không đọc bảng gốc
+    assert not any(re.search(r"\b(vocabularies|favorites|review_state)\b", s) for s in statements)
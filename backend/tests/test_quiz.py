@@ -0,0 +1,110 @@
+from fastapi.testclient import TestClient
+from main import app
+import json
+import random
+import pytest
+from sqlalchemy import delete
+from database.database import Base, engine
+from models import ReviewState, Vocabulary as VocabularyModel
+from services.quiz import IdPool, UserQuizPool, quiz_pools
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word, category):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": f"nghĩa {word}", "example": "Example", "category": category}
+    ).json()
+
+def quiz(headers, **params):
+    response = client.get("/api/vocab/quiz", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()["questions"]
+
+def test_distractors_come_from_the_same_category(auth_headers):
+    headers = auth_headers()
+    toeic = {add_word(headers, w, "TOEIC")["word"] for w in ("a", "b", "c", "d", "e")}
+    for w in ("x", "y", "z", "w"):
+        add_word(headers, w, "IELTS")
+    questions = quiz(headers, category="TOEIC", n=10)
+    assert {q["word"] for q in questions} == toeic
+    for q in questions:
+        assert len(q["choices"]) == 4
+        assert len(set(q["choices"])) == 4
+        assert q["choices"][q["answer"]] == f"nghĩa {q['word']}"
+        assert all(choice.split()[-1] in toeic for choice in q["choices"])
+
+def test_small_category_is_topped_up_from_other_categories(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "a", "TOEIC")
+    add_word(headers, "b", "TOEIC")
+    add_word(headers, "x", "IELTS")
+    add_word(headers, "y", "IELTS")
+    [question] = quiz(headers, category="TOEIC", n=1)
+    assert len(question["choices"]) == 4
+    assert quiz(headers, category="Unknown") == []
+
+def test_pool_is_updated_incrementally_on_writes(auth_headers):
+    headers = auth_headers()
+    ids = [add_word(headers, w, "TOEIC")["id"] for w in ("a", "b", "c")]
+    assert len(quiz(headers, n=50)) == 3
+    pool = quiz_pools.get(1)
+    new = add_word(headers, "d", "IELTS")
+    client.delete(f"/api/vocab/{ids[0]}", headers=headers)
+    assert quiz_pools.get(1) is pool
+    assert set(pool.category_of) == {ids[1], ids[2], new["id"]}
+    assert {q["word"] for q in quiz(headers, n=50)} == {"b", "c", "d"}
+    # Bulk insert không có id: pool bị bỏ và dựng lại ở lần quiz sau
+    body = "\n".join(json.dumps({"word": w, "meaning": w, "example": "", "category": "TOEIC"}) for w in ("e", "f"))
+    client.post("/api/vocab/vocabularies/bulk", headers=headers, content=body)
+    assert quiz_pools.get(1) is None
+    assert len(quiz(headers, n=50)) == 5
+
+def test_stale_pool_is_rebuilt_when_rows_are_missing(auth_headers):
+    headers = auth_headers()
+    for w in ("a", "b", "c"):
+        add_word(headers, w, "TOEIC")
+    quiz(headers)
+    # Xoá thẳng trong DB (như một worker khác): pool vẫn còn id cũ
+    with engine.begin() as conn:
+        conn.execute(delete(ReviewState.__table__))
+        conn.execute(delete(VocabularyModel.__table__).where(VocabularyModel.word == "a"))
+    assert len(quiz_pools.get(1).all) == 3
+    assert {q["word"] for q in quiz(headers, n=50)} == {"b", "c"}
+    assert len(quiz_pools.get(1).all) == 2
+
+def test_quiz_validation(auth_headers):
+    headers = auth_headers()
+    assert client.get("/api/vocab/quiz?n=0", headers=headers).status_code == 400
+    assert client.get("/api/vocab/quiz?n=51", headers=headers).status_code == 400
+    add_word(headers, "a", "TOEIC")
+    assert client.get("/api/vocab/quiz", headers=headers).status_code == 400
+    assert client.get("/api/vocab/quiz").status_code == 401
+
+def test_id_pool_add_remove_sample():
+    pool = IdPool()
+    for i in range(10):
+        pool.add(i)
+    pool.add(3)
+    for i in (0, 5, 9):
+        pool.remove(i)
+    pool.remove(42)
+    assert sorted(pool.ids) == [1, 2, 3, 4, 6, 7, 8]
+    assert all(pool.ids[p] == i for i, p in pool.positions.items())
+    rng = random.Random(1)
+    picked = pool.sample(3, exclude={1, 2}, rng=rng)
+    assert len(picked) == 3 and not {1, 2} & set(picked)
+    assert sorted(pool.sample(100, rng=rng)) == sorted(pool.ids)
+
+def test_user_pool_drops_empty_categories():
+    pool = UserQuizPool([(1, "A"), (2, "A"), (3, "B")])
+    pool.add(3, "A")
+    assert list(pool.categories) == ["A"]
+    assert sorted(pool.distractors(1, rng=random.Random(0))) == [2, 3]
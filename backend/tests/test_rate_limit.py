@@ -0,0 +1,95 @@
+import asyncio
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from database.database import Base, engine
+from services.hashing import hashing_pool
+from services.rate_limit import (
+    TOKEN_BUCKET_SCRIPT, MemoryBackend, RateLimiter, RateLimitRule, RedisBackend,
+)
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+class FakeRedis:
+    # Đủ cho RedisBackend: EVAL đúng script token bucket, thực thi lại bằng Python
+    def __init__(self):
+        self.hashes = {}
+        self.ttl = {}
+
+    async def eval(self, script, numkeys, key, capacity, rate, now, cost):
+        assert script == TOKEN_BUCKET_SCRIPT and numkeys == 1
+        capacity, rate, now, cost = float(capacity), float(rate), float(now), float(cost)
+        state = self.hashes.get(key)
+        tokens = capacity if state is None else min(capacity, state["tokens"] + max(0, now - state["ts"]) * rate)
+        retry_after = 0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+        self.hashes[key] = {"tokens": tokens, "ts": now}
+        self.ttl[key] = capacity / rate + 1
+        return str(retry_after).encode()
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.mark.parametrize("backend", [MemoryBackend(shards=4), RedisBackend(FakeRedis())], ids=["memory", "redis"])
+def test_token_bucket_refills(backend):
+    clock = Clock()
+    limiter = RateLimiter(backend, clock=clock)
+    rule = RateLimitRule("login_ip", capacity=3, period=30)  # 1 token / 10s
+
+    async def hits(n):
+        return [await limiter.hit(rule, "1.2.3.4") for _ in range(n)]
+
+    assert asyncio.run(hits(4)) == [0, 0, 0, 10]
+    assert asyncio.run(hits(1)) == [10]
+    clock.now += 10
+    assert asyncio.run(hits(2)) == [0, 10]
+    # Key khác có bucket riêng
+    assert asyncio.run(limiter.hit(rule, "5.6.7.8")) == 0
+
+def test_memory_backend_bounds_keys():
+    backend = MemoryBackend(shards=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        backend.take_sync(key, 1, 1.0, 0.0)
+    buckets, _ = backend._shards[0]
+    assert list(buckets) == ["b", "c"]
+
+def test_backend_error_fails_open():
+    class BrokenRedis:
+        async def eval(self, *args):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter(RedisBackend(BrokenRedis()))
+    assert asyncio.run(limiter.hit(RateLimitRule("login_ip", 1, 60), "1.2.3.4")) == 0
+
+def test_login_is_throttled_per_account_before_hashing(monkeypatch):
+    client.post("/api/auth/register", json={"email": "victim@example.com", "password": "testpassword"})
+    monkeypatch.setattr("api.auth.LOGIN_PER_ACCOUNT", RateLimitRule("login_account", 2, 60))
+    form = {"username": "Victim@example.com", "password": "wrong"}
+    assert [client.post("/api/auth/token", data=form).status_code for _ in range(2)] == [401, 401]
+
+    def fail(*args):
+        raise AssertionError("password hashed for a throttled request")
+    monkeypatch.setattr(hashing_pool, "run", fail)
+    response = client.post("/api/auth/token", data={"username": "victim@example.com", "password": "testpassword"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+def test_register_is_throttled_per_ip(monkeypatch):
+    monkeypatch.setattr("api.auth.REGISTER_PER_IP", RateLimitRule("register_ip", 1, 3600))
+    first = client.post("/api/auth/register", json={"email": "a@example.com", "password": "testpassword"})
+    second = client.post("/api/auth/register", json={"email": "b@example.com", "password": "testpassword"})
+    assert first.status_code == 200
+    assert second.status_code == 429
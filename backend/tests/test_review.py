@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import select
+from database.database import Base, engine
+from models import ReviewState
+from services.review import sm2
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": "TOEIC"}
+    ).json()
+
+def due(headers, limit=20):
+    response = client.get(f"/api/vocab/review/due?limit={limit}", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_sm2_intervals():
+    ease, interval, reps = 2.5, 0, 0
+    intervals = []
+    for _ in range(4):
+        ease, interval, reps = sm2(ease, interval, reps, 5)
+        intervals.append(interval)
+    assert intervals[:2] == [1, 6]
+    assert intervals[2] > 6 and intervals[3] > intervals[2]
+    assert sm2(2.5, 30, 5, 1)[1:] == (1, 0)
+    assert sm2(1.3, 1, 0, 0)[0] == 1.3
+
+def test_new_words_are_due_in_insertion_order(auth_headers):
+    headers = auth_headers()
+    for word in ("one", "two", "three"):
+        add_word(headers, word)
+    cards = due(headers)
+    assert [c["vocabulary"]["word"] for c in cards] == ["one", "two", "three"]
+    assert [c["vocabulary"]["word"] for c in due(headers, limit=2)] == ["one", "two"]
+
+def test_grade_reschedules_card(auth_headers):
+    headers = auth_headers()
+    word = add_word(headers, "apple")
+    add_word(headers, "banana")
+    response = client.post(f"/api/vocab/review/{word['id']}", headers=headers, json={"grade": 4})
+    assert response.status_code == 200
+    assert response.json()["interval"] == 1
+    assert response.json()["repetitions"] == 1
+    assert [c["vocabulary"]["word"] for c in due(headers)] == ["banana"]
+
+def test_grade_validation_and_ownership(auth_headers):
+    alice = auth_headers("alice@example.com")
+    bob = auth_headers("bob@example.com")
+    word = add_word(alice, "apple")
+    assert client.post(f"/api/vocab/review/{word['id']}", headers=alice, json={"grade": 6}).status_code == 422
+    assert client.post(f"/api/vocab/review/{word['id']}", headers=bob, json={"grade": 5}).status_code == 404
+    assert due(bob) == []
+
+def test_bulk_import_and_delete_maintain_review_state(auth_headers):
+    headers = auth_headers()
+    body = "word,meaning,example,category\n" + "".join(f"w{i},m,e,TOEIC\n" for i in range(5))
+    client.post("/api/vocab/vocabularies/bulk", headers={**headers, "Content-Type": "text/csv"}, content=body.encode())
+    cards = due(headers)
+    assert len(cards) == 5
+    client.delete(f"/api/vocab/{cards[0]['vocabulary']['id']}", headers=headers)
+    assert len(due(headers)) == 4
+
+def test_due_query_is_an_index_range_scan():
+    Base.metadata.create_all(bind=engine)
+    query = select(ReviewState.vocabulary_id).where(
+        ReviewState.user_id == 1, ReviewState.due_at <= "2030-01-01"
+    ).order_by(ReviewState.due_at).limit(20)
+    compiled = query.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        plan = " ".join(str(row[-1]) for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}"))
+    assert "ix_review_state_user_due" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,96 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from database.database import AsyncSessionLocal, Base, engine, make_sessionmaker
+from database.routing import PRIMARY_COOKIE, SessionRouter
+from services.data_version import data_version_cache
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    # Hai file SQLite: test.db là primary, replica.db là replica (không có replication,
+    # nên dữ liệu ghi qua API chỉ thấy được khi đọc từ primary)
+    replica_url = f"sqlite:///{tmp_path / 'replica.db'}"
+    replica_sync = create_engine(replica_url)
+    Base.metadata.create_all(bind=replica_sync)
+    replica_sync.dispose()
+    replica_engine = create_async_engine(replica_url.replace("sqlite://", "sqlite+aiosqlite://"))
+    clock = Clock()
+    router = SessionRouter(AsyncSessionLocal, make_sessionmaker(replica_engine), sticky_seconds=5, clock=clock)
+    monkeypatch.setattr("database.routing.session_router", router)
+    monkeypatch.setattr("api.vocab.session_router", router)
+    yield router
+    client.cookies.clear()
+
+def create_word(headers, word):
+    response = client.post("/api/vocab/vocabularies", headers=headers, json={
+        "word": word, "meaning": "nghĩa", "example": "example", "category": "TOEIC",
+    })
+    assert response.status_code == 200
+    return response
+
+def words(headers):
+    return [v["word"] for v in client.get("/api/vocab/vocabularies", headers=headers).json()]
+
+def test_reads_go_to_replica_after_the_sticky_window(router, auth_headers):
+    headers = auth_headers()
+    create_word(headers, "fresh")
+    # Vừa ghi: đọc từ primary, thấy ngay từ mới tạo
+    assert words(headers) == ["fresh"]
+    assert client.get("/api/vocab/categories", headers=headers).json() == ["TOEIC"]
+
+    router.clock.now += 6
+    client.cookies.clear()
+    assert words(headers) == []
+    assert client.get("/api/vocab/categories", headers=headers).json() == []
+
+def test_cookie_pins_reads_across_workers(router, auth_headers):
+    headers = auth_headers()
+    response = create_word(headers, "fresh")
+    assert PRIMARY_COOKIE in response.headers["set-cookie"]
+    # Worker khác: không có pin trong process, chỉ có cookie của client
+    router.pins.clear()
+    assert words(headers) == ["fresh"]
+    client.cookies.clear()
+    assert words(headers) == []
+
+def test_pinned_reads_skip_the_data_version_cache(router, auth_headers):
+    headers = auth_headers()
+    create_word(headers, "fresh")
+    with engine.connect() as conn:
+        user_id, version = conn.exec_driver_sql("SELECT id, data_version FROM users").one()
+    # Cache của process còn version cũ (ví dụ worker này chưa thấy lần ghi)
+    for pinned_in_process in (True, False):
+        if not pinned_in_process:
+            router.pins.clear()
+        data_version_cache.set(user_id, version - 1)
+        response = client.get("/api/vocab/vocabularies", headers=headers)
+        assert response.headers["ETag"] == f'"{user_id}.{version}"'
+
+def test_reads_without_writes_use_replica(router, auth_headers):
+    headers = auth_headers()
+    response = client.get("/api/vocab/favorites", headers=headers)
+    assert response.status_code == 200
+    assert "set-cookie" not in response.headers
+    assert router.reader(1) is router.replica
+
+def test_without_replica_everything_uses_primary():
+    router = SessionRouter(AsyncSessionLocal, AsyncSessionLocal)
+    assert not router.has_replica
+    assert router.reader(1) is AsyncSessionLocal
@@ -0,0 +1,108 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import pytest
+from database.database import AsyncSessionLocal, Base, engine
+from api.vocab import VocabularyCreate
+from services.bulk_import import import_vocabularies, iter_list_rows
+from services.decks import apply_deck_growth, deck_category_counts, get_or_create_deck
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word, meaning, example="", category="TOEIC"):
+    response = client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": meaning, "example": example, "category": category}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+def search(headers, **params):
+    response = client.get("/api/vocab/search", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_prefix_search_ranks_word_matches_first(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "apple", "quả táo", "An apple a day")
+    add_word(headers, "pie", "bánh nướng", "Apple pie is sweet")
+    add_word(headers, "banana", "quả chuối", "Yellow fruit")
+    words = [v["word"] for v in search(headers, q="app")["items"]]
+    assert words == ["apple", "pie"]
+    assert search(headers, q="app", prefix="false")["items"] == []
+
+def test_search_ignores_vietnamese_diacritics(auth_headers):
+    headers = auth_headers()
+    add_word(headers, "road", "đường đi")
+    add_word(headers, "sugar", "đường ăn")
+    add_word(headers, "apple", "quả táo")
+    assert len(search(headers, q="duong")["items"]) == 2
+    assert len(search(headers, q="Đường")["items"]) == 2
+    assert [v["word"] for v in search(headers, q="qua tao")["items"]] == ["apple"]
+
+def test_search_is_scoped_to_owner(auth_headers):
+    alice = auth_headers("alice@example.com")
+    bob = auth_headers("bob@example.com")
+    add_word(alice, "apple", "quả táo")
+    assert search(bob, q="apple")["items"] == []
+
+def test_search_pagination(auth_headers):
+    headers = auth_headers()
+    for i in range(5):
+        add_word(headers, f"test{i}", "kiểm tra")
+    first = search(headers, q="kiem", limit=2)
+    assert len(first["items"]) == 2 and first["next_offset"] == 2
+    seen = [v["id"] for v in first["items"]]
+    offset = first["next_offset"]
+    while offset is not None:
+        page = search(headers, q="kiem", limit=2, offset=offset)
+        seen += [v["id"] for v in page["items"]]
+        offset = page["next_offset"]
+    assert len(set(seen)) == 5
+
+def test_search_index_follows_deletes(auth_headers):
+    headers = auth_headers()
+    word = add_word(headers, "apple", "quả táo")
+    client.delete(f"/api/vocab/{word['id']}", headers=headers)
+    assert search(headers, q="apple")["items"] == []
+
+def import_deck(words):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            deck = await get_or_create_deck(db, "toeic", "TOEIC")
+            before = await deck_category_counts(db, deck.id)
+            rows = [{"word": w, "meaning": m, "example": "e", "category": "TOEIC"} for w, m in words]
+            await import_vocabularies(db, iter_list_rows(rows), owner_id=None, schema=VocabularyCreate, deck_id=deck.id)
+            await apply_deck_growth(db, deck, before)
+            await db.commit()
+            return deck.id
+    return asyncio.run(run())
+
+def test_search_includes_subscribed_deck_words(auth_headers):
+    deck_id = import_deck([("apple", "quả táo"), ("application", "ứng dụng"), ("banana", "quả chuối")])
+    headers, other = auth_headers(), auth_headers("other@example.com")
+    add_word(headers, "apply", "nộp đơn")
+    assert [v["word"] for v in search(headers, q="app")["items"]] == ["apply"]
+
+    client.post(f"/api/decks/{deck_id}/subscribe", headers=headers)
+    assert sorted(v["word"] for v in search(headers, q="app")["items"]) == ["apple", "application", "apply"]
+    assert search(other, q="app")["items"] == []
+
+    # Từ đã có bản sao riêng: chỉ trả bản sao, trang vẫn đủ dòng
+    apple = next(v for v in search(headers, q="apple")["items"] if v["word"] == "apple")
+    copy = client.put(
+        f"/api/vocab/{apple['id']}", headers=headers,
+        json={"word": "apple", "meaning": "táo tây", "example": "e", "category": "TOEIC"},
+    ).json()
+    assert [v["id"] for v in search(headers, q="apple")["items"]] == [copy["id"]]
+    first = search(headers, q="app", limit=2)
+    assert len(first["items"]) == 2 and first["next_offset"] == 2
+    rest = search(headers, q="app", limit=2, offset=2)
+    assert len(rest["items"]) == 1 and rest["next_offset"] is None
@@ -0,0 +1,29 @@
+import datetime
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from api.vocab import VocabularySchema
+from models import Vocabulary
+from services.serialization import VOCABULARY_FIELDS, json_response, vocabulary_dicts
+
+def sample_vocabularies():
+    created = [
+        datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+        datetime.datetime(2024, 1, 2, 3, 4, 5),
+        datetime.datetime(2024, 1, 2, 3, 4, 5, 120000, tzinfo=datetime.timezone.utc),
+        datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone(datetime.timedelta(hours=7))),
+    ]
+    return [
+        Vocabulary(id=i + 1, word=f"word {i}", meaning="đường \"đi\" / <b>", example="It's\nfine\t✓",
+                   category="TOEIC", owner_id=7, created_at=created_at)
+        for i, created_at in enumerate(created)
+    ]
+
+def test_fast_path_is_byte_identical_to_schema_path():
+    vocabularies = sample_vocabularies()
+    # Đường cũ: validate qua VocabularySchema (orm_mode) rồi JSONResponse của FastAPI
+    models = TypeAdapter(List[VocabularySchema]).validate_python(vocabularies, from_attributes=True)
+    expected = JSONResponse(jsonable_encoder(models)).body
+    rows = [tuple(getattr(v, field) for field in VOCABULARY_FIELDS) for v in vocabularies]
+    assert json_response(vocabulary_dicts(rows)).body == expected
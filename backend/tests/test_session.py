@@ -0,0 +1,60 @@
+from fastapi.testclient import TestClient
+from main import app
+import pytest
+from sqlalchemy import event
+from database.database import Base, async_engine, engine
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+def add_word(headers, word, category):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    ).json()
+
+def test_session_returns_page_categories_and_favorite_ids(auth_headers):
+    headers = auth_headers()
+    apple = add_word(headers, "apple", "TOEIC")
+    add_word(headers, "banana", "IELTS")
+    client.post(f"/api/vocab/favorites/{apple['id']}", headers=headers)
+
+    data = client.get("/api/vocab/session", headers=headers).json()
+    assert [v["word"] for v in data["vocabularies"]["items"]] == ["apple", "banana"]
+    assert data["vocabularies"]["next_cursor"] is None
+    assert data["categories"] == ["IELTS", "TOEIC"]
+    assert data["favorite_ids"] == [apple["id"]]
+
+    data = client.get("/api/vocab/session?category=IELTS&limit=1", headers=headers).json()
+    assert [v["word"] for v in data["vocabularies"]["items"]] == ["banana"]
+    assert data["categories"] == ["IELTS", "TOEIC"]
+
+def test_session_query_count(auth_headers, count_queries):
+    headers = auth_headers()
+    for i in range(5):
+        add_word(headers, f"w{i}", "TOEIC")
+    client.get("/api/vocab/session", headers=headers)
+    count_queries.clear()
+    response = client.get("/api/vocab/session", headers=headers)
+    assert response.status_code == 200
+    # Trang từ, category, favorite ids; user và data_version lấy từ cache
+    selects = [s for s in count_queries if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 3
+    assert len(count_queries) == 3
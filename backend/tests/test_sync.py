@@ -0,0 +1,118 @@
+from fastapi.testclient import TestClient
+from main import app
+import asyncio
+import json
+import pytest
+from sqlalchemy import text
+from database.database import AsyncSessionLocal, Base, engine
+from services.sync import compact_tombstones
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_database():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+def add_word(headers, word, category="TOEIC"):
+    return client.post(
+        "/api/vocab/vocabularies",
+        headers=headers,
+        json={"word": word, "meaning": "nghĩa", "example": "Example", "category": category}
+    ).json()
+
+def sync(headers, **params):
+    response = client.get("/api/vocab/sync", headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def summary(page):
+    return [
+        (c["op"], c["type"], c["data"]["word"] if c["type"] == "vocabulary" and c["op"] == "upsert" else c["id"])
+        for c in page["changes"]
+    ]
+
+def test_snapshot_then_delta(auth_headers):
+    headers = auth_headers()
+    apple, banana, cat = (add_word(headers, w) for w in ("apple", "banana", "cat"))
+    client.post(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    first = sync(headers)
+    assert first["reset"] is True and first["next_cursor"] is None
+    assert summary(first) == [
+        ("upsert", "vocabulary", "apple"), ("upsert", "vocabulary", "banana"),
+        ("upsert", "vocabulary", "cat"), ("upsert", "favorite", banana["id"]),
+    ]
+    assert [c["seq"] for c in first["changes"]] == [1, 2, 3, 4]
+    assert first["seq"] == 4
+
+    client.delete(f"/api/vocab/favorites/{banana['id']}", headers=headers)
+    client.delete(f"/api/vocab/{apple['id']}", headers=headers)
+    add_word(headers, "dog")
+    delta = sync(headers, since=first["seq"])
+    assert delta["reset"] is False
+    assert summary(delta) == [
+        ("delete", "favorite", banana["id"]), ("delete", "vocabulary", apple["id"]), ("upsert", "vocabulary", "dog"),
+    ]
+    assert sync(headers, since=delta["seq"])["changes"] == []
+
+def test_refavorite_is_ordered_after_its_tombstone(auth_headers):
+    headers = auth_headers()
+    word = add_word(headers, "apple")
+    since = sync(headers)["seq"]
+    for method in ("post", "delete", "post"):
+        getattr(client, method)(f"/api/vocab/favorites/{word['id']}", headers=headers)
+    assert summary(sync(headers, since=since)) == [
+        ("delete", "favorite", word["id"]), ("upsert", "favorite", word["id"]),
+    ]
+
+def test_bulk_import_shares_one_seq_and_pages_by_cursor(auth_headers):
+    headers = auth_headers()
+    body = "\n".join(json.dumps({"word": f"w{i}", "meaning": "m", "example": "", "category": "TOEIC"}) for i in range(7))
+    client.post("/api/vocab/vocabularies/bulk", headers=headers, content=body)
+    client.delete("/api/vocab/1", headers=headers)
+    words, deleted, cursor, pages = [], [], None, 0
+    while True:
+        params = {"since": 0, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = sync(headers, **params)
+        pages += 1
+        for change in page["changes"]:
+            if change["op"] == "upsert":
+                words.append((change["seq"], change["data"]["word"]))
+            else:
+                deleted.append(change["id"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 4
+    assert words == [(1, f"w{i}") for i in range(1, 7)]
+    assert deleted == [1]
+
+def test_compaction_forces_a_full_resync(auth_headers):
+    headers = auth_headers()
+    apple = add_word(headers, "apple")
+    add_word(headers, "banana")
+    client.delete(f"/api/vocab/{apple['id']}", headers=headers)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE sync_tombstones SET deleted_at = '2000-01-01 00:00:00'"))
+
+    async def compact():
+        async with AsyncSessionLocal() as db:
+            removed = await compact_tombstones(db, older_than_days=30)
+            await db.commit()
+            return removed
+    assert asyncio.run(compact()) == 1
+
+    stale = sync(headers, since=1)
+    assert stale["reset"] is True
+    assert summary(stale) == [("upsert", "vocabulary", "banana")]
+    assert sync(headers, since=3) == {"changes": [], "reset": False, "seq": 3, "next_cursor": None}
+
+def test_sync_validation(auth_headers):
+    headers = auth_headers()
+    assert client.get("/api/vocab/sync?cursor=nope", headers=headers).status_code == 400
+    assert client.get("/api/vocab/sync?limit=0", headers=headers).status_code == 400
+    assert client.get("/api/vocab/sync?since=-1", headers=headers).status_code == 400
+    assert client.get("/api/vocab/sync").status_code == 401
@@ -2,7 +2,6 @@ from fastapi.testclient import TestClient
 from main import app
 import pytest
 from database.database import Base, engine
-from models import models
 
 client = TestClient(app)
 
@@ -12,9 +11,11 @@ def setup_database():
     yield
     Base.metadata.drop_all(bind=engine)
 
-def test_create_vocabulary():
+def test_create_vocabulary(auth_headers):
+    headers = auth_headers()
     response = client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test",
             "meaning": "kiểm tra",
@@ -29,10 +30,12 @@ def test_create_vocabulary():
     assert data["meaning"] == "kiểm tra"
     assert data["category"] == "TOEIC"
 
-def test_get_vocabularies():
+def test_get_vocabularies(auth_headers):
+    headers = auth_headers()
     # Create a vocabulary first
     client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test",
             "meaning": "kiểm tra",
@@ -42,16 +45,18 @@ def test_get_vocabularies():
         }
     )
     
-    response = client.get("/api/vocab/")
+    response = client.get("/api/vocab/vocabularies", headers=headers)
     assert response.status_code == 200
     data = response.json()
     assert len(data) > 0
     assert data[0]["word"] == "test"
 
-def test_get_vocabulary_by_category():
+def test_get_vocabulary_by_category(auth_headers):
+    headers = auth_headers()
     # Create vocabularies
     client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test1",
             "meaning": "kiểm tra 1",
@@ -61,7 +66,8 @@ def test_get_vocabulary_by_category():
         }
     )
     client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test2",
             "meaning": "kiểm tra 2",
@@ -71,16 +77,18 @@ def test_get_vocabulary_by_category():
         }
     )
     
-    response = client.get("/api/vocab/?category=TOEIC")
+    response = client.get("/api/vocab/vocabularies?category=TOEIC", headers=headers)
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 1
     assert data[0]["category"] == "TOEIC"
 
-def test_get_categories():
+def test_get_categories(auth_headers):
+    headers = auth_headers()
     # Create vocabularies with different categories
     client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test1",
             "meaning": "kiểm tra 1",
@@ -90,7 +98,8 @@ def test_get_categories():
         }
     )
     client.post(
-        "/api/vocab/",
+        "/api/vocab/vocabularies",
+        headers=headers,
         json={
             "word": "test2",
             "meaning": "kiểm tra 2",
@@ -100,7 +109,7 @@ def test_get_categories():
         }
     )
     
-    response = client.get("/api/vocab/categories/")
+    response = client.get("/api/vocab/categories", headers=headers)
     assert response.status_code == 200
     data = response.json()
     assert "TOEIC" in data
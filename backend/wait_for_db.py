@@ -1,24 +1,34 @@
-import time
-import pymysql
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import NullPool
+
+# Chờ database sẵn sàng trước khi migrate / khởi động app.
+# Một engine duy nhất (NullPool: không giữ connection), thử lại với backoff tăng dần
+# đến DB_WAIT_TIMEOUT giây.
+DB_WAIT_TIMEOUT = float(os.getenv("DB_WAIT_TIMEOUT", "60"))
+DB_WAIT_MAX_INTERVAL = 2.0
 
-def wait_for_db():
-    max_tries = 30
-    while max_tries > 0:
-        try:
-            # Thử kết nối với MySQL
-            engine = create_engine(os.getenv("DATABASE_URL"))
-            engine.connect()
-            print("Database is ready!")
-            return
-        except OperationalError:
-            print("Waiting for database...")
-            max_tries -= 1
-            time.sleep(1)
-    
-    raise Exception("Could not connect to database")
+def wait_for_db(url=None, timeout=DB_WAIT_TIMEOUT):
+    engine = create_engine(url or os.getenv("DATABASE_URL"), poolclass=NullPool)
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    try:
+        while True:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                print("Database is ready!")
+                return
+            except OperationalError:
+                if time.monotonic() + delay > deadline:
+                    raise Exception("Could not connect to database")
+                print("Waiting for database...")
+                time.sleep(delay)
+                delay = min(delay * 2, DB_WAIT_MAX_INTERVAL)
+    finally:
+        engine.dispose()
 
 if __name__ == "__main__":
-    wait_for_db()
\ No newline at end of file
+    wait_for_db()
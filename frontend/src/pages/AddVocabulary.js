@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import { useAuth } from '../contexts/AuthContext';
@@ -10,9 +10,56 @@ function AddVocabulary() {
   const [category, setCategory] = useState('');
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  const [suggestions, setSuggestions] = useState([]);
   const navigate = useNavigate();
   const { user } = useAuth();
 
+  // Gợi ý từ từ điển offline khi gõ (GET /api/vocab/lookup/autocomplete)
+  useEffect(() => {
+    const prefix = word.trim();
+    const token = localStorage.getItem('token');
+    if (prefix.length < 2 || !token) {
+      setSuggestions([]);
+      return undefined;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get('http://localhost:8000/api/vocab/lookup/autocomplete', {
+          params: { prefix, limit: 8 },
+          headers: { Authorization: `Bearer ${token}` }
+        });
+        setSuggestions(response.data.suggestions);
+      } catch (error) {
+        setSuggestions([]);
+      }
+    }, 200);
+    return () => clearTimeout(timer);
+  }, [word]);
+
+  // Điền sẵn nghĩa / ví dụ từ từ điển nếu người dùng chưa nhập
+  const handleWordBlur = async () => {
+    const token = localStorage.getItem('token');
+    if (!word.trim() || !token || (meaning && example)) {
+      return;
+    }
+    try {
+      const response = await axios.get('http://localhost:8000/api/vocab/lookup', {
+        params: { word },
+        headers: { Authorization: `Bearer ${token}` }
+      });
+      const entries = response.data.entries;
+      if (!meaning) {
+        setMeaning(entries.map((entry) => entry.meaning).join('; '));
+      }
+      const withExample = entries.find((entry) => entry.example);
+      if (!example && withExample) {
+        setExample(withExample.example);
+      }
+    } catch (error) {
+      // Không có trong từ điển: người dùng tự nhập
+    }
+  };
+
   const handleSubmit = async (e) => {
     e.preventDefault();
     setLoading(true);
@@ -67,10 +114,20 @@ function AddVocabulary() {
               id="word"
               value={word}
               onChange={(e) => setWord(e.target.value)}
+              onBlur={handleWordBlur}
+              list="word-suggestions"
+              autoComplete="off"
               required
               className="mt-1 block w-full rounded-md border-gray-300 shadow-sm focus:border-primary-500 focus:ring-primary-500"
               disabled={loading}
             />
+            <datalist id="word-suggestions">
+              {suggestions.map((suggestion) => (
+                <option key={suggestion.word} value={suggestion.word}>
+                  {suggestion.meaning}
+                </option>
+              ))}
+            </datalist>
           </div>
 
           <div>
@@ -13,52 +13,27 @@ function Flashcard() {
   const [categories, setCategories] = useState([]);
 
   useEffect(() => {
-    fetchCategories();
-    fetchVocabularies();
-    fetchFavorites();
+    fetchSession();
   }, [selectedCategory]);
 
-  const fetchCategories = async () => {
-    try {
-      const response = await axios.get('http://localhost:8000/api/vocab/categories', {
-        headers: {
-          Authorization: `Bearer ${localStorage.getItem('token')}`
-        }
-      });
-      setCategories(response.data);
-    } catch (error) {
-      console.error('Error fetching categories:', error);
-    }
-  };
-
-  const fetchVocabularies = async () => {
+  const fetchSession = async () => {
     try {
+      // Một request cho cả danh sách từ, category và id từ yêu thích
       const url = selectedCategory
-        ? `http://localhost:8000/api/vocab/vocabularies?category=${selectedCategory}`
-        : 'http://localhost:8000/api/vocab/vocabularies';
+        ? `http://localhost:8000/api/vocab/session?category=${selectedCategory}`
+        : 'http://localhost:8000/api/vocab/session';
       const response = await axios.get(url, {
         headers: {
           Authorization: `Bearer ${localStorage.getItem('token')}`
         }
       });
-      setVocabularies(response.data);
+      setCategories(response.data.categories);
+      setVocabularies(response.data.vocabularies.items);
+      setFavorites(response.data.favorite_ids);
       setCurrentIndex(0);
       setIsFlipped(false);
     } catch (error) {
-      console.error('Error fetching vocabularies:', error);
-    }
-  };
-
-  const fetchFavorites = async () => {
-    try {
-      const response = await axios.get('http://localhost:8000/api/vocab/favorites', {
-        headers: {
-          Authorization: `Bearer ${localStorage.getItem('token')}`
-        }
-      });
-      setFavorites(response.data.map(fav => fav.id));
-    } catch (error) {
-      console.error('Error fetching favorites:', error);
+      console.error('Error fetching session:', error);
     }
   };
 
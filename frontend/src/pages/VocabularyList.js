@@ -19,21 +19,14 @@ function VocabularyList() {
         const token = localStorage.getItem('token');
         if (!token) return;
 
-        const [vocabResponse, categoriesResponse, favoritesResponse] = await Promise.all([
-          axios.get('http://localhost:8000/api/vocab/vocabularies', {
-            headers: { Authorization: `Bearer ${token}` }
-          }),
-          axios.get('http://localhost:8000/api/vocab/categories', {
-            headers: { Authorization: `Bearer ${token}` }
-          }),
-          axios.get('http://localhost:8000/api/vocab/favorites', {
-            headers: { Authorization: `Bearer ${token}` }
-          })
-        ]);
+        // Một request cho cả danh sách từ, category và id từ yêu thích
+        const response = await axios.get('http://localhost:8000/api/vocab/session', {
+          headers: { Authorization: `Bearer ${token}` }
+        });
 
-        setVocabularies(vocabResponse.data);
-        setCategories(categoriesResponse.data);
-        setFavorites(favoritesResponse.data.map(fav => fav.id));
+        setVocabularies(response.data.vocabularies.items);
+        setCategories(response.data.categories);
+        setFavorites(response.data.favorite_ids);
       } catch (error) {
         console.error('Error fetching data:', error);
         setError('Không thể tải dữ liệu');